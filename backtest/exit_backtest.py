@@ -0,0 +1,414 @@
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Default exit rule of Monitor.process_trade (take_profit / stop_loss in the config file):
+# take profit at +20%, stop loss at -20%, no trailing stop.
+DEFAULT_TAKE_PROFIT = 0.2
+DEFAULT_STOP_LOSS = 0.2
+
+# Trailing stops at or above this drawdown can never trigger (prices stay positive),
+# so it is used internally to mean "trailing stop disabled".
+NO_TRAILING_STOP = 2.0
+
+def load_listing(file_path):
+    """
+    Load one recorded post-listing price series.
+
+    Supported formats are CSV files with a `price` column (an optional `timestamp`
+    column is used for ordering), and JSON files holding either a list of prices,
+    a list of [timestamp, price] pairs or a list of objects with a `price` key.
+
+    Args:
+        file_path (str): Path to the recorded series.
+
+    Returns:
+        tuple: (first timestamp or None, numpy.ndarray of prices)
+    """
+    timestamps = []
+    prices = []
+    if file_path.endswith(".csv"):
+        with open(file_path, "r", newline="") as series_file:
+            for row in csv.DictReader(series_file):
+                prices.append(float(row["price"]))
+                if row.get("timestamp") not in (None, ""):
+                    timestamps.append(float(row["timestamp"]))
+    else:
+        with open(file_path, "r") as series_file:
+            data = json.load(series_file)
+        for tick in data:
+            if isinstance(tick, dict):
+                prices.append(float(tick["price"]))
+                if "timestamp" in tick:
+                    timestamps.append(float(tick["timestamp"]))
+            elif isinstance(tick, (list, tuple)):
+                timestamps.append(float(tick[0]))
+                prices.append(float(tick[1]))
+            else:
+                prices.append(float(tick))
+
+    prices = np.asarray(prices, dtype=np.float64)
+    if timestamps and len(timestamps) == len(prices):
+        order = np.argsort(np.asarray(timestamps), kind="stable")
+        return timestamps[order[0]], prices[order]
+    return None, prices
+
+def load_listings(data_dir, min_ticks=2):
+    """
+    Load every recorded listing in a directory, oldest listing first.
+
+    Args:
+        data_dir (str): Directory containing one .csv or .json file per listing.
+        min_ticks (int): Listings with fewer valid ticks than this are skipped.
+
+    Returns:
+        tuple: (list of listing names, list of numpy price arrays)
+    """
+    listings = []
+    for file_name in sorted(os.listdir(data_dir)):
+        if not file_name.endswith((".csv", ".json")):
+            continue
+        first_timestamp, prices = load_listing(os.path.join(data_dir, file_name))
+        # Drop ticks without a usable price (0 is what the exchanges report before trading starts)
+        prices = prices[np.isfinite(prices) & (prices > 0)]
+        if len(prices) < min_ticks:
+            continue
+        sort_key = first_timestamp if first_timestamp is not None else float("inf")
+        listings.append((sort_key, os.path.splitext(file_name)[0], prices))
+
+    listings.sort(key=lambda listing: listing[0])
+    return [listing[1] for listing in listings], [listing[2] for listing in listings]
+
+def synthetic_listings(count, ticks, seed=0):
+    """
+    Generate random post-listing price paths, used to benchmark the engine without recorded data.
+
+    The paths have an opening pump followed by a volatile decay, which is roughly the
+    shape of a fresh listing.
+
+    Args:
+        count (int): Number of listings to generate.
+        ticks (int): Number of ticks per listing.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        tuple: (list of listing names, list of numpy price arrays)
+    """
+    rng = np.random.default_rng(seed)
+    volatility = rng.uniform(0.002, 0.03, size=(count, 1))
+    drift = rng.normal(-0.0002, 0.0004, size=(count, 1))
+    steps = drift + volatility * rng.standard_normal((count, ticks))
+    steps[:, 0] = 0.0
+    paths = rng.uniform(0.01, 5.0, size=(count, 1)) * np.exp(np.cumsum(steps, axis=1))
+    return ["SYNTH{}".format(n) for n in range(count)], list(paths)
+
+def build_grid(take_profits, stop_losses, trailing_stops):
+    """
+    Build the cartesian product of exit parameters.
+
+    Args:
+        take_profits (list): Take profit fractions, e.g. 0.2 for +20%.
+        stop_losses (list): Stop loss fractions, e.g. 0.2 for -20%.
+        trailing_stops (list): Trailing stop fractions measured from the running peak.
+            None (or 0) disables the trailing stop.
+
+    Returns:
+        dict: Arrays 'take_profit', 'stop_loss' and 'trailing_stop', one entry per combination.
+    """
+    trailing_stops = [NO_TRAILING_STOP if not trail else float(trail) for trail in trailing_stops]
+    tp, sl, trail = np.meshgrid(
+        np.asarray(take_profits, dtype=np.float64),
+        np.asarray(stop_losses, dtype=np.float64),
+        np.asarray(trailing_stops, dtype=np.float64),
+        indexing="ij"
+    )
+    return {
+        "take_profit": tp.ravel(),
+        "stop_loss": sl.ravel(),
+        "trailing_stop": np.minimum(trail.ravel(), NO_TRAILING_STOP)
+    }
+
+def _pad_block(series, entry_delay):
+    """
+    Stack a block of price series into a (listings, ticks) matrix of returns relative to the entry.
+
+    Rows are padded with their last value, which leaves the running max/min untouched,
+    so padding can never create an exit that would not have happened anyway.
+    """
+    series = [prices[min(entry_delay, len(prices) - 1):] for prices in series]
+    lengths = np.fromiter((len(prices) for prices in series), dtype=np.int64, count=len(series))
+    width = int(lengths.max())
+    returns = np.empty((len(series), width), dtype=np.float64)
+    for row, prices in enumerate(series):
+        returns[row, :len(prices)] = prices / prices[0]
+        returns[row, len(prices):] = prices[-1] / prices[0]
+    return returns, lengths
+
+def _first_crossing(running, levels):
+    """
+    Find, for every row of a non-decreasing matrix, the first column reaching each level.
+
+    All rows are searched with a single np.searchsorted call: every row is shifted by a
+    constant offset so the flattened matrix stays globally sorted and each row's search
+    values land inside that row's segment.
+
+    Args:
+        running (numpy.ndarray): (rows, ticks) matrix, non-decreasing along each row.
+        levels (numpy.ndarray): (n,) levels to search for.
+
+    Returns:
+        numpy.ndarray: (rows, n) column indices; `ticks` where a level is never reached.
+    """
+    rows, width = running.shape
+    low = min(running.min(), levels.min())
+    high = max(running.max(), levels.max())
+    offset = (high - low) + 1.0
+    shift = np.arange(rows, dtype=np.float64)[:, None] * offset
+    flat = (running + shift).ravel()
+    positions = np.searchsorted(flat, levels[None, :] + shift, side="left")
+    return positions - np.arange(rows, dtype=np.int64)[:, None] * width
+
+def simulate_block(series, grid, fee=0.0, entry_delay=0):
+    """
+    Evaluate every exit parameter combination on a block of listings at once.
+
+    A position is opened on the first tick (after `entry_delay`) and closed on the first
+    tick where price reaches the take profit, the stop loss, or falls by the trailing
+    stop fraction from its running peak. Positions that never trigger are marked to
+    market on the last recorded tick.
+
+    Args:
+        series (list): Price arrays, one per listing.
+        grid (dict): Parameter combinations as returned by build_grid().
+        fee (float): Fee fraction charged on entry and on exit.
+        entry_delay (int): Number of ticks between the listing and the fill.
+
+    Returns:
+        dict: (listings, combinations) arrays 'pnl', 'adverse_excursion' and 'hold_ticks'.
+    """
+    returns, lengths = _pad_block(series, entry_delay)
+
+    running_high = np.maximum.accumulate(returns, axis=1)
+    running_low = np.minimum.accumulate(returns, axis=1)
+    peak_drawdown = np.maximum.accumulate(1.0 - returns / running_high, axis=1)
+
+    # Each parameter axis is searched once per unique value, then broadcast to the grid
+    tp_values, tp_index = np.unique(grid["take_profit"], return_inverse=True)
+    sl_values, sl_index = np.unique(grid["stop_loss"], return_inverse=True)
+    trail_values, trail_index = np.unique(grid["trailing_stop"], return_inverse=True)
+
+    tp_hit = _first_crossing(running_high, 1.0 + tp_values)
+    # The running low is non-increasing, so search its negation
+    sl_hit = _first_crossing(-running_low, -(1.0 - sl_values))
+    trail_hit = _first_crossing(peak_drawdown, trail_values)
+
+    exit_tick = np.minimum(np.minimum(tp_hit[:, tp_index], sl_hit[:, sl_index]), trail_hit[:, trail_index])
+    exit_tick = np.minimum(exit_tick, (lengths - 1)[:, None])
+
+    rows = np.arange(len(series))[:, None]
+    exit_return = returns[rows, exit_tick]
+    pnl = exit_return * (1.0 - fee) * (1.0 - fee) - 1.0
+    adverse_excursion = 1.0 - running_low[rows, exit_tick]
+
+    return {
+        "pnl": pnl,
+        "adverse_excursion": adverse_excursion,
+        "hold_ticks": exit_tick
+    }
+
+def _simulate_block_job(args):
+    return simulate_block(*args)
+
+def run_backtest(series, grid, fee=0.0, entry_delay=0, block_size=64, workers=1):
+    """
+    Run the exit strategy sweep over all listings.
+
+    Listings are processed in blocks to bound memory; with workers > 1 the blocks are
+    spread over a process pool.
+
+    Args:
+        series (list): Price arrays, one per listing, oldest first.
+        grid (dict): Parameter combinations as returned by build_grid().
+        fee (float): Fee fraction charged on entry and on exit.
+        entry_delay (int): Number of ticks between the listing and the fill.
+        block_size (int): Number of listings simulated per block.
+        workers (int): Number of processes to use.
+
+    Returns:
+        dict: (listings, combinations) arrays 'pnl', 'adverse_excursion' and 'hold_ticks'.
+    """
+    jobs = [
+        (series[start:start + block_size], grid, fee, entry_delay)
+        for start in range(0, len(series), block_size)
+    ]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(_simulate_block_job, jobs))
+    else:
+        blocks = [_simulate_block_job(job) for job in jobs]
+
+    return {key: np.concatenate([block[key] for block in blocks], axis=0) for key in blocks[0]}
+
+def summarize(results, grid):
+    """
+    Reduce the per-listing results to PnL and drawdown distributions per combination.
+
+    The drawdown is measured on the equity curve obtained by trading every listing in
+    chronological order with the same notional.
+
+    Args:
+        results (dict): Output of run_backtest().
+        grid (dict): Parameter combinations as returned by build_grid().
+
+    Returns:
+        dict: One array per statistic, one entry per combination.
+    """
+    pnl = results["pnl"]
+    equity = np.cumsum(pnl, axis=0)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=0), 0.0)
+    percentiles = np.percentile(pnl, [5, 25, 50, 75, 95], axis=0)
+
+    trailing = grid["trailing_stop"].copy()
+    trailing[trailing >= NO_TRAILING_STOP] = np.nan
+
+    return {
+        "take_profit": grid["take_profit"],
+        "stop_loss": grid["stop_loss"],
+        "trailing_stop": trailing,
+        "trades": np.full(pnl.shape[1], pnl.shape[0]),
+        "total_pnl": equity[-1],
+        "mean_pnl": pnl.mean(axis=0),
+        "std_pnl": pnl.std(axis=0),
+        "p5_pnl": percentiles[0],
+        "p25_pnl": percentiles[1],
+        "median_pnl": percentiles[2],
+        "p75_pnl": percentiles[3],
+        "p95_pnl": percentiles[4],
+        "win_rate": (pnl > 0).mean(axis=0),
+        "max_drawdown": (peak - equity).max(axis=0),
+        "mean_adverse_excursion": results["adverse_excursion"].mean(axis=0),
+        "worst_adverse_excursion": results["adverse_excursion"].max(axis=0),
+        "mean_hold_ticks": results["hold_ticks"].mean(axis=0)
+    }
+
+def write_summary(summary, file_path):
+    """
+    Write the per-combination summary to a CSV file.
+    """
+    columns = list(summary)
+    with open(file_path, "w", newline="") as summary_file:
+        writer = csv.writer(summary_file)
+        writer.writerow(columns)
+        for row in zip(*(summary[column] for column in columns)):
+            writer.writerow(["{:.6g}".format(value) for value in row])
+
+def print_top(summary, metric, top):
+    """
+    Print the best combinations by the chosen metric, and the current 20%/20% rule for reference.
+    """
+    order = np.argsort(summary[metric])
+    if metric not in ("max_drawdown", "mean_adverse_excursion", "worst_adverse_excursion", "std_pnl"):
+        order = order[::-1]
+
+    header = "{:>8} {:>8} {:>8} {:>10} {:>10} {:>10} {:>8} {:>10}".format(
+        "TP", "SL", "TRAIL", "TOTAL", "MEAN", "MEDIAN", "WIN%", "MAX_DD"
+    )
+    print(header)
+    print("-" * len(header))
+    for index in order[:top]:
+        print("{:>8.3f} {:>8.3f} {:>8.3f} {:>10.4f} {:>10.4f} {:>10.4f} {:>8.1f} {:>10.4f}".format(
+            summary["take_profit"][index],
+            summary["stop_loss"][index],
+            summary["trailing_stop"][index],
+            summary["total_pnl"][index],
+            summary["mean_pnl"][index],
+            summary["median_pnl"][index],
+            summary["win_rate"][index] * 100,
+            summary["max_drawdown"][index]
+        ))
+
+    current = np.flatnonzero(
+        np.isclose(summary["take_profit"], DEFAULT_TAKE_PROFIT)
+        & np.isclose(summary["stop_loss"], DEFAULT_STOP_LOSS)
+        & np.isnan(summary["trailing_stop"])
+    )
+    if current.size:
+        index = current[0]
+        rank = int(np.flatnonzero(order == index)[0]) + 1
+        print("Current 20%/20% rule ranks {} of {} by {}: total {:.4f}, mean {:.4f}, max drawdown {:.4f}".format(
+            rank, len(order), metric,
+            summary["total_pnl"][index], summary["mean_pnl"][index], summary["max_drawdown"][index]
+        ))
+
+def parse_range(value):
+    """
+    Parse a parameter list given either as 'a,b,c' or as a 'start:stop:step' range.
+    """
+    if ":" in value:
+        start, stop, step = (float(part) for part in value.split(":"))
+        return list(np.round(np.arange(start, stop + step / 2, step), 10))
+    return [float(part) for part in value.split(",") if part != ""]
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep take profit / stop loss / trailing stop exits over recorded listings.")
+    parser.add_argument("--data", help="Directory of recorded post-listing price series (.csv or .json)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Benchmark on N generated listings instead of recorded data")
+    parser.add_argument("--ticks", type=int, default=3600, help="Ticks per generated listing")
+    parser.add_argument("--take-profit", default="0.05:0.5:0.025", help="Take profit fractions, list or start:stop:step")
+    parser.add_argument("--stop-loss", default="0.05:0.5:0.025", help="Stop loss fractions, list or start:stop:step")
+    parser.add_argument("--trailing-stop", default="0,0.05:0.5:0.05", help="Trailing stop fractions, 0 disables it")
+    parser.add_argument("--fee", type=float, default=0.001, help="Fee fraction per side")
+    parser.add_argument("--entry-delay", type=int, default=0, help="Ticks between listing and fill")
+    parser.add_argument("--max-ticks", type=int, default=0, help="Only keep the first N ticks of every listing")
+    parser.add_argument("--block-size", type=int, default=64, help="Listings simulated per block")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to spread the blocks over")
+    parser.add_argument("--metric", default="total_pnl", help="Summary column used to rank combinations")
+    parser.add_argument("--top", type=int, default=20, help="Number of combinations to print")
+    parser.add_argument("--output", help="Write the full per-combination summary to this CSV file")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        names, series = synthetic_listings(args.synthetic, args.ticks)
+    elif args.data:
+        names, series = load_listings(args.data)
+    else:
+        parser.error("either --data or --synthetic is required")
+    if not series:
+        parser.error("no usable listings found")
+    if args.max_ticks:
+        series = [prices[:args.max_ticks] for prices in series]
+
+    take_profits = parse_range(args.take_profit)
+    stop_losses = parse_range(args.stop_loss)
+    # Keep the current 20%/20% rule in the grid so it can be ranked against the alternatives
+    if DEFAULT_TAKE_PROFIT not in take_profits:
+        take_profits.append(DEFAULT_TAKE_PROFIT)
+    if DEFAULT_STOP_LOSS not in stop_losses:
+        stop_losses.append(DEFAULT_STOP_LOSS)
+    trailing_stops = []
+    for part in args.trailing_stop.split(","):
+        trailing_stops.extend(parse_range(part))
+
+    grid = build_grid(take_profits, stop_losses, trailing_stops)
+
+    start_time = time.perf_counter()
+    results = run_backtest(series, grid, args.fee, args.entry_delay, args.block_size, args.workers)
+    summary = summarize(results, grid)
+    elapsed = time.perf_counter() - start_time
+
+    print("{} listings, {} ticks, {} combinations evaluated in {:.3f}s ({} worker(s))".format(
+        len(series), sum(len(prices) for prices in series), len(grid["take_profit"]), elapsed, args.workers
+    ))
+    print_top(summary, args.metric, args.top)
+
+    if args.output:
+        write_summary(summary, args.output)
+        print("Summary written to {}".format(args.output))
+
+if __name__ == "__main__":
+    main()
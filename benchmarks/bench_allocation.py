@@ -0,0 +1,47 @@
+import os
+import sys
+import random
+import timeit
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.allocation import allocate_by_liquidity, expected_slippage, ladders
+from core.sizing import allocate_funds
+
+def synthetic_asks(levels):
+    # Thin and deep listings: resting size per level spans two orders of magnitude
+    price = random.uniform(0.001, 10)
+    depth = 10 ** random.uniform(1, 3)
+    return [(price * (1 + 0.002 * n), depth * random.uniform(0.5, 1.5) / price) for n in range(levels)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Liquidity-aware allocation against the equal split.")
+    parser.add_argument("--pairs", default="1,2,5,20", help="Comma separated pair counts")
+    parser.add_argument("--levels", type=int, default=50)
+    parser.add_argument("--balance", type=float, default=5000)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("{:<6} {:>12} {:>12} {:>16} {:>16}".format("PAIRS", "equal us", "liquidity us", "equal slip max", "liquidity slip max"))
+    for count in [int(count) for count in args.pairs.split(",")]:
+        pairs = ["COIN{}USDT".format(n) for n in range(count)]
+        asks = {pair: synthetic_asks(args.levels) for pair in pairs}
+        limits = {pair: (5.0, 1e6) for pair in pairs}
+        prices, sizes = ladders([asks[pair] for pair in pairs], args.levels)
+        equal_funds = allocate_funds(pairs, args.balance)
+        equal_slippage = expected_slippage(np.array([equal_funds[pair] for pair in pairs]), prices, sizes)
+        liquidity = allocate_by_liquidity(pairs, args.balance, limits, asks, max_slippage=0.05)
+
+        equal_us = timeit.timeit(lambda: allocate_funds(pairs, args.balance), number=args.number) / args.number * 1e6
+        liquidity_us = timeit.timeit(
+            lambda: allocate_by_liquidity(pairs, args.balance, limits, asks, 0.05), number=args.number
+        ) / args.number * 1e6
+        print("{:<6} {:>12.1f} {:>12.1f} {:>16.2%} {:>16.2%}".format(
+            count, equal_us, liquidity_us,
+            np.nanmax(equal_slippage),
+            max(value for value in liquidity[1].values() if value is not None)
+        ))
+
+if __name__ == "__main__":
+    main()
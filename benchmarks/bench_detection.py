@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import argparse
+from time import perf_counter
+
+import ccxt
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import fastjson
+
+def mexc_exchange_info(count):
+    return {"timezone": "CST", "serverTime": 1690000000000, "rateLimits": [], "exchangeFilters": [], "symbols": [{
+        "symbol": "COIN{}USDT".format(n), "status": "ENABLED", "baseAsset": "COIN{}".format(n), "baseAssetPrecision": 2,
+        "quoteAsset": "USDT", "quotePrecision": 4, "quoteAssetPrecision": 4, "baseCommissionPrecision": 2,
+        "quoteCommissionPrecision": 4, "orderTypes": ["LIMIT", "MARKET", "LIMIT_MAKER"], "quoteOrderQtyMarketAllowed": False,
+        "isSpotTradingAllowed": True, "isMarginTradingAllowed": False, "quoteAmountPrecision": "5.000000000000000000000000000000",
+        "baseSizePrecision": "0.01", "permissions": ["SPOT"], "filters": [], "maxQuoteAmount": "2000000.000000000000000000000000000000",
+        "makerCommission": "0.002", "takerCommission": "0.002", "quoteAmountPrecisionMarket": "5.000000000000000000000000000000",
+        "maxQuoteAmountMarket": "100000.000000000000000000000000000000", "fullName": "Coin {}".format(n)
+    } for n in range(count)]}
+
+def mexc_default_symbols(count):
+    return {"code": "0", "data": ["COIN{}USDT".format(n) for n in range(count)], "msg": None}
+
+def binance_exchange_info(count):
+    return {"timezone": "UTC", "serverTime": 1690000000000, "rateLimits": [], "exchangeFilters": [], "symbols": [{
+        "symbol": "COIN{}USDT".format(n), "status": "TRADING", "baseAsset": "COIN{}".format(n), "baseAssetPrecision": 8,
+        "quoteAsset": "USDT", "quotePrecision": 8, "quoteAssetPrecision": 8, "baseCommissionPrecision": 8,
+        "quoteCommissionPrecision": 8, "orderTypes": ["LIMIT", "LIMIT_MAKER", "MARKET", "STOP_LOSS_LIMIT", "TAKE_PROFIT_LIMIT"],
+        "icebergAllowed": True, "ocoAllowed": True, "quoteOrderQtyMarketAllowed": True, "allowTrailingStop": True,
+        "cancelReplaceAllowed": True, "isSpotTradingAllowed": True, "isMarginTradingAllowed": False, "filters": [
+            {"filterType": "PRICE_FILTER", "minPrice": "0.00010000", "maxPrice": "1000.00000000", "tickSize": "0.00010000"},
+            {"filterType": "LOT_SIZE", "minQty": "0.10000000", "maxQty": "9222449.00000000", "stepSize": "0.10000000"},
+            {"filterType": "ICEBERG_PARTS", "limit": 10},
+            {"filterType": "MARKET_LOT_SIZE", "minQty": "0.00000000", "maxQty": "1305792.47152777", "stepSize": "0.00000000"},
+            {"filterType": "TRAILING_DELTA", "minTrailingAboveDelta": 10, "maxTrailingAboveDelta": 2000,
+             "minTrailingBelowDelta": 10, "maxTrailingBelowDelta": 2000},
+            {"filterType": "PERCENT_PRICE_BY_SIDE", "bidMultiplierUp": "5", "bidMultiplierDown": "0.2",
+             "askMultiplierUp": "5", "askMultiplierDown": "0.2", "avgPriceMins": 5},
+            {"filterType": "NOTIONAL", "minNotional": "5.00000000", "applyMinToMarket": True, "maxNotional": "9000000.00000000",
+             "applyMaxToMarket": False, "avgPriceMins": 5},
+            {"filterType": "MAX_NUM_ORDERS", "maxNumOrders": 200},
+            {"filterType": "MAX_NUM_ALGO_ORDERS", "maxNumAlgoOrders": 5}
+        ], "permissions": ["SPOT"], "defaultSelfTradePreventionMode": "NONE",
+        "allowedSelfTradePreventionModes": ["NONE", "EXPIRE_TAKER", "EXPIRE_MAKER", "EXPIRE_BOTH"]
+    } for n in range(count)]}
+
+def binance_ticker_price(count):
+    return [{"symbol": "COIN{}USDT".format(n), "price": "{:.8f}".format(1 + n / 1000)} for n in range(count)]
+
+def kucoin_symbols(count):
+    return {"code": "200000", "data": [{
+        "symbol": "COIN{}-USDT".format(n), "name": "COIN{}-USDT".format(n), "baseCurrency": "COIN{}".format(n),
+        "quoteCurrency": "USDT", "feeCurrency": "USDT", "market": "USDS", "baseMinSize": "0.1", "quoteMinSize": "0.1",
+        "baseMaxSize": "10000000000", "quoteMaxSize": "99999999", "baseIncrement": "0.0001", "quoteIncrement": "0.000001",
+        "priceIncrement": "0.000001", "priceLimitRate": "0.1", "minFunds": "0.1", "isMarginEnabled": False,
+        "enableTrading": True
+    } for n in range(count)]}
+
+def kucoin_all_tickers(count):
+    return {"code": "200000", "data": {"time": 1690000000000, "ticker": [{
+        "symbol": "COIN{}-USDT".format(n), "symbolName": "COIN{}-USDT".format(n), "buy": "1.0001", "sell": "1.0002",
+        "changeRate": "0.0123", "changePrice": "0.0121", "high": "1.05", "low": "0.97", "vol": "1234567.89",
+        "volValue": "1234567.89", "last": "1.0001", "averagePrice": "1.0", "takerFeeRate": "0.001",
+        "makerFeeRate": "0.001", "takerCoefficient": "1", "makerCoefficient": "1"
+    } for n in range(count)]}}
+
+# Clients are created once, like in the bot; only the per poll work is timed
+MEXC_CLIENT = ccxt.mexc3()
+KUCOIN_CLIENT = ccxt.kucoin()
+
+def parse_mexc_full(payloads):
+    client = MEXC_CLIENT
+    exchange_info, default_symbols = (fastjson.loads(payload) for payload in payloads)
+    client.spotPublicGetExchangeInfo = lambda params={}: exchange_info
+    supported = set(default_symbols["data"])
+    return [m['info']['symbol'] for m in client.fetch_spot_markets() if m['info']['status'] == 'ENABLED' and m['info']['symbol'] in supported]
+
+def parse_mexc_light(payloads):
+    return fastjson.loads(payloads[0])["data"]
+
+def parse_binance_full(payloads):
+    return [s['symbol'] for s in fastjson.loads(payloads[0])['symbols'] if s['status'] == 'TRADING']
+
+def parse_binance_light(payloads):
+    return [ticker['symbol'] for ticker in fastjson.loads(payloads[0])]
+
+def parse_kucoin_full(payloads):
+    client = KUCOIN_CLIENT
+    symbols, tickers = (fastjson.loads(payload) for payload in payloads)
+    client.publicGetSymbols = lambda params={}: symbols
+    client.publicGetMarketAllTickers = lambda params={}: tickers
+    return [m['info']['symbol'] for m in client.fetch_markets() if m['info'].get('enableTrading')]
+
+def parse_kucoin_light(payloads):
+    return [s['symbol'] for s in fastjson.loads(payloads[0])['data'] if s.get('enableTrading')]
+
+# (label, live URLs, synthetic payloads, parser)
+STRATEGIES = [
+    ("mexc full", ["https://api.mexc.com/api/v3/exchangeInfo", "https://api.mexc.com/api/v3/defaultSymbols"],
+     lambda count: [mexc_exchange_info(count), mexc_default_symbols(count)], parse_mexc_full),
+    ("mexc light", ["https://api.mexc.com/api/v3/defaultSymbols"],
+     lambda count: [mexc_default_symbols(count)], parse_mexc_light),
+    ("binance full", ["https://api.binance.com/api/v3/exchangeInfo"],
+     lambda count: [binance_exchange_info(count)], parse_binance_full),
+    ("binance light", ["https://api.binance.com/api/v3/ticker/price"],
+     lambda count: [binance_ticker_price(count)], parse_binance_light),
+    ("kucoin full", ["https://api.kucoin.com/api/v1/symbols", "https://api.kucoin.com/api/v1/market/allTickers"],
+     lambda count: [kucoin_symbols(count), kucoin_all_tickers(count)], parse_kucoin_full),
+    ("kucoin light", ["https://api.kucoin.com/api/v1/symbols"],
+     lambda count: [kucoin_symbols(count)], parse_kucoin_light),
+]
+
+def time_parse(parser, payloads, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = perf_counter()
+        parser(payloads)
+        best = min(best, perf_counter() - start_time)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes transferred and parse time per poll for each detection source.")
+    parser.add_argument("--markets", type=int, default=2500, help="Markets in the synthetic payloads")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--live", action="store_true", help="Download the payloads from the exchanges instead")
+    args = parser.parse_args()
+
+    print("JSON decoder: {}".format("orjson" if fastjson.orjson is not None else "json"))
+    print("{:<16} {:>12} {:>12} {:>16}".format("SOURCE", "REQUESTS", "KB", "PARSE ms (best)"))
+    for label, urls, synthetic, parse in STRATEGIES:
+        if args.live:
+            payloads = [requests.get(url, timeout=10).content for url in urls]
+        else:
+            payloads = [json.dumps(payload).encode() for payload in synthetic(args.markets)]
+        elapsed = time_parse(parse, payloads, args.repeat)
+        print("{:<16} {:>12} {:>12.0f} {:>16.2f}".format(
+            label, len(urls), sum(len(payload) for payload in payloads) / 1024, elapsed * 1000
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+import logging
+import logging.handlers
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import logger as core_logger
+
+ITERATIONS = 20000
+
+def account_payload(tick):
+    """
+    Roughly the size of a spotPrivateGetAccount response for a small account.
+    """
+    return {
+        "makerCommission": 0,
+        "takerCommission": 0,
+        "canTrade": True,
+        "updateTime": tick,
+        "balances": [
+            {"asset": "ASSET{}".format(n), "free": "{:.8f}".format(n * 1.5), "locked": "0"}
+            for n in range(60)
+        ]
+    }
+
+def synchronous_logger(name, log_file):
+    """
+    The logger every module built before the queue backend: both handlers on the caller thread.
+    """
+    formatter = logging.Formatter(core_logger.LOG_FORMAT)
+    file_handler = logging.handlers.TimedRotatingFileHandler(log_file, when="midnight")
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(formatter)
+    logger = logging.getLogger(name)
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+def run(logger, repeated, lazy=False, level=logging.INFO):
+    """
+    Time the calls getAccountBalance makes on every monitor tick.
+
+    Args:
+        logger (logging.Logger): Logger under test.
+        repeated (bool): Log the same payload every tick instead of a new one.
+        lazy (bool): Pass the payload as a %-argument instead of formatting it in the call.
+        level (int): Level the payload is logged at.
+
+    Returns:
+        float: Microseconds spent on the calling thread per tick.
+    """
+    payload = account_payload(0)
+    start_time = time.perf_counter()
+    for tick in range(ITERATIONS):
+        if not repeated:
+            payload = account_payload(tick)
+        logger.info("Retrieving account details")
+        if lazy:
+            logger.log(level, "Account information: %s", payload)
+        else:
+            logger.log(level, "Account information: {}".format(payload))
+    return (time.perf_counter() - start_time) / ITERATIONS * 1e6
+
+def payload_cost(repeated):
+    """
+    Cost of building the payload itself, subtracted from every scenario.
+    """
+    start_time = time.perf_counter()
+    for tick in range(ITERATIONS):
+        if not repeated:
+            account_payload(tick)
+    return (time.perf_counter() - start_time) / ITERATIONS * 1e6
+
+def main():
+    log_dir = tempfile.mkdtemp(prefix="bench_logging_")
+    # Console output goes to /dev/null so the terminal speed does not dominate the numbers
+    real_stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")
+
+    results = []
+    try:
+        for repeated in (True, False):
+            overhead = payload_cost(repeated)
+            label = "same payload" if repeated else "new payload"
+
+            logger = synchronous_logger("bench.sync.{}".format(repeated), os.path.join(log_dir, "sync.log"))
+            results.append(("before: synchronous, eager format", label, run(logger, repeated) - overhead, 0.0))
+
+            scenarios = [
+                ("after: queue, no rate limit", "0", logging.INFO),
+                ("after: queue, default rate limit", None, logging.INFO),
+                ("after: queue, payload at DEBUG", None, logging.DEBUG)
+            ]
+            for n, (backend, rate, level) in enumerate(scenarios):
+                if rate is None:
+                    os.environ.pop("LOG_RATE_LIMIT", None)
+                else:
+                    os.environ["LOG_RATE_LIMIT"] = rate
+                logger = core_logger.getmylogger(
+                    "bench.queue.{}.{}".format(repeated, n), os.path.join(log_dir, "queue.log"), asynchronous=True
+                )
+                hot_path = run(logger, repeated, lazy=True, level=level) - overhead
+                drain_start = time.perf_counter()
+                core_logger.shutdown_logging()
+                results.append((backend, label, hot_path, time.perf_counter() - drain_start))
+    finally:
+        sys.stderr.close()
+        sys.stderr = real_stderr
+
+    print("{} ticks per scenario, logs in {}".format(ITERATIONS, log_dir))
+    print("{:<36} {:<14} {:>16} {:>18}".format("BACKEND", "SCENARIO", "HOT PATH us/tick", "BACKGROUND DRAIN s"))
+    for backend, label, hot_path, drain in results:
+        print("{:<36} {:<14} {:>16.2f} {:>18.3f}".format(backend, label, hot_path, drain))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import random
+import timeit
+import logging
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "binance"))
+from core.orderbook import OrderBook
+from binance_adapter import BinanceAdapter
+from binance_mock import MockBinance
+
+logger = logging.getLogger("bench_orderbook")
+
+def synthetic_book(levels, price=1.0):
+    bids = [["{:.6f}".format(price * (1 - 0.0005 * n)), "{:.2f}".format(random.uniform(1, 500))] for n in range(1, levels + 1)]
+    asks = [["{:.6f}".format(price * (1 + 0.0005 * n)), "{:.2f}".format(random.uniform(1, 500))] for n in range(1, levels + 1)]
+    return bids, asks
+
+def main():
+    parser = argparse.ArgumentParser(description="Limit pricing from the local order book against a REST ticker round trip.")
+    parser.add_argument("--levels", type=int, default=1000, help="Levels per side of the synthetic book")
+    parser.add_argument("--number", type=int, default=20000, help="Calls timed per operation")
+    args = parser.parse_args()
+
+    book = OrderBook("COINUSDT")
+    book.load_snapshot(*synthetic_book(args.levels), 1)
+    diffs = []
+    for sequence in range(2, args.number + 2):
+        bids, asks = synthetic_book(5)
+        diffs.append((sequence, sequence, random.sample(bids, 2), random.sample(asks, 2)))
+    diff_iter = iter(diffs)
+
+    operations = [
+        ("apply diff (4 levels)", lambda: book.apply_diff(*next(diff_iter))),
+        ("best bid", lambda: book.price('sell')),
+        ("buy price, 1000 quote", lambda: book.price('buy', funds=1000, max_slippage=0.05)),
+        ("sell price, 5000 base", lambda: book.price('sell', size=5000, max_slippage=0.05)),
+    ]
+    print("{:<26} {:>12}".format("OPERATION", "us per call"))
+    for label, run in operations:
+        elapsed = timeit.timeit(run, number=args.number) / args.number
+        print("{:<26} {:>12.2f}".format(label, elapsed * 1e6))
+
+    # The same price from REST, against the local mock (no internet latency)
+    mock = MockBinance()
+    mock.list_symbol("COINUSDT", "COIN", "USDT", 1)
+    os.environ["BINANCE_API_URL"] = mock.serve_in_background()
+    adapter = BinanceAdapter(logger)
+    adapter.client = adapter.create_client()
+    number = 200
+    elapsed = timeit.timeit(lambda: adapter.get_exit_price("COINUSDT"), number=number) / number
+    print("{:<26} {:>12.2f}".format("bookTicker REST (local)", elapsed * 1e6))
+
+if __name__ == "__main__":
+    main()
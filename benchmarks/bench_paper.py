@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "binance"))
+from binance_adapter import BinanceAdapter
+from binance_mock import MockBinance
+
+logger = logging.getLogger("bench_paper")
+
+def wait_idle(workers):
+    while True:
+        metrics = workers.metrics()
+        if not metrics['queue_depth'] and not metrics['in_flight']:
+            return
+        time.sleep(0.01)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scanner, action and monitor in paper trading mode over many simultaneous listings.")
+    parser.add_argument("--listings", type=int, default=300, help="Pairs listed at once, each one bought then sold")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Simulated order latency")
+    parser.add_argument("--workers", type=int, default=16, help="TRADE_WORKERS of the action and monitor")
+    args = parser.parse_args()
+
+    # Market data from the local mock, orders simulated; nothing reaches an exchange
+    state_dir = tempfile.mkdtemp(prefix="bench_paper_")
+    with open(os.path.join(state_dir, "config.json"), 'w') as config_file:
+        json.dump({"state_dir": state_dir, "max_trade_per_account": args.listings}, config_file)
+    mock = MockBinance()
+    os.environ.update({
+        "BINANCE_API_URL": mock.serve_in_background(),
+        "BOT_CONFIG": os.path.join(state_dir, "config.json"),
+        "MARKET_CACHE_DIR": state_dir,
+        "ORDER_BOOK": "0",
+        "USER_DATA_STREAM": "0",
+        "TRADE_WORKERS": str(args.workers),
+        "PAPER_LATENCY_MS": str(args.latency_ms),
+        "PAPER_BALANCE": str(100 * args.listings)
+    })
+
+    from core import orders
+    from core.action import Action
+    from core.monitor import Monitor
+    from core.paper import create_adapter
+    from core.records import Candidate, Position
+    from core.scanner import Scanner
+    # The pause before every order paces real requests, the paper latency replaces it
+    orders.OrderManager.request_delay = 0
+
+    adapter = create_adapter(BinanceAdapter, logger, paper=True)
+    adapter.connect()
+    # exchangeInfo weighs 20 requests, the client throttle would measure the rate limit of Binance only
+    adapter.client.enableRateLimit = False
+    pairs = ["P{}USDT".format(n) for n in range(args.listings)]
+    for pair in pairs:
+        mock.list_symbol(pair, pair[:-4], "USDT", 1)
+
+    started = time.perf_counter()
+    Scanner(adapter, logger).process_new_pairs(pairs)
+    scanned = time.perf_counter()
+
+    action = Action(adapter, logger)
+    candidates = [Candidate.from_dict(trade) for trade in action.potential_trades.read()]
+    # As in Action.main(): the pass's candidates bought as one batch
+    action.workers.submit_group([candidate.symbol for candidate in candidates], action.process_trades, candidates)
+    wait_idle(action.workers)
+    bought = time.perf_counter()
+
+    for pair in pairs:
+        mock.set_price(pair, 1.3)
+    monitor = Monitor(adapter, logger)
+    positions = monitor.trade_list.read()
+    for trade in positions:
+        monitor.workers.submit(trade['symbol'], monitor.check_trade, Position.from_dict(trade))
+    wait_idle(monitor.workers)
+    sold = time.perf_counter()
+
+    print("{:<28} {:>10} {:>10} {:>12}".format("STAGE", "ITEMS", "SECONDS", "PER SECOND"))
+    for label, items, elapsed in (
+        ("scan + allocate", args.listings, scanned - started),
+        ("buy (action)", len(positions), bought - scanned),
+        ("take profit (monitor)", len(positions) - len(monitor.trade_list.read()), sold - bought),
+    ):
+        print("{:<28} {:>10} {:>10.2f} {:>12.1f}".format(label, items, elapsed, items / elapsed if elapsed else 0))
+    print("paper USDT balance: {:.2f} (started with {:.2f})".format(adapter.get_balance("USDT"), 100.0 * args.listings))
+
+if __name__ == "__main__":
+    main()
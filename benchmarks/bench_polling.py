@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "binance"))
+from core.polling import HedgedPoller
+from binance_adapter import BinanceAdapter
+from binance_mock import MockBinance
+
+logger = logging.getLogger("bench_polling")
+
+def detection_delays(mock, base_url, workers, interval, budget, listings):
+    """
+    List `listings` symbols at random moments and time how long the poller takes to
+    hand over a market list containing each of them.
+    """
+    adapter = BinanceAdapter(logger)
+    poller = HedgedPoller(adapter, logger, interval, workers=workers, hosts=[base_url], budget=budget)
+    poller.start()
+    # Baseline snapshot
+    poller.next(interval * 2)
+
+    delays = []
+    for n in range(listings):
+        time.sleep(random.uniform(0, interval))
+        symbol = "NEW{}W{}USDT".format(n, workers)
+        listed_at = time.perf_counter()
+        mock.list_symbol(symbol, "NEW{}W{}".format(n, workers), "USDT", 1)
+        while True:
+            markets = poller.next(interval * 2)
+            if markets is not None and symbol in markets['Pairs']:
+                delays.append(time.perf_counter() - listed_at)
+                break
+    return delays
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing detection delay of hedged polling against the local Binance mock.")
+    parser.add_argument("--interval", type=float, default=1.0, help="Poll interval of every poller, in seconds")
+    parser.add_argument("--workers", default="1,2,4", help="Comma separated poller counts to compare")
+    parser.add_argument("--budget", type=float, default=10, help="Requests per second of all pollers together")
+    parser.add_argument("--listings", type=int, default=10)
+    args = parser.parse_args()
+
+    mock = MockBinance()
+    mock.list_symbol("BTCUSDT", "BTC", "USDT", 30000)
+    base_url = mock.serve_in_background()
+
+    print("{:<10} {:>16} {:>16} {:>14}".format("POLLERS", "MEAN DELAY ms", "MAX DELAY ms", "REQUESTS/s"))
+    for workers in [int(count) for count in args.workers.split(",")]:
+        delays = detection_delays(mock, base_url, workers, args.interval, args.budget, args.listings)
+        print("{:<10} {:>16.0f} {:>16.0f} {:>14.1f}".format(
+            workers, sum(delays) / len(delays) * 1000, max(delays) * 1000, min(workers / args.interval, args.budget)
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.records import PositionTable
+
+def dict_pass(records, prices, take_profit, stop_loss):
+    # Former monitor pass: the opening price parsed again on every check
+    crossed = []
+    for record, price in zip(records, prices):
+        open_price = float(record["openPrice"])
+        if price is not None and (price >= open_price * take_profit or price <= open_price * stop_loss):
+            crossed.append(record)
+    return crossed
+
+def main():
+    parser = argparse.ArgumentParser(description="Take profit / stop loss pass over dict records against the position table.")
+    parser.add_argument("--positions", default="10,100,1000,10000", help="Comma separated position counts")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print("{:<10} {:>10} {:>10} {:>14} {:>14}".format("POSITIONS", "dict us", "table us", "dict peak KiB", "table peak KiB"))
+    for count in [int(count) for count in args.positions.split(",")]:
+        # As read from the trade list file, prices written as strings by some venues
+        records = json.loads(json.dumps([
+            {"symbol": "COIN{}USDT".format(n), "openPrice": str(random.uniform(0.001, 10))} for n in range(count)
+        ]))
+        prices = [float(record["openPrice"]) * random.uniform(0.7, 1.3) for record in records]
+        table = PositionTable()
+        table.sync(records)
+        assert len(dict_pass(records, prices, 1.2, 0.8)) == len(table.crossed(prices, 1.2, 0.8))
+
+        dict_us = timeit.timeit(lambda: dict_pass(records, prices, 1.2, 0.8), number=args.number) / args.number * 1e6
+        # The file re-read every pass: unchanged, the table is not rebuilt
+        table_us = timeit.timeit(lambda: (table.sync(records), table.crossed(prices, 1.2, 0.8)), number=args.number) / args.number * 1e6
+
+        allocated = []
+        for run in (lambda: dict_pass(records, prices, 1.2, 0.8), lambda: table.crossed(prices, 1.2, 0.8)):
+            tracemalloc.start()
+            run()
+            allocated.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+        print("{:<10} {:>10.1f} {:>10.1f} {:>14.1f} {:>14.1f}".format(count, dict_us, table_us, *allocated))
+
+if __name__ == "__main__":
+    main()
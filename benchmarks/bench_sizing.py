@@ -0,0 +1,76 @@
+import os
+import sys
+import timeit
+import decimal
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.precision import Quantizer
+
+def clean(amount, base_increment, current_price, side="buy"):
+    """
+    Order size calculation as it was before core.precision, kept as the baseline.
+
+    Args:
+        amount (float): Funds in the quote currency for a buy, balance in the base currency for a sell.
+        base_increment (str): The smallest increment of the order size, e.g. "0.001".
+        current_price (float): The current price of the asset.
+        side (str): The side of the trade, either "buy" or "sell".
+
+    Returns:
+        float: The cleaned and calculated order size in the base currency.
+
+    """
+    decimal.getcontext().rounding = decimal.ROUND_DOWN
+
+    # Determine the number of decimal places for rounding
+    # mexc sometimes put 0 as the base increment so we try to get it from the price
+    if float(base_increment) == 0.0:
+        decimal_places = len(str(current_price).split(".")[-1])
+    else:
+        decimal_places = len(base_increment.split(".")[-1])
+
+    # Calculate the order size based on the side of the trade.
+    if side == "buy":
+        size = decimal.Decimal(amount) / decimal.Decimal(current_price)
+    else:
+        size = decimal.Decimal(amount)
+
+    # Round the order size to the specified decimal places.
+    size_to_exchange = round(size, decimal_places)
+
+    return float(size_to_exchange)
+
+# (base increment, funds or balance, price)
+CASES = [
+    ("0.01", 1000.0, 0.0734),
+    ("0.0001", 250.5, 1.2345),
+    ("1", 1000.0, 0.000321),
+    ("0.5", 10.99, None),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Order sizing: clean() against a precompiled Quantizer.")
+    parser.add_argument("--number", type=int, default=200000, help="Calls timed per case")
+    args = parser.parse_args()
+
+    print("{:<10} {:<6} {:>12} {:>14} {:>14} {:>14}".format("STEP", "SIDE", "clean() ns", "Quantizer ns", "clean() size", "Quantizer size"))
+    for step, amount, price in CASES:
+        quantizer = Quantizer("COINUSDT", step)
+        if price is None:
+            side = "sell"
+            run_clean = lambda: clean(amount, step, 1.0, "sell")
+            run_quantizer = lambda: quantizer.size(amount)
+        else:
+            side = "buy"
+            run_clean = lambda: clean(amount, step, price)
+            run_quantizer = lambda: quantizer.size(amount, price)
+
+        clean_ns = min(timeit.repeat(run_clean, number=args.number, repeat=3)) / args.number * 1e9
+        quantizer_ns = min(timeit.repeat(run_quantizer, number=args.number, repeat=3)) / args.number * 1e9
+        print("{:<10} {:<6} {:>12.0f} {:>14.0f} {:>14} {:>14}".format(
+            step, side, clean_ns, quantizer_ns, run_clean(), run_quantizer()
+        ))
+
+if __name__ == "__main__":
+    main()
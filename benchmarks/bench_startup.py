@@ -0,0 +1,93 @@
+import os
+import sys
+import logging
+import argparse
+import tempfile
+from time import perf_counter
+
+import ccxt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import startup
+
+logger = logging.getLogger("bench_startup")
+
+def synthetic_markets(count):
+    """
+    A MEXC-shaped market catalogue, used when the exchange is not reachable.
+    """
+    return [{
+        'id': 'COIN{}USDT'.format(n),
+        'symbol': 'COIN{}/USDT'.format(n),
+        'base': 'COIN{}'.format(n),
+        'quote': 'USDT',
+        'baseId': 'COIN{}'.format(n),
+        'quoteId': 'USDT',
+        'type': 'spot',
+        'spot': True,
+        'active': True,
+        'precision': {'amount': 0.01, 'price': 0.0001},
+        'limits': {'amount': {'min': 1, 'max': 1000000}},
+        'info': {
+            'symbol': 'COIN{}USDT'.format(n),
+            'status': 'ENABLED',
+            'baseAsset': 'COIN{}'.format(n),
+            'quoteAsset': 'USDT',
+            'baseSizePrecision': '0.01',
+            'quoteAmountPrecisionMarket': '5',
+            'maxQuoteAmountMarket': '2000000',
+            'orderTypes': ['LIMIT', 'MARKET']
+        }
+    } for n in range(count)]
+
+def first_order_after(connect):
+    """
+    Time from client creation to an order request being sent on the raw endpoint
+    mexc_action uses. The request itself is stubbed out.
+    """
+    start_time = perf_counter()
+    handle = ccxt.mexc3({'enableRateLimit': True})
+    ready = connect(handle)
+    handle.spotPrivatePostOrder = lambda params: {'orderId': '1'}
+    handle.spotPrivatePostOrder({"symbol": "COIN1USDT", "side": "BUY", "type": "MARKET", "quoteOrderQty": 5})
+    first_order = perf_counter() - start_time
+    if ready is not None:
+        ready.wait()
+    return first_order, perf_counter() - start_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure boot to first order with and without the market cache.")
+    parser.add_argument("--markets", type=int, default=2500, help="Size of the synthetic market catalogue")
+    parser.add_argument("--live", action="store_true", help="Also time a real load_markets() against MEXC")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    os.environ["MARKET_CACHE_DIR"] = cache_dir
+    markets = synthetic_markets(args.markets)
+    seed = ccxt.mexc3()
+    seed.set_markets(markets)
+    startup.write_market_cache(startup.market_cache_path(seed.id), seed.markets, seed.currencies)
+
+    results = []
+
+    if args.live:
+        def connect_live(handle):
+            handle.load_markets()
+        results.append(("load_markets() from the exchange", first_order_after(connect_live)))
+
+    def connect_blocking_cache(handle):
+        cached = startup.read_market_cache(startup.market_cache_path(handle.id))
+        handle.set_markets(cached['markets'], cached['currencies'])
+    results.append(("cache applied before returning", first_order_after(connect_blocking_cache)))
+
+    def connect_background_cache(handle):
+        return startup.load_markets_cached(handle, logger, max_age=float("inf"))
+    results.append(("load_markets_cached()", first_order_after(connect_background_cache)))
+
+    print("{} markets, cache in {}".format(args.markets, cache_dir))
+    print("{:<36} {:>20} {:>20}".format("CONNECT", "FIRST ORDER SENT ms", "MARKETS READY ms"))
+    for label, (first_order, ready) in results:
+        print("{:<36} {:>20.2f} {:>20.2f}".format(label, first_order * 1000, ready * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.persistence import StateWriter
+
+def truncating_write(path, data):
+    # Former TradeStore._save(): readers see an empty or half written file meanwhile
+    with open(path, 'w') as trade_list:
+        json.dump(data, trade_list)
+
+def atomic_write(path, data):
+    # Every write committed on its own: two fsyncs each
+    temp_path = "{}.{}.tmp".format(path, threading.get_ident())
+    with open(temp_path, 'w') as temp_file:
+        json.dump(data, temp_file)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+    os.replace(temp_path, path)
+    directory_fd = os.open(os.path.dirname(path), os.O_RDONLY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+def run(write, state_dir, threads, writes, trades):
+    data = [{"symbol": "COIN{}USDT".format(n), "openPrice": 1.0 + n} for n in range(trades)]
+
+    def writer(n):
+        path = os.path.join(state_dir, "trades_{}.json".format(n))
+        for _ in range(writes):
+            write(path, data)
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Trade file writes: truncating, atomic with one fsync per write, atomic with grouped fsyncs.")
+    parser.add_argument("--threads", type=int, default=8, help="Threads writing a file each at the same time")
+    parser.add_argument("--writes", type=int, default=50, help="Writes per thread")
+    parser.add_argument("--trades", type=int, default=20, help="Trades per file")
+    parser.add_argument("--window", type=float, default=0.002, help="Gathering delay of the last writer")
+    args = parser.parse_args()
+
+    state_dir = tempfile.mkdtemp(prefix="bench_state_")
+    total = args.threads * args.writes
+    print("{:<26} {:>10} {:>12} {:>8} {:>8}".format("WRITE", "SECONDS", "WRITES/SEC", "BATCHES", "FSYNCS"))
+    elapsed = run(truncating_write, state_dir, args.threads, args.writes, args.trades)
+    print("{:<26} {:>10.3f} {:>12.0f} {:>8} {:>8}".format("truncate (no fsync)", elapsed, total / elapsed, "-", 0))
+    elapsed = run(atomic_write, state_dir, args.threads, args.writes, args.trades)
+    print("{:<26} {:>10.3f} {:>12.0f} {:>8} {:>8}".format("atomic, commit each", elapsed, total / elapsed, total, 2 * total))
+    for label, writer in (
+        ("atomic, grouped", StateWriter(window=0, fsync=True)),
+        ("atomic, grouped + window", StateWriter(window=args.window, fsync=True)),
+    ):
+        elapsed = run(writer.write, state_dir, args.threads, args.writes, args.trades)
+        metrics = writer.metrics()
+        print("{:<26} {:>10.3f} {:>12.0f} {:>8} {:>8}".format(label, elapsed, total / elapsed, metrics['batches'], metrics['fsyncs']))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import os
+import sys
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.logger import getmylogger
+from core.action import Action
+from core.paper import create_adapter
+from binance_adapter import BinanceAdapter
+
+load_dotenv()
+
+logger = getmylogger(__name__, "../logs/binance/binance_action.log")
+
+def main():
+    adapter = create_adapter(BinanceAdapter, logger)
+    adapter.connect()
+    Action(adapter, logger).main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import ccxt
+import aiohttp
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.errors import BAD_SYMBOL, DUPLICATE_ORDER, MARKET_ORDER_DISABLED, ORDER_NOT_FOUND, RATE_LIMIT
+from core.exchange import ExchangeAdapter
+from core.orderbook import DepthStream
+
+class BinanceListingStream(threading.Thread):
+    """
+    Watches the all-market mini ticker stream and flags symbols that start
+    ticking while not being known as TRADING from the last exchangeInfo.
+
+    The stream only wakes the scanner up; the symbol metadata and the delta
+    itself still come from exchangeInfo.
+    """
+
+    reconnect_delay = 1
+
+    def __init__(self, url, logger):
+        super().__init__(name="binance-listings", daemon=True)
+        self.url = url
+        self.logger = logger
+        self.known_symbols = set()
+        self.new_listing = threading.Event()
+
+    def run(self):
+        asyncio.run(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(self.url, heartbeat=30) as websocket:
+                        self.logger.info("Listening for new listings on {}".format(self.url))
+                        async for message in websocket:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                self._on_tickers(json.loads(message.data))
+                            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+            except Exception as err:
+                self.logger.info("Listing stream disconnected - {}".format(err))
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _on_tickers(self, tickers):
+        # Nothing to compare against until the scanner has seen exchangeInfo once
+        if not self.known_symbols:
+            return
+        unknown = [ticker['s'] for ticker in tickers if ticker['s'] not in self.known_symbols]
+        if unknown:
+            self.logger.info("Ticker stream shows new symbol(s): {}".format(unknown))
+            self.known_symbols.update(unknown)
+            self.new_listing.set()
+
+class BinanceDepthStream(DepthStream):
+    """
+    Binance diff depth streams (<symbol>@depth@100ms) on the raw stream
+    endpoint, synced from /api/v3/depth. Diffs cover the updates U to u.
+    """
+
+    def connect_url(self):
+        # Same host as the listing stream, e.g. wss://stream.binance.com:9443/ws
+        return os.getenv('BINANCE_WS_URL', BinanceAdapter.default_ws_url).rsplit('/', 1)[0]
+
+    async def subscribe(self, websocket, symbols):
+        await websocket.send_str(json.dumps({
+            "method": "SUBSCRIBE",
+            "params": ["{}@depth@100ms".format(symbol.lower()) for symbol in symbols],
+            "id": int(time.time() * 1000)
+        }))
+
+    async def unsubscribe(self, websocket, symbols):
+        await websocket.send_str(json.dumps({
+            "method": "UNSUBSCRIBE",
+            "params": ["{}@depth@100ms".format(symbol.lower()) for symbol in symbols],
+            "id": int(time.time() * 1000)
+        }))
+
+    def handle(self, message):
+        if message.get('e') == 'depthUpdate':
+            self.apply_diff(message['s'], message['U'], message['u'], message['b'], message['a'])
+
+class BinanceAdapter(ExchangeAdapter):
+    """
+    Binance spot. Market buys are sized in the quote currency through
+    quoteOrderQty, symbols are written without separator (e.g. BTCUSDT).
+
+    BINANCE_API_URL and BINANCE_WS_URL point the adapter at another host,
+    e.g. the local mock in binance_mock.py.
+    """
+
+    name = "binance"
+    market_buy_in_quote = True
+    # newClientOrderId is only unique among open orders, a filled market order can be sent twice
+    dedupes_client_order_ids = False
+    client_order_id_param = 'newClientOrderId'
+    api_hosts = ("https://api1.binance.com", "https://api2.binance.com", "https://api3.binance.com", "https://api4.binance.com")
+    default_ws_url = "wss://stream.binance.com:9443/ws/!miniTicker@arr"
+    depth_stream_class = BinanceDepthStream
+    error_codes = {
+        '-1003': RATE_LIMIT,
+        # Too many new orders
+        '-1015': RATE_LIMIT,
+        '-1121': BAD_SYMBOL,
+        '-2013': ORDER_NOT_FOUND,
+        '-1014': MARKET_ORDER_DISABLED
+    }
+    error_messages = (
+        # -2010 covers every rejected new order, the message tells them apart
+        ('Duplicate order sent', DUPLICATE_ORDER),
+        ('Market orders are not supported', MARKET_ORDER_DISABLED)
+    )
+
+    def __init__(self, logger, account=None):
+        super().__init__(logger, account)
+        self.symbol_info = {}
+        self.listing_stream = None
+
+    def create_client(self):
+        client = ccxt.binance({
+            'apiKey': self.credential('BINANCE_API_KEY'),
+            'secret': self.credential('BINANCE_API_SECRET_KEY'),
+            'enableRateLimit': True,
+            'options': {'defaultType': 'spot', 'fetchCurrencies': False}
+        })
+        api_url = os.getenv('BINANCE_API_URL')
+        if api_url:
+            self.set_api_host(client, api_url)
+        return client
+
+    def set_api_host(self, client, host):
+        client.urls['api']['public'] = host.rstrip('/') + '/api/v3'
+        client.urls['api']['private'] = host.rstrip('/') + '/api/v3'
+
+    def start_listing_stream(self):
+        self.listing_stream = BinanceListingStream(os.getenv('BINANCE_WS_URL', self.default_ws_url), self.logger)
+        self.listing_stream.start()
+
+    def wait_for_listing(self, timeout):
+        if self.listing_stream is None:
+            return super().wait_for_listing(timeout)
+        if self.listing_stream.new_listing.wait(timeout):
+            self.listing_stream.new_listing.clear()
+
+    def list_markets_full(self, client):
+        symbol_list = client.publicGetExchangeInfo()['symbols']
+        trading = [
+            symbol for symbol in symbol_list
+            if symbol['status'] == 'TRADING' and symbol.get('isSpotTradingAllowed', True)
+        ]
+        # Keep the metadata of the snapshot, the scanner asks for the details of the delta right after
+        self.symbol_info = {symbol['symbol']: symbol for symbol in symbol_list}
+        if self.listing_stream is not None:
+            self.listing_stream.known_symbols = {symbol['symbol'] for symbol in trading}
+        return {
+            'Symbols': list(set(symbol['baseAsset'] for symbol in trading)),
+            'Pairs': [symbol['symbol'] for symbol in trading]
+        }
+
+    def list_markets_light(self, client):
+        # One symbol/price pair per market instead of the filters and permissions of exchangeInfo;
+        # pairs that are listed but not trading yet are caught by has_started_trading()
+        pairs = [ticker['symbol'] for ticker in self.fetch_public(client, client.urls['api']['public'] + "/ticker/price")]
+        if self.listing_stream is not None:
+            self.listing_stream.known_symbols = set(pairs)
+        return {'Symbols': [], 'Pairs': pairs}
+
+    def _exchange_info(self, symbol):
+        try:
+            symbol_list = self.client.publicGetExchangeInfo({'symbol': symbol})['symbols']
+        except ccxt.ExchangeError:
+            return None
+        if not symbol_list:
+            return None
+        self.symbol_info[symbol] = symbol_list[0]
+        return symbol_list[0]
+
+    def fetch_symbol_detail(self, symbol):
+        symbol_info = self.symbol_info.get(symbol)
+        # The status of a pair not trading yet is asked again, it is what the scanner waits for
+        if symbol_info is None or symbol_info['status'] != 'TRADING':
+            symbol_info = self._exchange_info(symbol)
+        if symbol_info is None:
+            return None
+
+        filters = {item['filterType']: item for item in symbol_info.get('filters', [])}
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+        step_size = filters.get('LOT_SIZE', {}).get('stepSize', '0')
+        # Binance pads the step with zeros (0.00100000), keep only the significant decimals
+        if '.' in step_size:
+            step_size = step_size.rstrip('0').rstrip('.') or '0'
+
+        return {
+            'symbol': symbol_info['symbol'],
+            'base': symbol_info['baseAsset'],
+            'quote': symbol_info['quoteAsset'],
+            'min_size': float(notional.get('minNotional', 0)),
+            'max_size': float(notional.get('maxNotional', 9000000)),
+            'base_increment': step_size,
+            'info': symbol_info
+        }
+
+    def quantizer_spec(self, symbol_detail):
+        filters = {item['filterType']: item for item in symbol_detail['info'].get('filters', [])}
+        lot_size = filters.get('LOT_SIZE', {})
+        return dict(
+            super().quantizer_spec(symbol_detail),
+            tick=filters.get('PRICE_FILTER', {}).get('tickSize'),
+            min_base=float(lot_size.get('minQty', 0)),
+            max_base=float(lot_size.get('maxQty', 'inf'))
+        )
+
+    def is_leveraged(self, symbol_detail):
+        # BLVT pairs (BTCUP, BTCDOWN) carry the LEVERAGED permission
+        permissions = symbol_detail['info'].get('permissions') or []
+        return 'LEVERAGED' in permissions
+
+    def has_started_trading(self, symbol_detail):
+        # fetch_symbol_detail() only keeps the cached metadata of pairs already trading
+        return symbol_detail['info']['status'] == 'TRADING'
+
+    def request_balance(self, currency):
+        self.logger.info("Retrieving account details")
+        account_info = self.client.privateGetAccount()
+        self.logger.debug("Account information: %s", account_info)
+
+        for asset in account_info["balances"]:
+            if asset['asset'] == currency:
+                self.logger.info('Available balance: {}'.format(asset['free']))
+                return float(asset['free'])
+        return 0.0
+
+    def fetch_depth(self, symbol, client=None):
+        depth = (client or self.client).publicGetDepth({'symbol': symbol, 'limit': self.depth_limit})
+        return depth['bids'], depth['asks'], depth['lastUpdateId']
+
+    def get_last_price(self, symbol):
+        return float(self.client.publicGetTickerPrice({'symbol': symbol})['price'])
+
+    def get_exit_price(self, symbol):
+        return float(self.client.publicGetTickerBookTicker({'symbol': symbol})['bidPrice'])
+
+    def create_market_buy(self, symbol, amount, client_order_id=None):
+        return self.client.privatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "BUY",
+            "type": "MARKET",
+            "quoteOrderQty": amount,
+            "newOrderRespType": "FULL"
+        }, client_order_id))
+
+    def create_market_sell(self, symbol, size, client_order_id=None):
+        return self.client.privatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "SELL",
+            "type": "MARKET",
+            "quantity": size,
+            "newOrderRespType": "FULL"
+        }, client_order_id))
+
+    def create_limit_buy(self, symbol, size, price, client_order_id=None):
+        return self.client.privatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "BUY",
+            "type": "LIMIT",
+            "timeInForce": "GTC",
+            "quantity": size,
+            "price": price,
+            "newOrderRespType": "FULL"
+        }, client_order_id))
+
+    def create_limit_sell(self, symbol, size, price, client_order_id=None):
+        return self.client.privatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "SELL",
+            "type": "LIMIT",
+            "timeInForce": "GTC",
+            "quantity": size,
+            "price": price,
+            "newOrderRespType": "FULL"
+        }, client_order_id))
+
+    def find_order(self, symbol, client_order_id):
+        try:
+            return self.client.privateGetOrder({'symbol': symbol, 'origClientOrderId': client_order_id})
+        except Exception as err:
+            if self.classify_error(err) == ORDER_NOT_FOUND:
+                return None
+            raise
+
+    def order_id(self, result):
+        if isinstance(result, dict):
+            return result.get('orderId')
+        return None
+
+    def open_price(self, result, symbol):
+        # Average fill price of the order, FULL responses carry the executed quantities
+        executed = float(result.get('executedQty') or 0)
+        if executed:
+            return float(result['cummulativeQuoteQty']) / executed
+        return self.get_last_price(symbol)
+
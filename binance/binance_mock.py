@@ -0,0 +1,326 @@
+import json
+import time
+import asyncio
+import argparse
+import threading
+from aiohttp import web
+
+class MockBinance:
+    """
+    Minimal local stand-in for the Binance spot REST API, the all-market mini
+    ticker stream and the diff depth streams. Orders fill instantly at the
+    current price; every symbol has a small synthetic book around its price.
+
+    Listings and price moves are driven through POST /mock/listing and
+    POST /mock/price, or from Python through list_symbol() and set_price();
+    the tests (tests/conftest.py) serve one per test.
+    """
+
+    def __init__(self, balances=None):
+        self.symbols = {}
+        self.prices = {}
+        self.balances = dict(balances or {"USDT": 1000.0})
+        self.orders = []
+        # Every POST /api/v3/order, rejected ones included
+        self.order_requests = 0
+        # GET /api/v3/ticker/price answers 503 while set, and counts the requests received
+        self.ticker_unavailable = False
+        self.ticker_requests = 0
+        self.next_order_id = 1
+        # Seconds the next order response is held back after the order was filled, to simulate a timeout
+        self.delay_next_response = 0
+        self.websockets = set()
+        # Depth: levels per symbol, last update id per symbol, diffs not pushed yet and subscribers
+        self.books = {}
+        self.depth_update_ids = {}
+        self.depth_diffs = []
+        self.depth_subscribers = {}
+
+    def list_symbol(self, symbol, base, quote, price, status="TRADING", step_size="0.01000000", min_notional="5.00000000",
+                    market_orders=True):
+        self.symbols[symbol] = {
+            "symbol": symbol,
+            "status": status,
+            "baseAsset": base,
+            "quoteAsset": quote,
+            "isSpotTradingAllowed": True,
+            "orderTypes": ["LIMIT", "MARKET"] if market_orders else ["LIMIT"],
+            "filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.00010000"},
+                {"filterType": "LOT_SIZE", "minQty": step_size, "maxQty": "9000000.00000000", "stepSize": step_size},
+                {"filterType": "NOTIONAL", "minNotional": min_notional, "maxNotional": "9000000.00000000"}
+            ]
+        }
+        self.set_price(symbol, price)
+
+    def set_price(self, symbol, price):
+        self.prices[symbol] = float(price)
+        self._move_book(symbol)
+
+    def _move_book(self, symbol):
+        # Ten levels of 1000 units on each side, 0.2% apart, around the price
+        price = self.prices[symbol]
+        book = {
+            "bids": {"{:.8f}".format(price * (1 - 0.002 * n)): "1000.00000000" for n in range(1, 11)},
+            "asks": {"{:.8f}".format(price * (1 + 0.002 * n)): "1000.00000000" for n in range(1, 11)}
+        }
+        previous = self.books.get(symbol, {"bids": {}, "asks": {}})
+        first = self.depth_update_ids.get(symbol, 0) + 1
+        self.depth_update_ids[symbol] = first
+        self.books[symbol] = book
+        self.depth_diffs.append({
+            "e": "depthUpdate", "E": int(time.time() * 1000), "s": symbol, "U": first, "u": first,
+            "b": [[level, book["bids"].get(level, "0.00000000")] for level in set(previous["bids"]) | set(book["bids"])],
+            "a": [[level, book["asks"].get(level, "0.00000000")] for level in set(previous["asks"]) | set(book["asks"])]
+        })
+
+    def _params(self, request, body):
+        params = dict(request.query)
+        params.update(body)
+        return params
+
+    def _error(self, code, message, status=400):
+        return web.json_response({"code": code, "msg": message}, status=status)
+
+    async def exchange_info(self, request):
+        symbol = request.query.get("symbol")
+        if symbol:
+            if symbol not in self.symbols:
+                return self._error(-1121, "Invalid symbol.")
+            return web.json_response({"timezone": "UTC", "symbols": [self.symbols[symbol]]})
+        return web.json_response({"timezone": "UTC", "serverTime": int(time.time() * 1000), "symbols": list(self.symbols.values())})
+
+    async def ticker_price(self, request):
+        self.ticker_requests += 1
+        if self.ticker_unavailable:
+            return web.Response(status=503, text="Service Unavailable")
+        symbol = request.query.get("symbol")
+        if symbol is None:
+            return web.json_response([
+                {"symbol": symbol, "price": "{:.8f}".format(price)} for symbol, price in self.prices.items()
+            ])
+        if symbol not in self.prices:
+            return self._error(-1121, "Invalid symbol.")
+        return web.json_response({"symbol": symbol, "price": "{:.8f}".format(self.prices[symbol])})
+
+    async def book_ticker(self, request):
+        symbol = request.query.get("symbol")
+        if symbol not in self.prices:
+            return self._error(-1121, "Invalid symbol.")
+        price = "{:.8f}".format(self.prices[symbol])
+        return web.json_response({"symbol": symbol, "bidPrice": price, "bidQty": "1000", "askPrice": price, "askQty": "1000"})
+
+    async def depth(self, request):
+        symbol = request.query.get("symbol")
+        if symbol not in self.books:
+            return self._error(-1121, "Invalid symbol.")
+        book = self.books[symbol]
+        return web.json_response({
+            "lastUpdateId": self.depth_update_ids[symbol],
+            "bids": sorted(([price, size] for price, size in book["bids"].items()), key=lambda level: -float(level[0])),
+            "asks": sorted(([price, size] for price, size in book["asks"].items()), key=lambda level: float(level[0]))
+        })
+
+    async def account(self, request):
+        if "X-MBX-APIKEY" not in request.headers:
+            return self._error(-2014, "API-key format invalid.", status=401)
+        return web.json_response({
+            "canTrade": True,
+            "balances": [
+                {"asset": asset, "free": "{:.8f}".format(free), "locked": "0.00000000"}
+                for asset, free in self.balances.items()
+            ]
+        })
+
+    async def order(self, request):
+        if "X-MBX-APIKEY" not in request.headers:
+            return self._error(-2014, "API-key format invalid.", status=401)
+        self.order_requests += 1
+        params = self._params(request, await request.post())
+        symbol = params.get("symbol")
+        if symbol not in self.symbols or self.symbols[symbol]["status"] != "TRADING":
+            return self._error(-1121, "Invalid symbol.")
+        if params.get("type") not in self.symbols[symbol]["orderTypes"]:
+            return self._error(-1014, "Market orders are not supported for this symbol.")
+
+        client_order_id = params.get("newClientOrderId")
+        if client_order_id and any(order["clientOrderId"] == client_order_id for order in self.orders):
+            # Stricter than Binance, which only rejects ids of open orders
+            return self._error(-2010, "Duplicate order sent.")
+
+        info = self.symbols[symbol]
+        price = float(params["price"]) if params.get("type") == "LIMIT" else self.prices[symbol]
+        if "quoteOrderQty" in params:
+            quantity = float(params["quoteOrderQty"]) / price
+        else:
+            quantity = float(params["quantity"])
+        step = float(next(f for f in info["filters"] if f["filterType"] == "LOT_SIZE")["stepSize"])
+        quantity = int(quantity / step) * step
+        quote_quantity = quantity * price
+
+        base, quote = info["baseAsset"], info["quoteAsset"]
+        if params["side"] == "BUY":
+            if self.balances.get(quote, 0.0) < quote_quantity:
+                return self._error(-2010, "Account has insufficient balance for requested action.")
+            self.balances[quote] -= quote_quantity
+            self.balances[base] = self.balances.get(base, 0.0) + quantity
+        else:
+            if self.balances.get(base, 0.0) < quantity - 1e-12:
+                return self._error(-2010, "Account has insufficient balance for requested action.")
+            self.balances[base] -= quantity
+            self.balances[quote] = self.balances.get(quote, 0.0) + quote_quantity
+
+        order = {
+            "symbol": symbol,
+            "orderId": self.next_order_id,
+            "clientOrderId": params.get("newClientOrderId", "mock{}".format(self.next_order_id)),
+            "transactTime": int(time.time() * 1000),
+            "price": "0.00000000" if params.get("type") == "MARKET" else "{:.8f}".format(price),
+            "origQty": "{:.8f}".format(quantity),
+            "executedQty": "{:.8f}".format(quantity),
+            "cummulativeQuoteQty": "{:.8f}".format(quote_quantity),
+            "status": "FILLED",
+            "type": params.get("type"),
+            "side": params["side"],
+            "fills": [{"price": "{:.8f}".format(price), "qty": "{:.8f}".format(quantity), "commission": "0", "commissionAsset": base}]
+        }
+        self.next_order_id += 1
+        self.orders.append(order)
+        if self.delay_next_response:
+            delay, self.delay_next_response = self.delay_next_response, 0
+            await asyncio.sleep(delay)
+        return web.json_response(order)
+
+    async def query_order(self, request):
+        if "X-MBX-APIKEY" not in request.headers:
+            return self._error(-2014, "API-key format invalid.", status=401)
+        for order in self.orders:
+            if order["symbol"] == request.query.get("symbol") and (
+                str(order["orderId"]) == request.query.get("orderId") or order["clientOrderId"] == request.query.get("origClientOrderId")
+            ):
+                return web.json_response(order)
+        return self._error(-2013, "Order does not exist.")
+
+    async def ticker_stream(self, request):
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self.websockets.add(websocket)
+        try:
+            async for _ in websocket:
+                pass
+        finally:
+            self.websockets.discard(websocket)
+        return websocket
+
+    async def depth_stream(self, request):
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self.depth_subscribers[websocket] = set()
+        try:
+            async for message in websocket:
+                if message.type == web.WSMsgType.TEXT:
+                    command = json.loads(message.data)
+                    if command.get("method") == "SUBSCRIBE":
+                        self.depth_subscribers[websocket].update(stream.split("@")[0].upper() for stream in command["params"])
+                    elif command.get("method") == "UNSUBSCRIBE":
+                        self.depth_subscribers[websocket].difference_update(stream.split("@")[0].upper() for stream in command["params"])
+                        await websocket.send_str(json.dumps({"result": None, "id": command.get("id")}))
+        finally:
+            del self.depth_subscribers[websocket]
+        return websocket
+
+    async def _broadcast_depth(self, app):
+        while True:
+            await asyncio.sleep(0.1)
+            diffs, self.depth_diffs = self.depth_diffs, []
+            for diff in diffs:
+                for websocket, symbols in list(self.depth_subscribers.items()):
+                    if diff["s"] in symbols:
+                        await websocket.send_str(json.dumps(diff))
+
+    async def _broadcast_tickers(self, app):
+        while True:
+            await asyncio.sleep(1)
+            event_time = int(time.time() * 1000)
+            tickers = [
+                {"e": "24hrMiniTicker", "E": event_time, "s": symbol, "c": "{:.8f}".format(self.prices[symbol])}
+                for symbol, info in self.symbols.items() if info["status"] == "TRADING"
+            ]
+            for websocket in list(self.websockets):
+                await websocket.send_str(json.dumps(tickers))
+
+    async def mock_listing(self, request):
+        body = await request.json()
+        self.list_symbol(body["symbol"], body["base"], body["quote"], body["price"], body.get("status", "TRADING"))
+        return web.json_response({"listed": body["symbol"]})
+
+    async def mock_price(self, request):
+        body = await request.json()
+        self.set_price(body["symbol"], body["price"])
+        return web.json_response({"symbol": body["symbol"], "price": body["price"]})
+
+    def application(self):
+        app = web.Application()
+        app.router.add_get("/api/v3/ping", lambda request: web.json_response({}))
+        app.router.add_get("/api/v3/time", lambda request: web.json_response({"serverTime": int(time.time() * 1000)}))
+        app.router.add_get("/api/v3/exchangeInfo", self.exchange_info)
+        app.router.add_get("/api/v3/ticker/price", self.ticker_price)
+        app.router.add_get("/api/v3/ticker/bookTicker", self.book_ticker)
+        app.router.add_get("/api/v3/depth", self.depth)
+        app.router.add_get("/api/v3/account", self.account)
+        app.router.add_post("/api/v3/order", self.order)
+        app.router.add_get("/api/v3/order", self.query_order)
+        app.router.add_get("/ws/!miniTicker@arr", self.ticker_stream)
+        app.router.add_get("/ws", self.depth_stream)
+        app.router.add_post("/mock/listing", self.mock_listing)
+        app.router.add_post("/mock/price", self.mock_price)
+
+        async def start_broadcast(app):
+            app["broadcast"] = asyncio.get_running_loop().create_task(self._broadcast_tickers(app))
+            app["broadcast_depth"] = asyncio.get_running_loop().create_task(self._broadcast_depth(app))
+
+        async def stop_broadcast(app):
+            app["broadcast"].cancel()
+            app["broadcast_depth"].cancel()
+
+        app.on_startup.append(start_broadcast)
+        app.on_cleanup.append(stop_broadcast)
+        return app
+
+    def serve_in_background(self, host="127.0.0.1", port=0):
+        """
+        Run the mock on a daemon thread.
+
+        Returns:
+            str: Base URL of the mock, e.g. http://127.0.0.1:8765
+        """
+        started = threading.Event()
+        address = {}
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            runner = web.AppRunner(self.application())
+            loop.run_until_complete(runner.setup())
+            site = web.TCPSite(runner, host, port)
+            loop.run_until_complete(site.start())
+            address["port"] = site._server.sockets[0].getsockname()[1]
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="binance-mock", daemon=True).start()
+        started.wait()
+        return "http://{}:{}".format(host, address["port"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Binance spot mock.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    mock = MockBinance()
+    mock.list_symbol("BTCUSDT", "BTC", "USDT", 30000)
+    mock.list_symbol("ETHUSDT", "ETH", "USDT", 2000)
+    web.run_app(mock.application(), host="127.0.0.1", port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import os
+import sys
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.logger import getmylogger
+from core.scanner import Scanner
+from core.paper import create_adapter
+from binance_adapter import BinanceAdapter
+
+load_dotenv()
+
+logger = getmylogger(__name__, "../logs/binance/binance_scanner.log")
+
+def main():
+    adapter = create_adapter(BinanceAdapter, logger)
+    adapter.connect()
+    # Wake the scanner up as soon as a new symbol shows on the ticker stream
+    adapter.start_listing_stream()
+    Scanner(adapter, logger).main()
+
+if __name__ == "__main__":
+    main()
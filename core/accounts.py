@@ -0,0 +1,103 @@
+import os
+
+from core.balances import BalanceLedger
+from core.state import TradeStore
+
+def account_names(venue):
+    """
+    Accounts the bot trades on a venue: the default one (None), whose credentials
+    have no suffix, then the ones listed in {VENUE}_ACCOUNTS, e.g. MEXC_ACCOUNTS=alt1,alt2
+    with MEXC_API_KEY_ALT1, MEXC_API_SECRET_KEY_ALT1, ...
+    """
+    names = os.getenv("{}_ACCOUNTS".format(venue.upper()), "")
+    return [None] + [name.strip() for name in names.split(",") if name.strip()]
+
+class Account:
+    """
+    What the scanner sees of one account: its balance and its potential trades file.
+    """
+
+    def __init__(self, adapter, logger, currency):
+        self.adapter = adapter
+        self.name = adapter.account or "default"
+        self.potential_trades = TradeStore(adapter.potential_trades_file, logger)
+        self.balances = BalanceLedger(adapter, logger, currency)
+
+class Dispatcher:
+    """
+    Spreads the candidates of the scanner over the accounts of the venue.
+
+    Every account has its own client, so its own rate limiter, its own balance
+    and its own potential trades file, bought by the action process started with
+    ACCOUNT=<name> (the default account by default) and sold by the monitor
+    started the same way. Each account holds up to `max_trade_per_account`
+    candidates, so the trade slots and the request budget grow with the number
+    of accounts.
+
+    An account whose balance could not be refreshed for `max_age` seconds, e.g. a
+    throttled or revoked key, gets no new candidates; the others carry on.
+    """
+
+    def __init__(self, adapter, logger, currency):
+        self.logger = logger
+        # The scanner's own adapter trades for the default account
+        self.accounts = [Account(adapter, logger, currency)]
+        for name in account_names(adapter.name)[1:]:
+            account_adapter = type(adapter)(logger, name)
+            # The scanner only reads the balance of the account, no market catalogue or stream
+            account_adapter.client = account_adapter.new_client()
+            self.accounts.append(Account(account_adapter, logger, currency))
+
+    def set_currency(self, currency):
+        for account in self.accounts:
+            account.balances.currency = currency
+
+    def start(self):
+        for account in self.accounts:
+            account.balances.start_refresher()
+
+    def slots(self, max_trades):
+        """
+        Candidates each account can still take.
+        """
+        return {account: max(max_trades - account.potential_trades.count(), 0) for account in self.accounts}
+
+    def available(self):
+        """
+        Largest unreserved balance of an account, a pair no account can afford is not worth a request.
+        """
+        return max(account.balances.available() for account in self.accounts)
+
+    def assign(self, pairs, slots):
+        """
+        Split pairs between the accounts with slots left: every pair goes to the
+        account with the most unreserved funds per pair assigned.
+
+        Args:
+            pairs (list): Pairs to trade, in order of preference.
+            slots (dict): See slots().
+
+        Returns:
+            list: (account, pairs) for every account given at least one pair.
+        """
+        accounts = []
+        for account in self.accounts:
+            if not slots[account]:
+                continue
+            # Never refreshed yet: reserve() refreshes it; refreshed once then stuck: the key is failing.
+            # A single account is never skipped, there is no other one to hand its pairs to
+            age = account.balances.age()
+            if len(self.accounts) > 1 and age is not None and age > account.balances.max_age:
+                self.logger.info("Balance of account {} is stale, no new pair for it".format(account.name))
+                continue
+            accounts.append(account)
+
+        available = {account: account.balances.available() for account in accounts}
+        assigned = {account: [] for account in accounts}
+        for pair in pairs:
+            candidates = [account for account in accounts if len(assigned[account]) < slots[account]]
+            if not candidates:
+                break
+            account = max(candidates, key=lambda account: available[account] / (len(assigned[account]) + 1))
+            assigned[account].append(pair)
+        return [(account, account_pairs) for account, account_pairs in assigned.items() if account_pairs]
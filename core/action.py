@@ -0,0 +1,209 @@
+from core import config
+from core.balances import BalanceLedger
+from core.errors import INSUFFICIENT_FUNDS
+from core.orders import OrderManager, client_order_id
+from core.records import Candidate, Position
+from core.shutdown import Shutdown
+from core.startup import checkpoint_market_cache, report_first_order
+from core.state import TradeStore
+from core.workers import SymbolWorkerPool
+
+class Action:
+    """
+    Buys the potential trades written by the scanner and hands the opened
+    positions over to the monitor.
+
+    On SIGTERM it stops taking candidates and waits for the buys in flight (see
+    core.shutdown.Shutdown); on start, candidates bought by a previous run that
+    stopped before recording them are recorded (see reconcile()).
+    """
+
+    def __init__(self, adapter, logger):
+        self.adapter = adapter
+        self.logger = logger
+        self.orders = OrderManager(adapter, logger)
+        self.potential_trades = TradeStore(adapter.potential_trades_file, logger)
+        self.trade_list = TradeStore(adapter.trade_list_file, logger)
+        self.balances = BalanceLedger(adapter, logger)
+        self.workers = SymbolWorkerPool(logger, name="action")
+        self.shutdown = Shutdown(logger)
+
+    def main(self):
+        config.watch(self.logger)
+        self.shutdown.install()
+        self.reconcile()
+        while not self.shutdown.requested:
+            try:
+                trade_list = self.potential_trades.read()
+            except Exception as err:
+                self.logger.error("Error reading trade list: {}".format(err))
+                continue
+
+            if trade_list:
+                self.logger.info("{} trade object(s) available in the list".format(len(trade_list)))
+                # The new candidates of a pass are bought as one batch on a worker holding all their
+                # symbols; those still being bought from an earlier pass are skipped
+                fresh = []
+                for trade in trade_list:
+                    try:
+                        candidate = Candidate.from_dict(trade)
+                    except Exception as err:
+                        self.logger.error("Error processing trade {}: {}".format(trade, err))
+                        continue
+                    if not self.workers.busy(candidate.symbol):
+                        fresh.append(candidate)
+                if fresh:
+                    self.workers.submit_group([candidate.symbol for candidate in fresh], self.process_trades, fresh)
+                metrics = self.workers.metrics()
+                if metrics['queue_depth']:
+                    self.logger.info("{} candidate(s) waiting for a worker, {} in flight".format(metrics['queue_depth'], metrics['in_flight']))
+
+            else:
+                self.logger.debug("No trade object found in trade list")
+
+            self.adapter.breakers.report()
+            self.shutdown.wait(1)
+        self.stop()
+
+    def stop(self):
+        """
+        Stop after the shutdown was requested: no new buy, the buys in flight get until the deadline.
+        """
+        self.workers.close()
+        self.logger.info("Shutting down, waiting up to {:.0f}s for the buys in flight".format(self.shutdown.deadline))
+        pending = self.workers.drain(self.shutdown.deadline)
+        if pending:
+            self.logger.info("Buys of {} still in flight, reconciled on the next start".format(pending))
+        checkpoint_market_cache(self.adapter.client, self.logger)
+        self.logger.info("Stopped")
+
+    def reconcile(self):
+        """
+        Record the candidates a previous run bought without recording the position,
+        e.g. stopped between the order and the trade files update. Each candidate is
+        looked up on the exchange by the client order ids of its market and limit buys.
+        """
+        for trade in self.potential_trades.read() or []:
+            try:
+                candidate = Candidate.from_dict(trade)
+                symbol = self.orders.capabilities.order_symbol(candidate.symbol)
+                for order_type in ("market", "limit"):
+                    order = self.adapter.find_order(symbol, client_order_id(trade, "buy", order_type))
+                    if self.adapter.order_id(order):
+                        self.logger.info("{} was bought before the restart, recording the position".format(candidate.symbol))
+                        self.record_buy(candidate, order)
+                        break
+            except Exception as err:
+                self.logger.error("Could not reconcile {}: {}".format(trade.get('trade_signal'), err))
+
+    def process_trades(self, trade_list):
+        """
+        Size every candidate (core.records.Candidate), then buy them all in one
+        batch. Runs on a worker holding the symbols of the candidates (see main()).
+        """
+        sized = []
+        for trade in trade_list:
+            try:
+                size = self.order_size(trade)
+                if size is not None:
+                    sized.append((trade, size))
+            except Exception as err:
+                self.logger.error("Error processing trade: {}".format(err))
+
+        if sized:
+            self.place_market_buy_orders(sized)
+
+    def process_trade(self, trade):
+        self.process_trades([trade])
+
+    def order_size(self, trade):
+        """
+        Size of the market buy of a candidate (core.records.Candidate), None if the candidate was dropped.
+        """
+        min_size = trade.min_size
+        max_size = trade.max_size
+        trade_signal = trade.symbol
+
+        #fund_allocated is in the quote currency
+        fund_allocated = trade.fund_allocated
+        # The book is synced in the background by the time a limit fallback needs a price
+        self.adapter.watch_book(trade_signal)
+
+        if self.adapter.market_buy_in_quote:
+            #the quantity of the market order is specified in the quote currency
+            size = fund_allocated
+        else:
+            current_price = self.adapter.get_last_price(trade_signal)
+            size = self.adapter.precision.get(trade_signal, trade.base_increment).size(fund_allocated, current_price)
+
+        self.logger.info("{} Size to buy: {}".format(trade_signal, size))
+
+        if min_size <= size <= max_size:
+            return size
+        elif size > max_size:
+            return max_size
+        self.logger.info("{} Size to buy= {} is less than minSize allowed= {}, removing!".format(trade_signal, size, min_size))
+        self.potential_trades.remove(trade.record)
+        self.balances.release(trade_signal)
+        self.adapter.unwatch_book(trade_signal)
+        return None
+
+    def place_market_buy_orders(self, sized):
+        """
+        Send the market buys of several candidates at once and record the outcome of each.
+
+        Args:
+            sized (list): (Candidate, size) tuples.
+        """
+        for trade, size in sized:
+            self.logger.info("Trying to place a market buy order for symbol: {}".format(trade.symbol))
+
+        orders = self.orders.market_buy_batch([
+            (trade.symbol, size, trade.base_increment, trade.record) for trade, size in sized
+        ])
+
+        # The fills of all the orders are waited for together, not one timeout after the other
+        order_ids = [self.adapter.order_id(order) for order in orders]
+        fill_prices = self.adapter.fill_prices([order_id for order_id in order_ids if order_id])
+
+        # Recorded one order at a time; TradeStore serializes the updates with the other workers and processes
+        for (trade, size), order, order_id in zip(sized, orders, order_ids):
+            try:
+                self.record_buy(trade, order, fill_prices.get(order_id))
+            except Exception as err:
+                self.logger.error("Could not place order! Error occurred - {}".format(err))
+
+    def record_buy(self, trade, order, fill_price=None):
+        """
+        Record the outcome of the buy of a candidate.
+
+        Args:
+            trade (Candidate): The candidate bought.
+            order: The order result, or the OrderError of a failed buy.
+            fill_price (float): Average execution price from the user data stream
+                (ExchangeAdapter.fill_prices), None to price the position from the order.
+        """
+        symbol = trade.symbol
+        order_id = self.adapter.order_id(order)
+
+        if order_id:
+            self.logger.info("Successfully opened a trade on {} with order_id {}".format(symbol, order_id))
+            report_first_order(self.logger, symbol)
+            open_price = fill_price
+            if open_price is None:
+                open_price = self.adapter.open_price(order, symbol)
+            self.update_monitoring_list(symbol, open_price)
+            self.potential_trades.remove(trade.record)
+            self.balances.release(symbol, spent=trade.fund_allocated)
+            # The monitor follows the position with its own book
+            self.adapter.unwatch_book(symbol)
+        elif getattr(order, 'category', None) == INSUFFICIENT_FUNDS:
+            self.logger.info("Balance insufficient, removing {}".format(symbol))
+            self.potential_trades.remove(trade.record)
+            self.balances.release(symbol)
+            self.adapter.unwatch_book(symbol)
+        else:
+            self.logger.info("Market buy was not sucessful!")
+
+    def update_monitoring_list(self, trade_signal, open_price):
+        self.trade_list.append([Position(trade_signal, open_price).record])
@@ -0,0 +1,125 @@
+import math
+import numpy as np
+
+def ladders(asks, levels=50):
+    """
+    Pad the ask ladders of several pairs into matrices.
+
+    Args:
+        asks (list): (price, size) levels of every pair, best first; None or empty when unknown.
+        levels (int): Levels kept per pair.
+
+    Returns:
+        tuple: (pairs, levels) 'prices' and 'sizes' arrays. Missing levels have a
+        size of 0; rows of pairs without a book are all 0 sizes with NaN prices.
+    """
+    prices = np.full((len(asks), levels), np.nan)
+    sizes = np.zeros((len(asks), levels))
+    for row, ladder in enumerate(asks):
+        if not ladder:
+            continue
+        ladder = np.asarray(ladder[:levels], dtype=np.float64)[:, :2]
+        prices[row, :len(ladder)] = ladder[:, 0]
+        # Padding levels repeat the last price, they hold nothing
+        prices[row, len(ladder):] = ladder[-1, 0]
+        sizes[row, :len(ladder)] = ladder[:, 1]
+    return prices, sizes
+
+def depth_within(prices, sizes, max_slippage):
+    """
+    Quote amount resting on each ladder no further than `max_slippage` above its best ask.
+
+    Returns:
+        numpy.ndarray: (pairs,) amounts, NaN for pairs without a book.
+    """
+    with np.errstate(invalid="ignore"):
+        within = prices <= prices[:, :1] * (1 + max_slippage)
+    depth = np.where(within, prices * sizes, 0.0).sum(axis=1)
+    return np.where(np.isnan(prices[:, 0]), np.nan, depth)
+
+def expected_slippage(allocations, prices, sizes):
+    """
+    Average fill price of a market buy of each allocation walking its ladder,
+    relative to the best ask: 0.01 means the buy fills 1% above it on average.
+
+    Returns:
+        numpy.ndarray: (pairs,) slippage; NaN without a book, 0 for nothing allocated.
+    """
+    level_quote = np.nan_to_num(prices) * sizes
+    before = np.cumsum(level_quote, axis=1) - level_quote
+    take = np.clip(allocations[:, None] - before, 0.0, level_quote)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        base = np.where(take > 0, take / prices, 0.0).sum(axis=1)
+        slippage = take.sum(axis=1) / base / prices[:, 0] - 1
+    slippage = np.where(allocations > 0, slippage, 0.0)
+    return np.where(np.isnan(prices[:, 0]) & (allocations > 0), np.nan, slippage)
+
+def allocate(available, min_quote, max_quote, depth):
+    """
+    Split funds between pairs in proportion to their liquidity.
+
+    Every pair gets a share of `available` weighted by its depth, at most its
+    depth (so a thin listing is not bought past the slippage cap) and its max
+    notional. What a capped pair cannot take goes to the others. A pair whose
+    share ends up below its min notional is dropped and the split redone without
+    it. Pairs without depth are weighted like an average pair; with no depth at
+    all this is the equal split.
+
+    Args:
+        available (float): Funds to split, in the quote currency.
+        min_quote (numpy.ndarray): (pairs,) smallest order notional allowed.
+        max_quote (numpy.ndarray): (pairs,) largest order notional allowed.
+        depth (numpy.ndarray): (pairs,) see depth_within(); NaN or 0 when unknown.
+
+    Returns:
+        numpy.ndarray: (pairs,) funds per pair, rounded down to 3 decimals.
+    """
+    depth = np.where(depth > 0, depth, np.nan)
+    known = ~np.isnan(depth)
+    weights = np.where(known, depth, depth[known].mean() if known.any() else 1.0)
+    cap = np.minimum(max_quote, np.where(known, depth, np.inf))
+    active = cap >= min_quote
+
+    while True:
+        allocations = np.zeros(len(weights))
+        # Water filling: every pass caps at least one more pair or leaves nothing to hand out
+        for _ in range(len(weights)):
+            free = active & (allocations < cap)
+            remaining = available - allocations.sum()
+            if remaining <= 1e-9 or not free.any():
+                break
+            allocations[free] += remaining * weights[free] / weights[free].sum()
+            allocations = np.minimum(allocations, cap)
+        short = active & (allocations < min_quote)
+        if not short.any():
+            break
+        # Drop the least liquid pair that cannot reach its minimum
+        active[np.flatnonzero(short)[np.argmin(weights[short])]] = False
+
+    return np.floor(np.where(active, allocations, 0.0) * 1000) / 1000
+
+def allocate_by_liquidity(pairs, available, limits, asks, max_slippage, levels=50):
+    """
+    Allocate funds to pairs from their early order book depth and their notional limits.
+
+    Args:
+        pairs (list): The exchange symbols.
+        available (float): Funds to split, in the quote currency.
+        limits (dict): (min notional, max notional) in the quote currency per pair.
+        asks (dict): Ask ladders per pair, see ladders(); pairs without one are split evenly.
+        max_slippage (float): Depth is only counted this far above the best ask, e.g. 0.05.
+
+    Returns:
+        tuple: (funds, slippage) dicts per pair, slippage as in expected_slippage().
+    """
+    if not pairs:
+        return {}, {}
+    prices, sizes = ladders([asks.get(pair) for pair in pairs], levels)
+    min_quote = np.array([limits[pair][0] for pair in pairs], dtype=np.float64)
+    max_quote = np.array([limits[pair][1] for pair in pairs], dtype=np.float64)
+    allocations = allocate(available, min_quote, max_quote, depth_within(prices, sizes, max_slippage))
+    slippage = expected_slippage(allocations, prices, sizes)
+    return (
+        {pair: float(amount) for pair, amount in zip(pairs, allocations)},
+        {pair: None if math.isnan(value) else float(value) for pair, value in zip(pairs, slippage)}
+    )
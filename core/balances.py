@@ -0,0 +1,152 @@
+import json
+import time
+import threading
+
+from core import persistence
+from core.sizing import allocate_funds
+
+class BalanceLedger:
+    """
+    Free balance of the account shared between the bot processes, with the funds
+    already promised to candidates reserved against it.
+
+    The balances file is refreshed in the background by the scanner, so funds
+    are allocated at listing time without a network call. Reservations are made
+    and released under a file lock, so two candidates, or two processes, never
+    allocate the same funds. The action releases a reservation once the buy is
+    done; reservations nobody released expire after `reservation_ttl` seconds.
+    """
+
+    # Seconds between two refreshes of the free balance
+    refresh_interval = 5
+    # Older balances are refreshed synchronously before funds are reserved
+    max_age = 30
+    reservation_ttl = 300
+
+    def __init__(self, adapter, logger, currency=None):
+        # Currency refreshed and reserved from; releasing works on any reservation
+        self.adapter = adapter
+        self.logger = logger
+        self.currency = currency
+        self.file_path = adapter.balances_file
+        self._refresher = None
+
+    def _locked(self):
+        return persistence.locked(self.file_path)
+
+    def _load(self):
+        try:
+            with open(self.file_path, 'r') as balances_file:
+                return json.load(balances_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'balances': {}, 'updated_at': {}, 'reservations': {}}
+
+    def _save(self, data):
+        persistence.write_json(self.file_path, data)
+
+    def _expire(self, data):
+        now = time.time()
+        for symbol, reservation in list(data['reservations'].items()):
+            if now - reservation['reserved_at'] > self.reservation_ttl:
+                self.logger.info("Reservation of {} {} for {} expired".format(reservation['amount'], reservation['currency'], symbol))
+                del data['reservations'][symbol]
+
+    def _reserved(self, data, exclude=()):
+        return sum(
+            reservation['amount'] for symbol, reservation in data['reservations'].items()
+            if reservation['currency'] == self.currency and symbol not in exclude
+        )
+
+    def refresh(self):
+        """
+        Fetch the free balance from the exchange and share it with the other processes.
+        """
+        free = self.adapter.get_balance(self.currency)
+        with self._locked():
+            data = self._load()
+            data['balances'][self.currency] = free
+            data['updated_at'][self.currency] = time.time()
+            self._save(data)
+        return free
+
+    def start_refresher(self):
+        """
+        Keep the shared balance fresh from a background thread.
+        """
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as err:
+                    self.logger.info("Could not refresh the {} balance - {}".format(self.currency, err))
+                time.sleep(self.refresh_interval)
+
+        self._refresher = threading.Thread(target=run, name="{}-balances".format(self.adapter.name), daemon=True)
+        self._refresher.start()
+
+    def age(self):
+        """
+        Seconds since the free balance was last refreshed, by any process; None if it never was.
+        """
+        updated_at = self._load()['updated_at'].get(self.currency)
+        return None if updated_at is None else time.time() - updated_at
+
+    def available(self):
+        """
+        Returns:
+            float: The free balance minus the funds reserved for pending candidates.
+        """
+        with self._locked():
+            data = self._load()
+            self._expire(data)
+            return data['balances'].get(self.currency, 0.0) - self._reserved(data)
+
+    def reserve(self, pairs, allocator=None):
+        """
+        Split the unreserved balance among `pairs` and reserve it for them.
+        Pairs reserved earlier are reallocated, so retrying a pair never counts it twice.
+
+        Args:
+            pairs (list): The symbols to reserve funds for.
+            allocator (callable): (pairs, available) -> funds per pair, called under the
+                lock; the equal split of allocate_funds() by default.
+
+        Returns:
+            dict: The funds allocated to each pair.
+        """
+        if not pairs:
+            return {}
+        age = self.age()
+        if age is None or age > self.max_age:
+            self.refresh()
+
+        with self._locked():
+            data = self._load()
+            self._expire(data)
+            available = max(data['balances'].get(self.currency, 0.0) - self._reserved(data, exclude=pairs), 0.0)
+            funds = (allocator or allocate_funds)(pairs, available)
+            now = time.time()
+            for symbol, amount in funds.items():
+                if amount > 0:
+                    data['reservations'][symbol] = {'currency': self.currency, 'amount': amount, 'reserved_at': now}
+            self._save(data)
+        return funds
+
+    def release(self, symbol, spent=0.0):
+        """
+        Drop the reservation of a symbol.
+
+        Args:
+            symbol (str): The symbol the funds were reserved for.
+            spent (float): Funds used by the order; taken off the shared balance until
+                the next refresh, so they are not handed out twice in the meantime.
+        """
+        with self._locked():
+            data = self._load()
+            reservation = data['reservations'].pop(symbol, None)
+            if reservation is None:
+                return
+            if spent:
+                currency = reservation['currency']
+                data['balances'][currency] = max(data['balances'].get(currency, 0.0) - float(spent), 0.0)
+            self._save(data)
@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+from collections import deque
+
+from core.errors import CircuitOpen, ENDPOINT_FAILURES, classify
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    Health of one exchange endpoint, from the outcome of its last `window` calls.
+
+    Closed: calls go through. Once at least `min_calls` are recorded and the
+    share of failures reaches `failure_rate`, the breaker opens: calls fail at
+    once with CircuitOpen instead of waiting on a timeout or being throttled
+    further. After `cooldown` seconds it is half open: a single trial call goes
+    through, closing the breaker if it succeeds and opening it again otherwise.
+    """
+
+    def __init__(self, endpoint, window, min_calls, failure_rate, cooldown):
+        self.endpoint = endpoint
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened_at = 0.0
+        # True for a failure, last `window` calls
+        self.outcomes = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Whether a call may go through now; counts the calls refused.
+        """
+        with self._lock:
+            if self.state == OPEN and time.time() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._trial = False
+            if self.state == CLOSED or (self.state == HALF_OPEN and not self._trial):
+                self._trial = self.state == HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, failed):
+        """
+        Record the outcome of a call.
+
+        Returns:
+            str or None: The new state if the call changed it.
+        """
+        with self._lock:
+            self.calls += 1
+            self.failures += failed
+            self.outcomes.append(failed)
+            if self.state == HALF_OPEN:
+                self._trial = False
+                if failed:
+                    return self._open()
+                self.state = CLOSED
+                self.outcomes.clear()
+                return CLOSED
+            if self.state == CLOSED and len(self.outcomes) >= self.min_calls and sum(self.outcomes) / len(self.outcomes) >= self.failure_rate:
+                return self._open()
+            return None
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.time()
+        return OPEN
+
+    def metrics(self):
+        with self._lock:
+            recent = sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+            return {
+                'state': self.state,
+                'calls': self.calls,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'failure_rate': round(recent, 3)
+            }
+
+class CircuitBreakers:
+    """
+    Circuit breakers of the endpoints of a venue, one per REST endpoint, shared
+    by every client of an adapter (see `guard()`).
+
+    Only timeouts, rate limits and unavailability count as failures
+    (core.errors.ENDPOINT_FAILURES); a rejected order is an answer from a
+    healthy endpoint. Tuned with BREAKER_WINDOW, BREAKER_MIN_CALLS,
+    BREAKER_FAILURE_RATE and BREAKER_COOLDOWN (seconds).
+    """
+
+    def __init__(self, adapter, logger):
+        self.adapter = adapter
+        self.logger = logger
+        self.window = int(os.getenv("BREAKER_WINDOW", 20))
+        self.min_calls = int(os.getenv("BREAKER_MIN_CALLS", 5))
+        self.failure_rate = float(os.getenv("BREAKER_FAILURE_RATE", 0.5))
+        self.cooldown = float(os.getenv("BREAKER_COOLDOWN", 10))
+        self.breakers = {}
+        self._reported_at = time.time()
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint):
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(endpoint, self.window, self.min_calls, self.failure_rate, self.cooldown)
+            return self.breakers[endpoint]
+
+    def call(self, endpoint, request, *args, **kwargs):
+        """
+        Call `request(*args, **kwargs)` through the breaker of `endpoint`.
+
+        Raises:
+            CircuitOpen: Without calling `request`, while the breaker is open.
+        """
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpen("{} {}: circuit open after {:.0%} failures".format(self.adapter.name, endpoint, breaker.metrics()['failure_rate']))
+        try:
+            result = request(*args, **kwargs)
+        except Exception as err:
+            self._record(breaker, classify(err, self.adapter.error_codes, self.adapter.error_messages) in ENDPOINT_FAILURES)
+            raise
+        self._record(breaker, False)
+        return result
+
+    def _record(self, breaker, failed):
+        state = breaker.record(failed)
+        if state == OPEN:
+            self.logger.info("Circuit of {} {} open for {}s - {}".format(self.adapter.name, breaker.endpoint, breaker.cooldown, breaker.metrics()))
+        elif state == CLOSED:
+            self.logger.info("Circuit of {} {} closed again".format(self.adapter.name, breaker.endpoint))
+
+    def guard(self, client):
+        """
+        Route every REST call of a ccxt client through the breakers, one per
+        endpoint, e.g. "private POST order".
+        """
+        fetch2 = client.fetch2
+
+        def guarded(path, api='public', method='GET', *args, **kwargs):
+            endpoint = "{} {} {}".format("/".join(api) if isinstance(api, (list, tuple)) else api, method, path)
+            return self.call(endpoint, fetch2, path, api, method, *args, **kwargs)
+
+        # ccxt routes every implicit and unified method through fetch2
+        client.fetch2 = guarded
+        return client
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Metrics of every endpoint called so far, see CircuitBreaker.metrics().
+        """
+        with self._lock:
+            breakers = list(self.breakers.values())
+        return {breaker.endpoint: breaker.metrics() for breaker in breakers}
+
+    def report(self, interval=60):
+        """
+        Log the metrics of the endpoints, at most once every `interval` seconds; called from the loops.
+        """
+        if time.time() - self._reported_at < interval:
+            return
+        self._reported_at = time.time()
+        metrics = self.metrics()
+        if metrics:
+            self.logger.info("Endpoint health of {}: {}".format(self.adapter.name, metrics))
@@ -0,0 +1,85 @@
+import os
+import json
+import time
+import threading
+
+from core import persistence
+
+class CapabilityCache:
+    """
+    What the exchange taught us about each symbol by rejecting an order, shared
+    between the bot processes through the capabilities file.
+
+    Two things are learned: that market orders are disabled on a symbol (MEXC
+    "api market order is disabled"), so the limit fallback is used straight away,
+    and the symbol format orders went through with (Kucoin BTC/USDT instead of
+    BTC-USDT), so the rejected format is not tried again.
+
+    Exchanges enable market orders some time after a listing, so a disabled
+    market is tried again once `market_disabled_ttl` seconds have passed.
+    """
+
+    market_disabled_ttl = 3600
+
+    def __init__(self, adapter, logger):
+        self.logger = logger
+        self.file_path = adapter.capabilities_file
+        self._symbols = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _locked(self):
+        return persistence.locked(self.file_path)
+
+    def _load(self):
+        try:
+            with open(self.file_path, 'r') as capabilities_file:
+                return json.load(capabilities_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, data):
+        persistence.write_json(self.file_path, data)
+
+    def _symbol(self, symbol):
+        # Reloaded only when another process, or thread, replaced the file
+        try:
+            stat = os.stat(self.file_path)
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        if version != self._version:
+            with self._lock:
+                self._symbols = self._load()
+                self._version = version
+        return self._symbols.get(symbol, {})
+
+    def market_orders(self, symbol):
+        """
+        Whether market orders on the symbol are worth sending.
+        """
+        disabled_at = self._symbol(symbol).get('market_disabled_at')
+        return disabled_at is None or time.time() - disabled_at > self.market_disabled_ttl
+
+    def order_symbol(self, symbol):
+        """
+        Symbol orders on `symbol` went through with, `symbol` itself if none was learned.
+        """
+        return self._symbol(symbol).get('order_symbol', symbol)
+
+    def learn(self, symbol, **capabilities):
+        """
+        Record capabilities of a symbol, e.g. learn('BTC-USDT', order_symbol='BTC/USDT').
+        """
+        with self._locked():
+            data = self._load()
+            data.setdefault(symbol, {}).update(capabilities)
+            self._save(data)
+        self.logger.info("Learned {} for {}".format(capabilities, symbol))
+
+    def market_disabled(self, symbol):
+        self.learn(symbol, market_disabled_at=time.time())
+
+    def market_enabled(self, symbol):
+        if self._symbol(symbol).get('market_disabled_at') is not None:
+            self.learn(symbol, market_disabled_at=None)
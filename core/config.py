@@ -0,0 +1,167 @@
+import os
+import json
+import signal
+import threading
+
+def _positive(value):
+    return value > 0
+
+def _fraction(value):
+    return 0 < value < 1
+
+class Settings:
+    """
+    Trading parameters, read from the JSON config file (BOT_CONFIG, by default
+    /root/snipeBot/config.json). Keys missing from the file keep their default.
+
+    A Settings object is never modified: a reload builds a new one, so a loop
+    iteration sees either the old or the new parameters, never a mix of both.
+    """
+
+    # name: (type, default, check, reloadable); a callable default is resolved when
+    # the settings are built, so defaults taken from the environment see the .env file
+    FIELDS = {
+        # Directory of the state files shared by the bot processes
+        'state_dir': (str, "/root/snipeBot", None, False),
+        'supported_asset': (list, ['USDT'], None, True),
+        'use_all_assets': (bool, False, None, True),
+        'max_trade_per_account': (int, 2, _positive, True),
+        # Currency the funds are allocated from
+        'quote_currency': (str, "USDT", None, True),
+        'symbol_blacklist': (list, [], None, True),
+        'base_blacklist': (list, [], None, True),
+        # Seconds between two market queries
+        'poll_interval': (float, 2.0, _positive, True),
+        # 'liquidity' or 'equal', see Scanner.liquidity_allocator()
+        'allocation': (str, lambda: os.getenv("ALLOCATION", "liquidity"), lambda value: value in ('liquidity', 'equal'), True),
+        # Farthest a limit price computed from the book may be from the best price
+        'max_slippage': (float, lambda: float(os.getenv("ORDER_BOOK_MAX_SLIPPAGE", 0.05)), _fraction, True),
+        # Exit multipliers of the opening price
+        'take_profit': (float, 1.2, lambda value: value > 1, True),
+        'stop_loss': (float, 0.8, _fraction, True),
+    }
+
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self, **values):
+        """
+        Raises:
+            ValueError: On an unknown key or a value of the wrong type or out of range.
+        """
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise ValueError("Unknown setting(s): {}".format(sorted(unknown)))
+        for name, (kind, default, check, _) in self.FIELDS.items():
+            value = values[name] if name in values else (default() if callable(default) else default)
+            # ints are accepted where floats are expected, bools never pass for numbers
+            if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+                raise ValueError("{} must be of type {}, got {!r}".format(name, kind.__name__, value))
+            if check is not None and not check(value):
+                raise ValueError("{} is out of range: {!r}".format(name, value))
+            object.__setattr__(self, name, list(value) if kind is list else value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings are read-only, edit the config file instead")
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+class ConfigStore:
+    """
+    Current settings of a process, reloaded when the config file changes or on
+    SIGHUP. Loops call `current()` once per iteration: it only stats the file,
+    and the new settings take effect between two iterations, without touching
+    the clients, streams and caches already built.
+
+    An invalid file is logged and ignored, the previous settings stay in use.
+    Settings marked as not reloadable (the state directory) keep their value
+    until the next restart.
+    """
+
+    def __init__(self, path, logger=None):
+        self.path = path
+        self.logger = logger
+        self._version = None
+        self._reload_requested = False
+        self._lock = threading.Lock()
+        self.settings = self._read() or Settings()
+        self._version = self._file_version()
+
+    def _file_version(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _log(self, message):
+        if self.logger is not None:
+            self.logger.info(message)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as config_file:
+                return Settings(**json.load(config_file))
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, ValueError, TypeError) as err:
+            self._log("Invalid config file {}, keeping the current settings - {}".format(self.path, err))
+            return None
+
+    def request_reload(self, *args):
+        # Signal handler: only flags the reload, the next current() call does it
+        self._reload_requested = True
+
+    def current(self):
+        """
+        Returns:
+            Settings: The settings to use for this iteration.
+        """
+        version = self._file_version()
+        if version == self._version and not self._reload_requested:
+            return self.settings
+        with self._lock:
+            self._reload_requested = False
+            self._version = version
+            settings = self._read()
+            if settings is None:
+                return self.settings
+            values = settings.as_dict()
+            for name, (_, _, _, reloadable) in Settings.FIELDS.items():
+                if not reloadable and values[name] != getattr(self.settings, name):
+                    self._log("{} only changes on restart, keeping {!r}".format(name, getattr(self.settings, name)))
+                    values[name] = getattr(self.settings, name)
+            changed = {name: value for name, value in values.items() if value != getattr(self.settings, name)}
+            if changed:
+                self.settings = Settings(**values)
+                self._log("Settings reloaded: {}".format(changed))
+            return self.settings
+
+_store = None
+_store_lock = threading.Lock()
+
+def store():
+    """
+    The ConfigStore of the process, created on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConfigStore(os.getenv("BOT_CONFIG", "/root/snipeBot/config.json"))
+        return _store
+
+def current():
+    return store().current()
+
+def watch(logger):
+    """
+    Log the reloads through `logger` and reload on SIGHUP as well as on file changes.
+    Only has an effect on the main thread, where signal handlers can be installed.
+    """
+    config_store = store()
+    config_store.logger = logger
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, config_store.request_reload)
+    logger.info("Settings from {}: {}".format(config_store.path, config_store.current().as_dict()))
@@ -0,0 +1,101 @@
+import re
+import ccxt
+import requests
+
+# Error categories returned by classify()
+TIMEOUT = "timeout"
+RATE_LIMIT = "rate_limit"
+EXCHANGE_UNAVAILABLE = "exchange_unavailable"
+AUTHENTICATION = "authentication"
+INSUFFICIENT_FUNDS = "insufficient_funds"
+MARKET_ORDER_DISABLED = "market_order_disabled"
+BAD_SYMBOL = "bad_symbol"
+DUPLICATE_ORDER = "duplicate_order"
+ORDER_NOT_FOUND = "order_not_found"
+CIRCUIT_OPEN = "circuit_open"
+OTHER = "other"
+
+# Categories that tell the endpoint itself is failing, counted by the circuit breakers.
+# The others are answers from a healthy endpoint (e.g. insufficient funds).
+ENDPOINT_FAILURES = (TIMEOUT, RATE_LIMIT, EXCHANGE_UNAVAILABLE)
+
+class CircuitOpen(ccxt.ExchangeNotAvailable):
+    """
+    Raised instead of calling an endpoint whose circuit breaker is open.
+    """
+
+# ccxt exception classes, subclasses before their parents
+EXCEPTION_CATEGORIES = (
+    (CircuitOpen, CIRCUIT_OPEN),
+    (ccxt.RequestTimeout, TIMEOUT),
+    # RateLimitExceeded included
+    (ccxt.DDoSProtection, RATE_LIMIT),
+    (ccxt.ExchangeNotAvailable, EXCHANGE_UNAVAILABLE),
+    (ccxt.NetworkError, EXCHANGE_UNAVAILABLE),
+    (ccxt.InsufficientFunds, INSUFFICIENT_FUNDS),
+    (ccxt.DuplicateOrderId, DUPLICATE_ORDER),
+    (ccxt.OrderNotFound, ORDER_NOT_FOUND),
+    (ccxt.BadSymbol, BAD_SYMBOL),
+    (ccxt.AuthenticationError, AUTHENTICATION),
+    # Raw requests of ExchangeAdapter.fetch_public()
+    (requests.Timeout, TIMEOUT),
+    (requests.ConnectionError, EXCHANGE_UNAVAILABLE),
+)
+
+# Messages of any venue, for errors ccxt does not map to a class
+COMMON_MESSAGES = (
+    ('Too many requests', RATE_LIMIT),
+    ('Duplicate order', DUPLICATE_ORDER),
+)
+
+# "code":-1121 (Binance, MEXC) or "code":"429000" (Kucoin) in the body ccxt quotes in its message
+_CODE = re.compile(r'"code"\s*:\s*"?(-?\d+)')
+
+def error_code(err):
+    """
+    Returns:
+        str or None: The exchange error code carried by the message of `err`.
+    """
+    match = _CODE.search(str(err))
+    return match.group(1) if match else None
+
+def _matches(message, pattern):
+    # A pattern is a substring, or a tuple of substrings that must all be in the message
+    if isinstance(pattern, tuple):
+        return all(part in message for part in pattern)
+    return pattern in message
+
+def classify(err, codes=None, messages=()):
+    """
+    Map an exception raised by an exchange call to one of the error categories.
+
+    The exchange error code is looked up first, then the venue messages, then
+    the ccxt exception class and the messages shared by every venue.
+
+    Args:
+        err (Exception): The exception.
+        codes (dict): Category per exchange error code (as a string) of the venue.
+        messages (tuple): (pattern, category) pairs of the venue, see _matches().
+
+    Returns:
+        str: The category.
+    """
+    code = error_code(err)
+    if codes and code in codes:
+        return codes[code]
+    message = str(err)
+    for pattern, category in messages:
+        if _matches(message, pattern):
+            return category
+    for exception_class, category in EXCEPTION_CATEGORIES:
+        if isinstance(err, exception_class):
+            return category
+    if isinstance(err, requests.HTTPError) and err.response is not None:
+        if err.response.status_code in (418, 429):
+            return RATE_LIMIT
+        if err.response.status_code >= 500:
+            return EXCHANGE_UNAVAILABLE
+    for pattern, category in COMMON_MESSAGES:
+        if _matches(message, pattern):
+            return category
+    return OTHER
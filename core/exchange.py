@@ -0,0 +1,395 @@
+import os
+import time
+
+from core import config
+from core.breakers import CircuitBreakers
+from core.errors import classify
+from core.fastjson import loads
+from core.filters import LEVERAGED_BASE
+from core.precision import PrecisionRegistry
+from core.startup import load_markets_cached
+
+class ExchangeAdapter:
+    """
+    Venue specific part of the bot: client creation, endpoints, symbol formats and
+    error mapping. The scanner, action and monitor loops in core only talk to the
+    exchange through this interface, so a new venue only needs a new adapter.
+
+    Symbol details are returned normalized as a dict with the keys
+    'symbol', 'base', 'quote', 'min_size', 'max_size', 'base_increment' and 'info'
+    (the raw exchange payload). 'min_size'/'max_size' are in the currency market
+    buys are sized in, see `market_buy_in_quote`.
+
+    An adapter trades for one account of the venue: the default one, or a named
+    one (see core.accounts) whose credentials and trade files carry its name.
+    """
+
+    name = None
+    # True when market buys are sized in the quote currency (e.g. MEXC quoteOrderQty),
+    # False when they are sized in the base currency
+    market_buy_in_quote = False
+    # core.userdata.UserDataStream subclass keeping balances and fills in memory, None if the venue has none
+    user_stream_class = None
+    # Seconds to wait for the fills of an order on the user data stream
+    fill_timeout = 2
+    # core.orderbook.DepthStream subclass maintaining local order books, None if the venue has none
+    depth_stream_class = None
+    # Levels per side of the REST depth snapshots
+    depth_limit = 100
+    # True when the exchange rejects a second order with a client order id it has already
+    # seen, filled or not; only then can duplicate requests be sent for the same order
+    dedupes_client_order_ids = False
+    # Order parameter the client order id is sent in
+    client_order_id_param = None
+    # Alternate hostnames of the REST API the market list can be polled from
+    api_hosts = ()
+    # Requests made by one list_markets() call, counted against the polling budget
+    list_markets_cost = 1
+    # Error category (core.errors) per exchange error code, and (message pattern, category)
+    # pairs for errors without a code, see core.errors.classify()
+    error_codes = {}
+    error_messages = ()
+
+    def __init__(self, logger, account=None):
+        self.logger = logger
+        self.account = account
+        # 'light' detects new pairs from the cheapest symbols-only endpoint of the venue,
+        # 'full' from the whole market catalogue; read here, after load_dotenv()
+        self.detection_source = os.getenv("DETECTION_SOURCE", "light")
+        self.markets_seeded = False
+        self.client = None
+        self.user_stream = None
+        self.depth_stream = None
+        self.precision = PrecisionRegistry(self)
+        self.breakers = CircuitBreakers(self, logger)
+
+    @property
+    def max_slippage(self):
+        # Farthest a limit price computed from the book may be from the best price, e.g. 0.05 for 5%
+        return config.current().max_slippage
+
+    @property
+    def state_name(self):
+        # Prefix of the files of the account, e.g. mexc or mexc_alt1
+        return self.name if self.account is None else "{}_{}".format(self.name, self.account)
+
+    @property
+    def potential_trades_file(self):
+        return os.path.join(config.current().state_dir, "{}_potential_trades.json".format(self.state_name))
+
+    @property
+    def trade_list_file(self):
+        return os.path.join(config.current().state_dir, "{}_trade_list.json".format(self.state_name))
+
+    @property
+    def balances_file(self):
+        return os.path.join(config.current().state_dir, "{}_balances.json".format(self.state_name))
+
+    @property
+    def capabilities_file(self):
+        return os.path.join(config.current().state_dir, "{}_capabilities.json".format(self.name))
+
+    def connect(self):
+        """
+        Create the ccxt client, start loading the market catalogue and, unless
+        USER_DATA_STREAM=0, start the user data stream.
+
+        Returns:
+            The ccxt client.
+        """
+        self.client = self.new_client()
+        load_markets_cached(self.client, self.logger)
+        if self.user_stream_class is not None and os.getenv("USER_DATA_STREAM", "1") == "1":
+            self.user_stream = self.user_stream_class(self, self.logger)
+            self.user_stream.start()
+        self.logger.info("Client library successfully connected")
+        return self.client
+
+    def credential(self, key):
+        """
+        Credential of the account from the environment: `key` itself for the default
+        account, `key` suffixed with the account name otherwise (MEXC_API_KEY_ALT1).
+        """
+        return os.getenv(key if self.account is None else "{}_{}".format(key, self.account.upper()))
+
+    def create_client(self):
+        raise NotImplementedError
+
+    def new_client(self):
+        """
+        A new ccxt client whose calls go through the circuit breakers of the adapter.
+        """
+        return self.breakers.guard(self.create_client())
+
+    def set_api_host(self, client, host):
+        """
+        Point the REST calls of `client` at another hostname of the venue, e.g. https://api1.binance.com
+        """
+        raise NotImplementedError
+
+    @property
+    def full_listing(self):
+        # The light sources list pairs that do not trade yet: the first snapshot, the markets
+        # the scanner takes as known, comes from the catalogue so those pairs are seen as new later
+        return self.detection_source == "full" or not self.markets_seeded
+
+    def list_markets(self, client=None):
+        """
+        Fetch the tradeable spot markets, from the source set by `detection_source`.
+        Only the symbols are needed to detect a listing, the scanner asks for the
+        details of new pairs through get_symbol_detail().
+
+        Args:
+            client: ccxt client to query with, the adapter's own by default.
+
+        Returns:
+            dict: {'Symbols': list of base assets, 'Pairs': list of exchange symbols}.
+            'Symbols' is empty when the source only lists the exchange symbols.
+        """
+        client = client or self.client
+        if self.full_listing:
+            markets = self.list_markets_full(client)
+            self.markets_seeded = True
+            return markets
+        return self.list_markets_light(client)
+
+    def list_markets_full(self, client):
+        raise NotImplementedError
+
+    def list_markets_light(self, client):
+        return self.list_markets_full(client)
+
+    def fetch_public(self, client, url):
+        """
+        GET a public endpoint on the session of `client` and decode it with the fast JSON decoder,
+        skipping the response parsing of ccxt.
+        """
+        def get():
+            response = client.session.get(url, timeout=client.timeout / 1000)
+            response.raise_for_status()
+            return response.content
+        return loads(self.breakers.call("public GET " + url.split("?")[0].rsplit("/", 1)[-1], get))
+
+    def get_symbol_detail(self, symbol):
+        """
+        Details of a symbol; its quantizer is compiled into `precision` on the way.
+
+        Returns:
+            dict or None: Normalized details of the symbol, None if not found.
+        """
+        symbol_detail = self.fetch_symbol_detail(symbol)
+        if symbol_detail is not None:
+            self.precision.compile(symbol_detail)
+        return symbol_detail
+
+    def fetch_symbol_detail(self, symbol):
+        """
+        Returns:
+            dict or None: Normalized details of the symbol from the exchange, None if not found.
+        """
+        raise NotImplementedError
+
+    def quantizer_spec(self, symbol_detail):
+        """
+        Keyword arguments of core.precision.Quantizer for a symbol. Venues override this
+        to read the price tick and the limits of both currencies from the raw payload.
+        """
+        limits = ('min_quote', 'max_quote') if self.market_buy_in_quote else ('min_base', 'max_base')
+        return {
+            'symbol': symbol_detail['symbol'],
+            'base': symbol_detail['base'],
+            'quote': symbol_detail['quote'],
+            'step': symbol_detail['base_increment'],
+            limits[0]: symbol_detail['min_size'],
+            limits[1]: symbol_detail['max_size']
+        }
+
+    def is_leveraged(self, symbol_detail):
+        """
+        Whether a pair trades a leveraged token. Told from the name of the base asset
+        (e.g. BTC3L) by default, a guess that also catches ordinary assets named that
+        way; venues whose metadata marks leveraged tokens go by it instead.
+        """
+        return bool(LEVERAGED_BASE.match(symbol_detail['base']))
+
+    def get_balance(self, currency):
+        """
+        Returns:
+            float: The available balance of the currency, 0 if the account has none.
+        """
+        if self.user_stream is not None:
+            balance = self.user_stream.balance(currency)
+            if balance is not None:
+                return balance
+        return self.request_balance(currency)
+
+    def request_balance(self, currency):
+        """
+        Available balance of the currency from REST, used while the user data stream is down.
+        """
+        raise NotImplementedError
+
+    def get_last_price(self, symbol):
+        raise NotImplementedError
+
+    def get_exit_price(self, symbol):
+        """
+        Price the monitor compares against take profit and stop loss.
+        """
+        return self.get_last_price(symbol)
+
+    def fetch_depth(self, symbol, client=None):
+        """
+        REST depth snapshot of a symbol, `depth_limit` levels per side.
+
+        Returns:
+            tuple: (bids, asks, sequence); levels are [price, size], best first.
+        """
+        raise NotImplementedError
+
+    def early_asks(self, symbol):
+        """
+        Ask levels of a symbol, from its local book when one is synced and from a
+        REST snapshot otherwise.
+
+        Returns:
+            list or None: (price, size) levels, best first; None if the depth is unavailable.
+        """
+        book = self.depth_stream.book(symbol) if self.depth_stream is not None else None
+        if book is not None:
+            return book.levels('buy', self.depth_limit)
+        try:
+            return self.fetch_depth(symbol)[1]
+        except Exception as err:
+            self.logger.info("Could not fetch the depth of {} - {}".format(symbol, err))
+            return None
+
+    def watch_book(self, symbol):
+        """
+        Start maintaining the local order book of a symbol about to be traded,
+        unless ORDER_BOOK=0. The depth stream is started on the first call.
+        """
+        if self.depth_stream_class is None or os.getenv("ORDER_BOOK", "1") != "1":
+            return
+        if self.depth_stream is None:
+            self.depth_stream = self.depth_stream_class(self, self.logger)
+            self.depth_stream.start()
+        self.depth_stream.watch(symbol)
+
+    def unwatch_book(self, symbol):
+        """
+        Stop maintaining the local order book of a symbol no longer traded, e.g. a
+        position closed or a candidate dropped.
+        """
+        if self.depth_stream is not None:
+            self.depth_stream.unwatch(symbol)
+
+    def book_price(self, symbol, side, size=None, funds=None):
+        """
+        Price from the local order book of a watched symbol, without any request.
+        See core.orderbook.OrderBook.price(), capped to `max_slippage`.
+
+        Returns:
+            float or None: None when the book is not synced, callers fall back to REST.
+        """
+        book = self.depth_stream.book(symbol) if self.depth_stream is not None else None
+        if book is None:
+            return None
+        return book.price(side, size, funds, self.max_slippage)
+
+    def wait_for_listing(self, timeout):
+        """
+        Pause the scanner between two market queries. Adapters with a push source
+        for new listings return early when one is seen.
+        """
+        time.sleep(timeout)
+
+    def has_started_trading(self, symbol_detail):
+        """
+        Whether a freshly listed pair already trades; pairs can be visible through
+        the API before the market opens. `symbol_detail` was just fetched by the
+        scanner's metadata stage, venues read the status from it when it has one.
+        """
+        return True
+
+    def create_market_buy(self, symbol, amount, client_order_id=None):
+        raise NotImplementedError
+
+    def create_market_sell(self, symbol, size, client_order_id=None):
+        raise NotImplementedError
+
+    def create_limit_buy(self, symbol, size, price, client_order_id=None):
+        raise NotImplementedError
+
+    def create_limit_sell(self, symbol, size, price, client_order_id=None):
+        raise NotImplementedError
+
+    def _with_client_id(self, params, client_order_id):
+        """
+        Order parameters `params`, with the client order id added when there is one.
+        """
+        if client_order_id is not None:
+            params[self.client_order_id_param] = client_order_id
+        return params
+
+    def find_order(self, symbol, client_order_id):
+        """
+        Look an order up by the client order id it was sent with.
+
+        Returns:
+            dict or None: The order, shaped like the response of the create_* calls so
+            order_id() and open_price() work on it, or None if the exchange has no such order.
+        """
+        raise NotImplementedError
+
+    def order_id(self, result):
+        """
+        Returns:
+            str or None: The exchange order id if `result` is a successful order response.
+        """
+        raise NotImplementedError
+
+    def open_price(self, result, symbol):
+        """
+        Price recorded as the entry of a position opened by `result`.
+        """
+        return self.get_last_price(symbol)
+
+    def fill_price(self, order_id):
+        """
+        Average execution price of an order from the user data stream.
+
+        Returns:
+            float or None: None if there is no stream or the fills did not arrive in time.
+        """
+        return self.fill_prices([order_id])[order_id]
+
+    def fill_prices(self, order_ids):
+        """
+        Average execution prices of several orders from the user data stream,
+        waited for together: all of them get `fill_timeout` seconds in total.
+
+        Returns:
+            dict: Price per order id, None where the fills did not arrive in time.
+        """
+        if self.user_stream is None or not self.user_stream.synced.is_set():
+            return {order_id: None for order_id in order_ids}
+        deadline = time.monotonic() + self.fill_timeout
+        prices = {}
+        for order_id in order_ids:
+            fill = self.user_stream.wait_for_fill(order_id, max(deadline - time.monotonic(), 0))
+            prices[order_id] = fill['average_price'] if fill else None
+        return prices
+
+    def alternative_symbol(self, symbol):
+        """
+        Other spelling of `symbol` to retry with when the exchange rejects it, or None.
+        """
+        return None
+
+    def classify_error(self, err):
+        """
+        Map an exception raised by an exchange call to one of the error categories
+        of core.errors, from the `error_codes` and `error_messages` of the venue.
+        """
+        return classify(err, self.error_codes, self.error_messages)
@@ -0,0 +1,17 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data):
+    """
+    Decode a JSON document, with orjson when it is installed.
+
+    Args:
+        data (bytes or str): The raw JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,166 @@
+import re
+import itertools
+
+# Leveraged tokens carry their multiplier and direction in the base asset, e.g. BTC3L, ETH5S
+LEVERAGED_BASE = re.compile(r'^[A-Z0-9]+?[2-5][LS]$')
+
+class NewPair:
+    """
+    A new pair going through the filter stages. The metadata is only attached
+    by the `metadata` stage, the stages before it work from the symbol alone.
+    """
+
+    __slots__ = ('symbol', 'detail')
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.detail = None
+
+def run(pairs, stages, logger):
+    """
+    Pass new pairs through the filter stages.
+
+    Every stage is a generator over the candidates left by the previous one, so
+    a pair rejected by a stage never reaches the next ones, and a `limit` stage
+    stops pulling pairs, metadata requests included, once it has enough.
+
+    Args:
+        pairs (list): New exchange symbols.
+        stages (list): Stages as returned by the functions of this module, cheapest first.
+        logger: Rejected pairs are logged with the reason.
+
+    Returns:
+        list: The symbol details of the pairs left.
+    """
+    def reject(candidate, reason):
+        logger.info("{} filtered out: {}".format(candidate.symbol, reason))
+
+    candidates = (NewPair(pair) for pair in pairs)
+    for stage in stages:
+        candidates = stage(candidates, reject)
+    return [candidate.detail for candidate in candidates]
+
+def exclude_symbols(symbols):
+    """
+    Drop blacklisted exchange symbols.
+    """
+    symbols = set(symbols)
+
+    def stage(candidates, reject):
+        for candidate in candidates:
+            if candidate.symbol in symbols:
+                reject(candidate, "blacklisted symbol")
+            else:
+                yield candidate
+    return stage
+
+def quote_suffix(quotes):
+    """
+    Drop pairs whose symbol does not end with an allowed quote currency, before
+    any metadata is fetched. The quote is confirmed from the metadata later on.
+    """
+    quotes = tuple(quotes)
+
+    def stage(candidates, reject):
+        for candidate in candidates:
+            if candidate.symbol.upper().endswith(quotes):
+                yield candidate
+            else:
+                reject(candidate, "quote currency not in {}".format(list(quotes)))
+    return stage
+
+def metadata(adapter):
+    """
+    Attach the symbol details, dropping pairs the exchange has none for.
+    """
+    def stage(candidates, reject):
+        for candidate in candidates:
+            candidate.detail = adapter.get_symbol_detail(candidate.symbol)
+            if candidate.detail is None:
+                reject(candidate, "no symbol details")
+            else:
+                yield candidate
+    return stage
+
+def quote_whitelist(quotes):
+    """
+    Keep pairs quoted in one of `quotes`.
+    """
+    quotes = set(quotes)
+
+    def stage(candidates, reject):
+        for candidate in candidates:
+            if candidate.detail['quote'] in quotes:
+                yield candidate
+            else:
+                reject(candidate, "quote currency {} not supported".format(candidate.detail['quote']))
+    return stage
+
+def exclude_bases(bases):
+    """
+    Drop pairs on blacklisted base assets.
+    """
+    bases = set(bases)
+
+    def stage(candidates, reject):
+        for candidate in candidates:
+            if candidate.detail['base'] in bases:
+                reject(candidate, "blacklisted base asset")
+            else:
+                yield candidate
+    return stage
+
+def leveraged_tokens(adapter):
+    """
+    Drop leveraged tokens, as told by ExchangeAdapter.is_leveraged().
+    """
+    def stage(candidates, reject):
+        for candidate in candidates:
+            if adapter.is_leveraged(candidate.detail):
+                reject(candidate, "leveraged token")
+            else:
+                yield candidate
+    return stage
+
+def dedupe_base():
+    """
+    Keep one pair per base asset, the first one left by the previous stages.
+    """
+    def stage(candidates, reject):
+        seen = set()
+        for candidate in candidates:
+            if candidate.detail['base'] in seen:
+                reject(candidate, "another {} pair is already kept".format(candidate.detail['base']))
+            else:
+                seen.add(candidate.detail['base'])
+                yield candidate
+    return stage
+
+def min_notional(adapter, available):
+    """
+    Drop pairs whose minimum order notional, in the quote currency, is more than
+    the funds left to allocate. Nothing is dropped while no funds are known.
+
+    Args:
+        available (callable): Unreserved funds, read without a request
+            (BalanceLedger.available); called once per pass.
+    """
+    def stage(candidates, reject):
+        funds = None
+        for candidate in candidates:
+            if funds is None:
+                funds = available()
+            minimum = adapter.precision.get(candidate.symbol).min_quote
+            if funds > 0 and minimum > funds:
+                reject(candidate, "minimum notional {} above the {} available".format(minimum, funds))
+            else:
+                yield candidate
+    return stage
+
+def limit(count):
+    """
+    Stop after `count` pairs.
+    """
+    def stage(candidates, reject):
+        return itertools.islice(candidates, max(count, 0))
+    return stage
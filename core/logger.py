@@ -0,0 +1,272 @@
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+import threading
+from functools import wraps
+from time import perf_counter
+
+LOG_FORMAT = '[%(asctime)s] [%(levelname)s] [MODULE::%(module)s] [MESSAGE]:: %(message)s'
+
+# Listeners started by getmylogger, stopped (and drained) at exit or by shutdown_logging()
+_listeners = []
+
+def _env_flag(name, default):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _env_number(name, default, cast=int):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return cast(value)
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `rate` records per call site through every `per` seconds.
+
+    This filter runs on the calling thread, so it only looks at the call site
+    (file and line) and never formats the message. The number of records dropped
+    in a window is attached to the first record of the next window.
+    """
+
+    def __init__(self, rate, per):
+        super().__init__()
+        self.rate = rate
+        self.per = per
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.per:
+                # window = [start time, records let through, records suppressed]
+                self._windows[key] = [record.created, 1, 0]
+                if window is not None and window[2]:
+                    record.suppressed = window[2]
+                return True
+            if window[1] < self.rate:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler formats the message before enqueueing it, which is the
+    expensive part of logging a large payload. Records are enqueued as they are;
+    the arguments are therefore rendered with their state at the time the listener
+    gets to them, which is only different for objects mutated right after logging.
+    """
+
+    def prepare(self, record):
+        # Render tracebacks now, so the queued record does not keep the frames alive
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class CappedFormatter(logging.Formatter):
+    """
+    Formatter that truncates long messages and reports rate limited records.
+    """
+
+    def __init__(self, fmt=LOG_FORMAT, max_length=0):
+        super().__init__(fmt)
+        self.max_length = max_length
+
+    def cap(self, record):
+        message = record.message
+        if self.max_length and len(message) > self.max_length:
+            message = "{}... [{} chars truncated]".format(message[:self.max_length], len(message) - self.max_length)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message = "{} [{} similar message(s) suppressed]".format(message, suppressed)
+        return message
+
+    def formatMessage(self, record):
+        record.message = self.cap(record)
+        return super().formatMessage(record)
+
+class JsonFormatter(CappedFormatter):
+    """
+    Formatter producing one JSON object per line.
+    """
+
+    def format(self, record):
+        record.message = record.getMessage()
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": self.cap(record)
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class DedupQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that collapses identical consecutive messages.
+
+    A message equal to the previous one (same logger, level and text) within
+    `window` seconds is counted instead of written; the count is written as
+    "Last message repeated N times" once a different message arrives, the window
+    expires or the listener stops.
+    """
+
+    def __init__(self, log_queue, *handlers, window=60.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.window = window
+        self._last_key = None
+        self._last_record = None
+        self._repeats = 0
+
+    def handle(self, record):
+        key = (record.name, record.levelno, record.getMessage())
+        if self.window and key == self._last_key and record.created - self._last_record.created < self.window:
+            self._repeats += 1
+            return
+        self._flush_repeats()
+        self._last_key = key
+        self._last_record = record
+        super().handle(record)
+
+    def _flush_repeats(self):
+        if not self._repeats:
+            return
+        summary = logging.makeLogRecord(dict(
+            self._last_record.__dict__,
+            msg="Last message repeated %d times",
+            args=(self._repeats,),
+            exc_info=None,
+            exc_text=None,
+            suppressed=0,
+            created=time.time()
+        ))
+        self._repeats = 0
+        super().handle(summary)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        super().stop()
+        self._flush_repeats()
+
+def getmylogger(name, log_file, asynchronous=None, json_output=None):
+    """
+    Create and configure a logger with file and console handlers.
+
+    By default the logger only enqueues records; formatting, deduplication and the
+    file/console I/O happen on a background listener thread. The behaviour is tuned
+    through the environment (see .env.example):
+
+        LOG_ASYNC               use the queue based backend (default 1)
+        LOG_JSON                write structured JSON lines instead of text (default 0)
+        LOG_MAX_MESSAGE_LENGTH  truncate messages longer than this, 0 disables (default 2000)
+        LOG_RATE_LIMIT          records per call site per LOG_RATE_PERIOD, 0 disables (default 20)
+        LOG_RATE_PERIOD         rate limit window in seconds (default 10)
+        LOG_DEDUP_WINDOW        collapse repeats of the same message within this many seconds (default 60)
+
+    Processes trading a named account (ACCOUNT, see core.accounts) log to their own
+    file, suffixed with the account name.
+
+    Args:
+        name (str): The name of the logger.
+        log_file (str): Path of the rotating log file.
+        asynchronous (bool): Overrides LOG_ASYNC.
+        json_output (bool): Overrides LOG_JSON.
+
+    Returns:
+        logging.Logger: The configured logger.
+
+    """
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
+    if os.getenv("ACCOUNT"):
+        root, extension = os.path.splitext(log_file)
+        log_file = "{}_{}{}".format(root, os.getenv("ACCOUNT"), extension)
+
+    if asynchronous is None:
+        asynchronous = _env_flag("LOG_ASYNC", True)
+    if json_output is None:
+        json_output = _env_flag("LOG_JSON", False)
+    max_length = _env_number("LOG_MAX_MESSAGE_LENGTH", 2000)
+
+    if json_output:
+        formatter = JsonFormatter(max_length=max_length)
+    else:
+        formatter = CappedFormatter(LOG_FORMAT, max_length=max_length)
+
+    # Configure the file handler for logging to a file with rotating file names
+    file_handler = logging.handlers.TimedRotatingFileHandler(log_file, when="midnight")
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+
+    # Configure the console handler for logging to the console
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(formatter)
+
+    if asynchronous:
+        log_queue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        rate = _env_number("LOG_RATE_LIMIT", 20)
+        if rate:
+            queue_handler.addFilter(RateLimitFilter(rate, _env_number("LOG_RATE_PERIOD", 10.0, float)))
+        listener = DedupQueueListener(
+            log_queue, file_handler, console_handler,
+            window=_env_number("LOG_DEDUP_WINDOW", 60.0, float)
+        )
+        listener.start()
+        _listeners.append(listener)
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    return logger
+
+def shutdown_logging():
+    """
+    Stop every listener, writing out all queued records.
+    """
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(shutdown_logging)
+
+def measure_speed(func):
+    '''Decorator to measure the execution time of a function'''
+    timing_logger = logging.getLogger(func.__module__)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Timing is only reported at DEBUG level, skip the clock calls otherwise
+        if not timing_logger.isEnabledFor(logging.DEBUG):
+            return func(*args, **kwargs)
+        start_time = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing_logger.debug("Function: %s - time elapsed in seconds: %.9f", func.__name__, perf_counter() - start_time)
+    return wrapper
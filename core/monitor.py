@@ -0,0 +1,179 @@
+from core import config
+from core.orders import OrderManager, client_order_id
+from core.records import Position, PositionTable
+from core.scheduling import CheckScheduler
+from core.shutdown import Shutdown
+from core.startup import checkpoint_market_cache, report_first_order
+from core.state import TradeStore
+from core.workers import SymbolWorkerPool
+
+class Monitor:
+    """
+    Watches the opened positions and sells them on take profit or stop loss.
+    Each position is checked on its own schedule, more often the closer it is
+    to a trigger (see core.scheduling.CheckScheduler).
+
+    On SIGTERM it stops checking and waits for the sells in flight (see
+    core.shutdown.Shutdown); on start, positions sold by a previous run that
+    stopped before removing them are removed (see reconcile()).
+    """
+
+    # Take profit and stop loss multipliers come from core.config (1.2 and 0.8 of the
+    # opening price by default) and are reloaded between two passes
+
+    def __init__(self, adapter, logger):
+        self.adapter = adapter
+        self.logger = logger
+        self.orders = OrderManager(adapter, logger)
+        self.settings = config.current()
+        self.trade_list = TradeStore(adapter.trade_list_file, logger)
+        self.positions = PositionTable()
+        self.workers = SymbolWorkerPool(logger, name="monitor")
+        self.scheduler = CheckScheduler(adapter, logger)
+        self.shutdown = Shutdown(logger)
+
+    def main(self):
+        config.watch(self.logger)
+        self.shutdown.install()
+        self.reconcile()
+        while not self.shutdown.requested:
+            self.settings = config.current()
+            try:
+                records = self.trade_list.read()
+                previous = set(self.positions.symbols)
+                # An unreadable file is not an empty one: the positions are kept until it can be read again
+                if records is not None and self.positions.sync(records):
+                    self.scheduler.sync(self.positions.positions)
+                    # Sold here or removed by another process
+                    for symbol in previous - set(self.positions.symbols):
+                        self.adapter.unwatch_book(symbol)
+            except Exception:
+                continue
+
+            # Every position priced from its local book is checked at once, without a request;
+            # those at a trigger are checked now instead of on their schedule
+            if self.positions:
+                prices = [self.adapter.book_price(symbol, 'sell') for symbol in self.positions.symbols]
+                self.scheduler.expedite(self.positions.crossed(prices, self.settings.take_profit, self.settings.stop_loss))
+
+            due = self.scheduler.due()
+            if due:
+                self.logger.debug("Checking {} position(s), next checks in {}".format(len(due), self.scheduler.metrics()))
+
+                # A slow or retrying sell only holds its own worker, the other positions are still checked
+                for position in due:
+                    if not self.workers.submit(position.symbol, self.check_trade, position):
+                        self.scheduler.retry(position)
+                metrics = self.workers.metrics()
+                if metrics['queue_depth']:
+                    self.logger.info("{} position(s) waiting for a worker, {} in flight".format(metrics['queue_depth'], metrics['in_flight']))
+
+            self.adapter.breakers.report()
+            # Until the next position is due, the trade list is read again at least every second
+            self.shutdown.wait(max(self.scheduler.wait(), 0.05))
+        self.stop()
+
+    def stop(self):
+        """
+        Stop after the shutdown was requested: no new check, the sells in flight get until the deadline.
+        """
+        self.workers.close()
+        self.logger.info("Shutting down, waiting up to {:.0f}s for the sells in flight".format(self.shutdown.deadline))
+        pending = self.workers.drain(self.shutdown.deadline)
+        if pending:
+            self.logger.info("Sells of {} still in flight, reconciled on the next start".format(pending))
+        checkpoint_market_cache(self.adapter.client, self.logger)
+        self.logger.info("Stopped")
+
+    def reconcile(self):
+        """
+        Remove the positions a previous run sold without removing them from the
+        trade list, looked up on the exchange by the client order ids of their
+        market and limit sells. Positions with nothing left to sell on the
+        account are only reported: the balance may be held elsewhere.
+        """
+        for record in self.trade_list.read() or []:
+            try:
+                position = Position.from_dict(record)
+                symbol = self.orders.capabilities.order_symbol(position.symbol)
+                sold = None
+                for order_type in ("market", "limit"):
+                    order = self.adapter.find_order(symbol, client_order_id(record, "sell", order_type))
+                    if self.adapter.order_id(order):
+                        sold = order
+                        break
+                if sold is not None:
+                    self.logger.info("{} was sold before the restart, removing the position".format(position.symbol))
+                    self.trade_list.remove(record)
+                    continue
+                quantizer = self.adapter.precision.get(position.symbol)
+                if not quantizer.size(self.adapter.get_balance(quantizer.base)):
+                    self.logger.info("No {} left to sell for the {} position".format(quantizer.base, position.symbol))
+            except Exception as err:
+                self.logger.error("Could not reconcile {}: {}".format(record.get('symbol'), err))
+
+    def check_trade(self, position):
+        price = None
+        settings = self.settings
+        requests = []
+        try:
+            price = self.process_trade(position, requests)
+        except Exception as err:
+            self.logger.error("Error processing sell trade: {}".format(err))
+        self.scheduler.checked(position, price, position.open_price * settings.take_profit, position.open_price * settings.stop_loss,
+                               requests=len(requests))
+
+    def process_trade(self, position, requests=None):
+        """
+        Check a position and sell it if a trigger is hit.
+
+        Args:
+            position (Position): A position of the trade list, see core.records.
+            requests (list): Filled with the REST requests made to check the position, the sell excluded.
+
+        Returns:
+            float or None: The price the position was checked at, None if its sell failed.
+        """
+        trade_signal = position.symbol
+        # The same settings for the whole trade, even if they are reloaded meanwhile
+        settings = self.settings
+        self.logger.info("Monitoring {}".format(trade_signal))
+        # Compiled from the metadata on the first pass only
+        quantizer = self.adapter.precision.get(trade_signal)
+        # Best bid from the local book once it is synced, saves a request on every pass
+        self.adapter.watch_book(trade_signal)
+        requests = [] if requests is None else requests
+        current_price = self.adapter.book_price(trade_signal, 'sell')
+        if not current_price:
+            requests.append('price')
+            current_price = self.adapter.get_exit_price(trade_signal)
+
+        open_price = position.open_price
+        self.logger.info("open price: {}".format(open_price))
+        target_price = open_price * settings.take_profit
+        stop_loss = open_price * settings.stop_loss
+
+        self.logger.info("{} at {}, TP: {} SL: {}".format(trade_signal, current_price, target_price, stop_loss))
+
+        if current_price >= target_price or current_price <= stop_loss:
+            # Only asked for once a trigger is hit, a REST call on venues without a user data stream
+            if self.adapter.user_stream is None or self.adapter.user_stream.balance(quantizer.base) is None:
+                requests.append('balance')
+            size = quantizer.size(self.adapter.get_balance(quantizer.base))
+            self.logger.info("Trying to place a market sell order of {} {}".format(size, trade_signal))
+
+            try:
+                order = self.orders.market_sell(trade_signal, size, record=position.record)
+                if not self.adapter.order_id(order):
+                    # e.g. the order endpoint is failing, the position is checked again on the next pass
+                    self.logger.info("Market sell of {} was not successful: {}".format(trade_signal, order))
+                    return
+                report_first_order(self.logger, trade_signal)
+                if current_price >= target_price:
+                    self.logger.info("Pair {} closed with a {:.0f}% gain".format(trade_signal, (settings.take_profit - 1) * 100))
+                else:
+                    self.logger.error("{} stopped out with a {:.0f}% loss".format(trade_signal, (1 - settings.stop_loss) * 100))
+                self.trade_list.remove(position.record)
+            except Exception as err:
+                self.logger.error("Could not place order! Error occurred - {}".format(err))
+        return current_price
@@ -0,0 +1,329 @@
+import json
+import time
+import bisect
+import asyncio
+import threading
+import aiohttp
+
+class OrderBook:
+    """
+    Local L2 order book of one symbol, built from a REST depth snapshot and kept
+    up to date from the diff stream.
+
+    Price levels are kept in sorted lists next to a price -> size dict, so the
+    best prices and a walk through the book never sort anything.
+
+    Diffs carry the first and last update sequence they cover. Diffs received
+    before the snapshot are buffered and replayed on top of it; a diff that does
+    not follow the last one applied means updates were missed, the book is then
+    reset until a new snapshot is loaded.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        # Last update applied, None while the book is not synced
+        self.sequence = None
+        self.updated_at = 0.0
+        self._bids = {}
+        self._asks = {}
+        # Best price first: bids are stored negated
+        self._bid_keys = []
+        self._ask_keys = []
+        self._pending = []
+        self._lock = threading.Lock()
+
+    @property
+    def synced(self):
+        return self.sequence is not None
+
+    def _set(self, levels, keys, key, price, size):
+        if size:
+            if price not in levels:
+                bisect.insort(keys, key)
+            levels[price] = size
+        elif price in levels:
+            del levels[price]
+            del keys[bisect.bisect_left(keys, key)]
+
+    def _apply_levels(self, bids, asks, sequence=None):
+        # Levels are (price, size) or, on venues sequencing every level, (price, size, sequence)
+        for level in bids:
+            if sequence is None or len(level) < 3 or int(level[2]) > sequence:
+                price = float(level[0])
+                self._set(self._bids, self._bid_keys, -price, price, float(level[1]))
+        for level in asks:
+            if sequence is None or len(level) < 3 or int(level[2]) > sequence:
+                price = float(level[0])
+                self._set(self._asks, self._ask_keys, price, price, float(level[1]))
+
+    def _apply(self, first, last, bids, asks):
+        if last <= self.sequence:
+            return True
+        if first > self.sequence + 1:
+            self.sequence = None
+            return False
+        self._apply_levels(bids, asks, self.sequence)
+        self.sequence = last
+        self.updated_at = time.time()
+        return True
+
+    def load_snapshot(self, bids, asks, sequence):
+        """
+        Replace the book with a depth snapshot and replay the diffs received since.
+
+        Returns:
+            bool: False if the buffered diffs do not follow the snapshot and a newer one is needed.
+        """
+        with self._lock:
+            self._bids, self._asks, self._bid_keys, self._ask_keys = {}, {}, [], []
+            self.sequence = int(sequence)
+            self._apply_levels(bids, asks)
+            self.updated_at = time.time()
+            pending, self._pending = self._pending, []
+            for diff in pending:
+                if not self._apply(*diff):
+                    return False
+            return True
+
+    def apply_diff(self, first, last, bids, asks):
+        """
+        Apply one diff covering the updates `first` to `last`.
+
+        Returns:
+            bool: False if updates were missed and the book needs a new snapshot.
+        """
+        with self._lock:
+            if self.sequence is None:
+                self._pending.append((int(first), int(last), bids, asks))
+                return True
+            return self._apply(int(first), int(last), bids, asks)
+
+    def reset(self):
+        with self._lock:
+            self.sequence = None
+            self._pending = []
+
+    def best_bid(self):
+        return -self._bid_keys[0] if self._bid_keys else None
+
+    def best_ask(self):
+        return self._ask_keys[0] if self._ask_keys else None
+
+    def levels(self, side, count):
+        """
+        The `count` best (price, size) levels on the side a `side` order fills against.
+        """
+        with self._lock:
+            if side == 'buy':
+                return [(price, self._asks[price]) for price in self._ask_keys[:count]]
+            return [(-key, self._bids[-key]) for key in self._bid_keys[:count]]
+
+    def walk(self, side, size=None, funds=None):
+        """
+        Walk the opposite side of the book as a market order would.
+
+        Args:
+            side (str): 'buy' walks the asks, 'sell' the bids.
+            size (float): Quantity in the base currency to fill.
+            funds (float): Amount in the quote currency to spend, instead of `size`.
+
+        Returns:
+            tuple: (average price, last price level reached, fraction of the order the book can fill).
+        """
+        with self._lock:
+            levels, keys, sign = (self._asks, self._ask_keys, 1) if side == 'buy' else (self._bids, self._bid_keys, -1)
+            remaining = size if size is not None else funds
+            filled_base = filled_quote = 0.0
+            price = None
+            for key in keys:
+                price = key * sign
+                available = levels[price] if size is not None else levels[price] * price
+                take = min(remaining, available)
+                filled_base += take if size is not None else take / price
+                filled_quote += take * price if size is not None else take
+                remaining -= take
+                if remaining <= 0:
+                    break
+            total = size if size is not None else funds
+            if not filled_base:
+                return None, price, 0.0
+            return filled_quote / filled_base, price, (total - max(remaining, 0.0)) / total
+
+    def price(self, side, size=None, funds=None, max_slippage=None):
+        """
+        Limit price of an order meant to fill at once (limit or IOC) against the book.
+
+        Without a size the best price of the opposite side is returned. With one,
+        the price of the last level the order reaches, capped to `max_slippage`
+        (e.g. 0.05) away from the best price: beyond the cap the order only fills
+        partially instead of walking up a thin opening book.
+
+        Returns:
+            float or None: None when the book is not synced or that side is empty.
+        """
+        if not self.synced:
+            return None
+        best = self.best_ask() if side == 'buy' else self.best_bid()
+        if best is None or (size is None and funds is None):
+            return best
+        _, last_level, _ = self.walk(side, size, funds)
+        if max_slippage is None:
+            return last_level
+        if side == 'buy':
+            return min(last_level, best * (1 + max_slippage))
+        return max(last_level, best * (1 - max_slippage))
+
+class DepthStream(threading.Thread):
+    """
+    Public depth stream of an exchange feeding the local order books of the
+    symbols being sniped or exited.
+
+    Symbols are added with `watch()` at any time; every book is subscribed to,
+    then synced from a REST snapshot taken on a worker thread while its diffs
+    are buffered. When updates are missed the book is synced again.
+
+    Symbols no longer traded are dropped with `unwatch()`, so the subscriptions,
+    capped per connection on some venues, and the books synced again on every
+    reconnect stay limited to the open trades.
+
+    Venues implement `connect_url`, `subscribe`, `unsubscribe` and `handle`, and
+    `keepalive` when the server expects application level pings. Snapshots come from the
+    adapter's fetch_depth().
+    """
+
+    reconnect_delay = 1
+    # Snapshots tried in a row while they are older than the buffered diffs
+    sync_attempts = 3
+    keepalive_interval = 20
+    heartbeat = 30
+
+    def __init__(self, adapter, logger):
+        super().__init__(name="{}-depth".format(adapter.name), daemon=True)
+        self.adapter = adapter
+        self.logger = logger
+        # Own client, so the snapshots never share an HTTP session with the trading thread
+        self.client = adapter.new_client()
+        self.books = {}
+        self._loop = None
+        self._websocket = None
+        self._lock = threading.Lock()
+
+    def connect_url(self):
+        raise NotImplementedError
+
+    async def subscribe(self, websocket, symbols):
+        raise NotImplementedError
+
+    async def unsubscribe(self, websocket, symbols):
+        raise NotImplementedError
+
+    async def keepalive(self, websocket):
+        pass
+
+    def snapshot(self, symbol):
+        return self.adapter.fetch_depth(symbol, self.client)
+
+    def handle(self, message):
+        """
+        Apply one decoded stream message, through `apply_diff()`.
+        """
+        raise NotImplementedError
+
+    def watch(self, symbol):
+        """
+        Start maintaining the book of a symbol.
+        """
+        with self._lock:
+            if symbol in self.books:
+                return self.books[symbol]
+            book = self.books[symbol] = OrderBook(symbol)
+        if self._loop is not None and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(self._subscribe([symbol]), self._loop)
+        return book
+
+    def unwatch(self, symbol):
+        """
+        Stop maintaining the book of a symbol.
+        """
+        with self._lock:
+            if self.books.pop(symbol, None) is None:
+                return
+        if self._loop is not None and self._websocket is not None:
+            asyncio.run_coroutine_threadsafe(self.unsubscribe(self._websocket, [symbol]), self._loop)
+
+    def book(self, symbol):
+        """
+        Returns:
+            OrderBook or None: The book of the symbol if it is synced.
+        """
+        book = self.books.get(symbol)
+        return book if book is not None and book.synced else None
+
+    def apply_diff(self, symbol, first, last, bids, asks):
+        book = self.books.get(symbol)
+        if book is not None and not book.apply_diff(first, last, bids, asks):
+            self.logger.info("Missed depth updates on {}, syncing the book again".format(symbol))
+            self._loop.run_in_executor(None, self._sync, symbol)
+
+    def _sync(self, symbol):
+        for _ in range(self.sync_attempts):
+            try:
+                bids, asks, sequence = self.snapshot(symbol)
+            except Exception as err:
+                self.logger.info("Could not load the depth snapshot of {} - {}".format(symbol, err))
+                return
+            book = self.books.get(symbol)
+            # Unwatched meanwhile
+            if book is None:
+                return
+            if book.load_snapshot(bids, asks, sequence):
+                self.logger.info("Order book of {} synced at update {}".format(symbol, sequence))
+                return
+        self.logger.info("Could not sync the order book of {}, prices come from REST".format(symbol))
+
+    async def _subscribe(self, symbols):
+        await self.subscribe(self._websocket, symbols)
+        for symbol in symbols:
+            self._loop.run_in_executor(None, self._sync, symbol)
+
+    def run(self):
+        asyncio.run(self._listen())
+
+    async def _listen(self):
+        self._loop = asyncio.get_running_loop()
+        while True:
+            try:
+                url = self.connect_url()
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(url, heartbeat=self.heartbeat) as websocket:
+                        self._websocket = websocket
+                        with self._lock:
+                            symbols = list(self.books)
+                        if symbols:
+                            await self._subscribe(symbols)
+                        self.logger.info("Depth stream connected")
+
+                        keepalive = self._loop.create_task(self._keepalive(websocket))
+                        try:
+                            async for message in websocket:
+                                if message.type == aiohttp.WSMsgType.TEXT:
+                                    self.handle(json.loads(message.data))
+                                elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                        finally:
+                            keepalive.cancel()
+            except Exception as err:
+                self.logger.info("Depth stream disconnected - {}".format(err))
+            self._websocket = None
+            # Updates are missed while disconnected
+            for book in list(self.books.values()):
+                book.reset()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _keepalive(self, websocket):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self.keepalive(websocket)
+            except Exception as err:
+                self.logger.info("Depth keepalive failed - {}".format(err))
@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.capabilities import CapabilityCache
+from core.errors import (TIMEOUT, RATE_LIMIT, EXCHANGE_UNAVAILABLE, INSUFFICIENT_FUNDS, MARKET_ORDER_DISABLED, BAD_SYMBOL,
+                         DUPLICATE_ORDER, CIRCUIT_OPEN, OTHER)
+
+class OrderError(str):
+    """
+    Error message returned by the order functions, tagged with its error category.
+    """
+
+    def __new__(cls, message, category):
+        error = super().__new__(cls, message)
+        error.category = category
+        return error
+
+class PriceUnavailable(Exception):
+    pass
+
+def client_order_id(record, side, order_type):
+    """
+    Client order id of the order placed for a trade record.
+
+    The id only depends on the record, so every retry of the order, from this
+    process or after a restart, is sent with the same id and the exchange can tell
+    it apart from a new order.
+
+    Args:
+        record (dict): The candidate (buy) or position (sell) record.
+        side (str): 'buy' or 'sell'.
+        order_type (str): 'market' or 'limit'; the limit fallback is another order.
+
+    Returns:
+        str: 32 characters, within the limits of every supported venue.
+    """
+    payload = json.dumps(record, sort_keys=True) + side + order_type
+    return "sb" + hashlib.sha1(payload.encode()).hexdigest()[:30]
+
+class OrderManager:
+    """
+    Order placement with the retry and fallback rules shared by every venue.
+
+    Every method returns the exchange response if the order went through, or an
+    OrderError describing why it did not.
+
+    Orders placed for a trade record carry a client order id derived from it.
+    A timed out order is looked up by that id before it is sent again, so it is
+    retried immediately without risking a second position. With ORDER_HEDGE=n and
+    an exchange that rejects repeated client order ids, n duplicate requests are
+    sent along with every attempt and the first answer wins.
+
+    Symbols with market orders disabled, or traded under another symbol format,
+    are remembered in the CapabilityCache, so later orders skip the failing
+    request. While the circuit breaker of the order endpoint is open, orders
+    fail at once instead of retrying.
+    """
+
+    max_retries = 3
+    # Pause before the first attempt and after every rate limit error, in seconds
+    request_delay = 1
+    retry_delay = 1
+    # Orders of a batch sent at the same time
+    batch_workers = 10
+
+    def __init__(self, adapter, logger):
+        self.adapter = adapter
+        self.logger = logger
+        self.capabilities = CapabilityCache(adapter, logger)
+        self.hedge = int(os.getenv("ORDER_HEDGE", 0)) if adapter.dedupes_client_order_ids else 0
+        # Every copy of every order in flight gets a thread, up to a batch on each worker of the pool
+        # (core.workers), so a hedged order never waits behind the copies of another one
+        in_flight = int(os.getenv("TRADE_WORKERS", 4)) * self.batch_workers
+        self._executor = ThreadPoolExecutor(max_workers=(self.hedge + 1) * in_flight, thread_name_prefix="order-hedge") if self.hedge else None
+
+    def _send(self, send, symbol, client_id):
+        if not self.hedge or client_id is None:
+            return send(symbol)
+
+        # Same request on every worker; the exchange only accepts one of them
+        futures = [self._executor.submit(send, symbol) for _ in range(self.hedge + 1)]
+        errors = []
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except Exception as err:
+                errors.append(err)
+        # Report the error of the request the exchange did not dismiss as a duplicate
+        for err in errors:
+            if self.adapter.classify_error(err) != DUPLICATE_ORDER:
+                raise err
+        raise errors[0]
+
+    def _placed(self, symbol, client_id):
+        """
+        The order sent with `client_id` if the exchange has it, None otherwise.
+        """
+        try:
+            order = self.adapter.find_order(symbol, client_id)
+        except Exception as err:
+            self.logger.info("Could not look up order {} - {}".format(client_id, err))
+            return None
+        if order is not None:
+            self.logger.info("Order {} was placed before the error, not sending it again".format(client_id))
+        return order
+
+    def submit(self, send, symbol, fallback=None, client_id=None):
+        """
+        Send an order and handle errors with retries.
+
+        Args:
+            send (callable): Places the order for the symbol passed to it.
+            symbol (str): The trading symbol for the order.
+            fallback (callable): Called instead when market orders are disabled on the symbol.
+            client_id (str): Client order id `send` places the order with, if any.
+
+        Returns:
+            dict or OrderError: The order result if successful, or the encountered error.
+        """
+        counter = 0
+        switched_symbol = False
+        # Go straight down the path that worked before
+        known_symbol = symbol
+        symbol = self.capabilities.order_symbol(symbol)
+        if fallback is not None and not self.capabilities.market_orders(known_symbol):
+            self.logger.info("Market orders are disabled on {}, trying limit order".format(known_symbol))
+            return fallback()
+        time.sleep(self.request_delay)
+
+        while True:
+            try:
+                order = self._send(send, symbol, client_id)
+                if switched_symbol:
+                    self.capabilities.learn(known_symbol, order_symbol=symbol)
+                if fallback is not None:
+                    self.capabilities.market_enabled(known_symbol)
+                return order
+            except PriceUnavailable as err:
+                # Retry and quit if the price is still missing
+                if counter == self.max_retries:
+                    self.logger.info(str(err))
+                    return OrderError(str(err), TIMEOUT)
+                counter += 1
+                time.sleep(self.retry_delay)
+            except Exception as err:
+                error_message = str(err)
+                category = self.adapter.classify_error(err)
+
+                if category == CIRCUIT_OPEN:
+                    # Nothing was sent and the endpoint is failing, retrying would only wait
+                    self.logger.info(error_message)
+                    return OrderError(error_message, category)
+                elif category in (TIMEOUT, EXCHANGE_UNAVAILABLE, DUPLICATE_ORDER) and client_id is not None:
+                    # The order may have reached the exchange, only send it again if it did not
+                    order = self._placed(symbol, client_id)
+                    if order is not None:
+                        return order
+                    if category == DUPLICATE_ORDER or counter == self.max_retries:
+                        self.logger.info("Error encountered while placing an order: {}".format(error_message))
+                        return OrderError(error_message, category)
+                    self.logger.info("Encountered {} error. Retrying order placement (Attempt {})".format(category, counter))
+                    counter += 1
+                elif category in (TIMEOUT, EXCHANGE_UNAVAILABLE, RATE_LIMIT):
+                    self.logger.info("Encountered {} error. Retrying order placement (Attempt {})".format(category, counter))
+                    if counter == self.max_retries:
+                        return OrderError(error_message, category)
+                    counter += 1
+                    time.sleep(self.retry_delay)
+                elif category == INSUFFICIENT_FUNDS:
+                    self.logger.info("Balance insufficient!")
+                    return OrderError(error_message, category)
+                elif category == MARKET_ORDER_DISABLED and fallback is not None:
+                    self.logger.info("Market order is disabled, trying limit order")
+                    self.capabilities.market_disabled(known_symbol)
+                    return fallback()
+                elif category == BAD_SYMBOL and not switched_symbol and self.adapter.alternative_symbol(symbol):
+                    self.logger.info("Switching to alt symbol")
+                    symbol = self.adapter.alternative_symbol(symbol)
+                    switched_symbol = True
+                else:
+                    self.logger.info("Error encountered while placing an order: {}".format(error_message))
+                    return OrderError(error_message, category)
+
+    def market_buy(self, symbol, amount, base_increment=None, record=None):
+        """
+        Place a market buy order.
+
+        Args:
+            symbol (str): The trading symbol for the order.
+            amount (float): Size of the order, in the quote currency if the adapter sizes
+                market buys in the quote currency, in the base currency otherwise.
+            base_increment (str): Used to size the limit order fallback.
+            record (dict): Trade record the order is placed for, the client order id is derived from it.
+        """
+        client_id = client_order_id(record, "buy", "market") if record is not None else None
+        fallback = None
+        if self.adapter.market_buy_in_quote:
+            fallback = lambda: self.limit_buy(symbol, amount, base_increment, record)
+        return self.submit(lambda sym: self.adapter.create_market_buy(sym, amount, client_id), symbol, fallback, client_id)
+
+    def market_buy_batch(self, orders):
+        """
+        Place several market buys at once, e.g. for pairs listed together.
+
+        The batch endpoints of MEXC (batchOrders) and Kucoin (orders/multi) only take
+        orders on a single symbol, and Kucoin only limit orders, so the buys are sent
+        concurrently instead: N orders cost about one round trip, each with its own
+        retries and fallback.
+
+        Args:
+            orders (list): (symbol, amount, base_increment, record) tuples, as for market_buy().
+
+        Returns:
+            list: The result of every order, in the same order.
+        """
+        def buy(order):
+            try:
+                return self.market_buy(*order)
+            except Exception as err:
+                return OrderError(str(err), OTHER)
+
+        if len(orders) == 1:
+            return [buy(orders[0])]
+        with ThreadPoolExecutor(max_workers=min(len(orders), self.batch_workers), thread_name_prefix="order-batch") as executor:
+            return list(executor.map(buy, orders))
+
+    def market_sell(self, symbol, size, record=None):
+        """
+        Place a market sell order for `size` in the base currency.
+        """
+        client_id = client_order_id(record, "sell", "market") if record is not None else None
+        fallback = lambda: self.limit_sell(symbol, size, record)
+        return self.submit(lambda sym: self.adapter.create_market_sell(sym, size, client_id), symbol, fallback, client_id)
+
+    def limit_buy(self, symbol, fund_allocated, base_increment, record=None):
+        """
+        Place a limit buy order at the current price.
+
+        Args:
+            symbol (str): The trading symbol for the order.
+            fund_allocated (float): Amount to buy in the quote currency.
+            base_increment (str): The smallest increment of the order size.
+            record (dict): Trade record the order is placed for, the client order id is derived from it.
+        """
+        client_id = client_order_id(record, "buy", "limit") if record is not None else None
+
+        def send(sym):
+            # Price that fills the funds against the live book, REST only when the book is not synced
+            current_price = self.adapter.book_price(symbol, 'buy', funds=fund_allocated) or self.adapter.get_last_price(sym)
+            # if current price is 0 i.e could not retrieve price for asset
+            if not current_price:
+                raise PriceUnavailable("Could not get current price to calculate size")
+            # size to buy in base currency
+            quantizer = self.adapter.precision.get(symbol, base_increment)
+            size = quantizer.size(fund_allocated, current_price)
+            return self.adapter.create_limit_buy(sym, size, quantizer.price(current_price), client_id)
+        return self.submit(send, symbol, client_id=client_id)
+
+    def limit_sell(self, symbol, size, record=None):
+        """
+        Place a limit sell order for `size` at the current price.
+        """
+        client_id = client_order_id(record, "sell", "limit") if record is not None else None
+
+        def send(sym):
+            current_price = self.adapter.book_price(symbol, 'sell', size=size) or self.adapter.get_exit_price(sym)
+            if not current_price:
+                raise PriceUnavailable("Could not get current price to place the order")
+            return self.adapter.create_limit_sell(sym, size, self.adapter.precision.get(symbol).price(current_price), client_id)
+        return self.submit(send, symbol, client_id=client_id)
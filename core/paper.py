@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import itertools
+import threading
+
+import ccxt
+
+from core import config, persistence
+from core.orderbook import OrderBook
+from core.startup import load_markets_cached
+
+# Absorbs float error on the last level of a fill
+EPSILON = 1e-12
+
+def fill(side, levels, size=None, funds=None, limit=None, share=1.0):
+    """
+    Fill an order against book levels, as the matching engine would.
+
+    Args:
+        side (str): 'buy' fills against `levels` asks, 'sell' against bids.
+        levels (list): (price, size) levels, best first.
+        size (float): Quantity in the base currency to fill.
+        funds (float): Amount in the quote currency to spend, instead of `size`.
+        limit (float): Levels past this price are not reached (limit orders).
+        share (float): Fraction of every level the order gets, below 1 to model
+            other orders competing for a fresh listing.
+
+    Returns:
+        tuple: (base filled, quote filled, fills as {'price', 'qty'} dicts).
+    """
+    base = quote = 0.0
+    fills = []
+    for price, available in levels:
+        price = float(price)
+        if limit is not None and (price > limit if side == 'buy' else price < limit):
+            break
+        available = float(available) * share
+        take = min(size - base if size is not None else (funds - quote) / price, available)
+        if take <= EPSILON:
+            break
+        base += take
+        quote += take * price
+        fills.append({'price': price, 'qty': take})
+    return base, quote, fills
+
+class PaperTrading:
+    """
+    Paper execution in front of a venue adapter: market data still comes from
+    the venue (or from recorded books), orders never reach it.
+
+    Orders fill against the local order book of the symbol when the depth stream
+    has it synced, against a REST depth snapshot otherwise, after `latency`
+    seconds. A fill only gets `fill_share` of every level it walks through, so
+    big orders on thin books fill partially. Limit orders are immediate or
+    cancel: what does not cross at once is cancelled. An order nothing of which
+    fills is rejected, so no empty position is recorded.
+
+    Balances are virtual, kept in the paper file of the state directory so the
+    action and monitor processes trade the same account; the file is seeded with
+    PAPER_BALANCE of the quote currency. The order functions, the retries by
+    client order id and the trade files all work as in live trading.
+
+    With PAPER_BOOKS set, books recorded as {symbol}.json ({'bids': ..., 'asks': ...},
+    levels as [price, size]) in that directory are used instead of the venue's.
+    """
+
+    def __init__(self, logger, account=None):
+        super().__init__(logger, account)
+        self.latency = float(os.getenv("PAPER_LATENCY_MS", 50)) / 1000
+        self.fill_share = float(os.getenv("PAPER_FILL_SHARE", 1.0))
+        # Taker fee, taken from the received currency
+        self.fee_rate = float(os.getenv("PAPER_FEE", 0.001))
+        self.starting_balance = float(os.getenv("PAPER_BALANCE", 1000))
+        self.recorded_books = os.getenv("PAPER_BOOKS")
+        # Orders of this process, by order id and client order id
+        self._orders = {}
+        # Client order ids of the orders being filled
+        self._reserved = set()
+        self._order_ids = itertools.count(int(time.time() * 1000))
+        self._orders_lock = threading.Lock()
+
+    @property
+    def paper_file(self):
+        return os.path.join(config.current().state_dir, "{}_paper.json".format(self.state_name))
+
+    def connect(self):
+        # Public data only: no user data stream, the balances are the paper ones
+        self.client = self.new_client()
+        load_markets_cached(self.client, self.logger)
+        self.logger.info("Paper trading on {}, orders are simulated".format(self.name))
+        return self.client
+
+    def _locked(self):
+        return persistence.locked(self.paper_file)
+
+    def _load(self):
+        try:
+            with open(self.paper_file, 'r') as paper_file:
+                return json.load(paper_file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'balances': {config.current().quote_currency: self.starting_balance}}
+
+    def _save(self, data):
+        persistence.write_json(self.paper_file, data)
+
+    def request_balance(self, currency):
+        return float(self._load()['balances'].get(currency, 0.0))
+
+    def _recorded(self, symbol):
+        if not self.recorded_books:
+            return None
+        try:
+            with open(os.path.join(self.recorded_books, "{}.json".format(symbol)), 'r') as book_file:
+                return json.load(book_file)
+        except FileNotFoundError:
+            return None
+
+    def fetch_depth(self, symbol, client=None):
+        recorded = self._recorded(symbol)
+        if recorded is not None:
+            return recorded['bids'], recorded['asks'], recorded.get('sequence', 0)
+        return super().fetch_depth(symbol, client)
+
+    def get_last_price(self, symbol):
+        recorded = self._recorded(symbol)
+        if recorded is not None and recorded['asks']:
+            return float(recorded['asks'][0][0])
+        return super().get_last_price(symbol)
+
+    def get_exit_price(self, symbol):
+        recorded = self._recorded(symbol)
+        if recorded is not None and recorded['bids']:
+            return float(recorded['bids'][0][0])
+        return super().get_exit_price(symbol)
+
+    def _levels(self, symbol, side):
+        book = self.depth_stream.book(symbol) if self.depth_stream is not None else None
+        if book is None:
+            book = OrderBook(symbol)
+            book.load_snapshot(*self.fetch_depth(symbol))
+        return book.levels(side, self.depth_limit)
+
+    def _execute(self, symbol, side, order_type, client_order_id, size=None, funds=None, price=None):
+        # The id is taken before the fill, so a concurrent copy of the order (hedged
+        # or retried) is rejected as the exchange would, instead of filling twice
+        with self._orders_lock:
+            if client_order_id is not None:
+                if client_order_id in self._orders or client_order_id in self._reserved:
+                    raise ccxt.DuplicateOrderId("Duplicate order sent: {}".format(client_order_id))
+                self._reserved.add(client_order_id)
+        try:
+            order = self._fill(symbol, side, order_type, client_order_id, size, funds, price)
+        except Exception:
+            with self._orders_lock:
+                self._reserved.discard(client_order_id)
+            raise
+        with self._orders_lock:
+            self._orders[order['orderId']] = order
+            if client_order_id is not None:
+                self._orders[client_order_id] = order
+                self._reserved.discard(client_order_id)
+        return order
+
+    def _fill(self, symbol, side, order_type, client_order_id, size, funds, price):
+        time.sleep(self.latency)
+        quantizer = self.precision.get(symbol)
+        limit = float(price) if price is not None else None
+        base, quote, fills = fill(side, self._levels(symbol, side), size and float(size), funds and float(funds), limit, self.fill_share)
+        if not base:
+            raise ccxt.InvalidOrder("Paper {} {} order on {} did not fill, no liquidity within the price".format(order_type, side, symbol))
+
+        with self._locked():
+            data = self._load()
+            balances = data['balances']
+            if side == 'buy':
+                # Limit buys lock their whole notional on the exchange
+                needed = float(size) * limit if limit is not None else quote
+                if balances.get(quantizer.quote, 0.0) + EPSILON < needed:
+                    raise ccxt.InsufficientFunds("Paper account has {} {}, {} needed".format(balances.get(quantizer.quote, 0.0), quantizer.quote, needed))
+                balances[quantizer.quote] = balances.get(quantizer.quote, 0.0) - quote
+                balances[quantizer.base] = balances.get(quantizer.base, 0.0) + base * (1 - self.fee_rate)
+            else:
+                if balances.get(quantizer.base, 0.0) + EPSILON < float(size):
+                    raise ccxt.InsufficientFunds("Paper account has {} {}, {} needed".format(balances.get(quantizer.base, 0.0), quantizer.base, size))
+                balances[quantizer.base] = balances.get(quantizer.base, 0.0) - base
+                balances[quantizer.quote] = balances.get(quantizer.quote, 0.0) + quote * (1 - self.fee_rate)
+            self._save(data)
+
+        requested = float(size) if size is not None else float(funds)
+        done = base if size is not None else quote
+        order = {
+            'orderId': str(next(self._order_ids)),
+            'clientOrderId': client_order_id,
+            'symbol': symbol,
+            'side': side.upper(),
+            'type': order_type.upper(),
+            # Limit orders do not rest on the paper book, their remainder expires
+            'status': 'FILLED' if done >= requested - EPSILON else ('EXPIRED' if limit is not None else 'PARTIALLY_FILLED'),
+            'price': price,
+            'origQty': size,
+            'executedQty': base,
+            'cummulativeQuoteQty': quote,
+            'fills': fills,
+            'transactTime': int(time.time() * 1000)
+        }
+        self.logger.info("Paper {} {} on {}: {} filled for {} {}".format(order_type, side, symbol, base, quote, quantizer.quote))
+        return order
+
+    def create_market_buy(self, symbol, amount, client_order_id=None):
+        if self.market_buy_in_quote:
+            return self._execute(symbol, 'buy', 'market', client_order_id, funds=amount)
+        return self._execute(symbol, 'buy', 'market', client_order_id, size=amount)
+
+    def create_market_sell(self, symbol, size, client_order_id=None):
+        return self._execute(symbol, 'sell', 'market', client_order_id, size=size)
+
+    def create_limit_buy(self, symbol, size, price, client_order_id=None):
+        return self._execute(symbol, 'buy', 'limit', client_order_id, size=size, price=price)
+
+    def create_limit_sell(self, symbol, size, price, client_order_id=None):
+        return self._execute(symbol, 'sell', 'limit', client_order_id, size=size, price=price)
+
+    def find_order(self, symbol, client_order_id):
+        return self._orders.get(client_order_id)
+
+    def order_id(self, result):
+        if isinstance(result, dict):
+            return result.get('orderId')
+        return None
+
+    def open_price(self, result, symbol):
+        return result['cummulativeQuoteQty'] / result['executedQty']
+
+    def fill_prices(self, order_ids):
+        prices = {}
+        for order_id in order_ids:
+            order = self._orders.get(order_id)
+            prices[order_id] = order['cummulativeQuoteQty'] / order['executedQty'] if order else None
+        return prices
+
+def create_adapter(adapter_class, logger, paper=None, account=None):
+    """
+    The adapter the bot trades through: `adapter_class` itself, or its paper
+    trading version when `paper` is True or, by default, when PAPER_TRADING=1.
+    It trades for `account`, by default the ACCOUNT of the process (see core.accounts).
+    """
+    if paper is None:
+        paper = os.getenv("PAPER_TRADING", "0") == "1"
+    account = account or os.getenv("ACCOUNT") or None
+    if not paper:
+        return adapter_class(logger, account)
+    paper_class = type("Paper" + adapter_class.__name__, (PaperTrading, adapter_class), {})
+    return paper_class(logger, account)
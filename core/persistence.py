@@ -0,0 +1,158 @@
+import os
+import json
+import fcntl
+import threading
+import time
+from contextlib import contextmanager
+
+@contextmanager
+def locked(path):
+    """
+    Exclusive advisory lock of a state file shared between the bot processes,
+    held around every read-modify-write of the file.
+    """
+    # The file itself is replaced on every write, the lock lives next to it
+    with open(path + ".lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+class _Pending:
+    # Latest content of a file waiting for the next commit, shared by the writers of the file in the batch
+    __slots__ = ('data', 'dump_args', 'error', 'done')
+
+    def __init__(self):
+        self.data = None
+        self.dump_args = {}
+        self.error = None
+        self.done = threading.Event()
+
+class StateWriter:
+    """
+    Writes the JSON state files so that neither a reader nor a crash ever sees
+    a partial file: the content goes to a temporary file, is flushed to disk,
+    then renamed over the file.
+
+    The fsyncs are what a write costs, so the writes of a burst are committed
+    together: the writes made while a batch is being committed, by the other
+    threads, wait for it and make up the next batch, whose directories are
+    fsynced once. A file written several times meanwhile is written once, with
+    its latest content. Every writer returns once its content is on disk.
+
+    Tuned with STATE_FSYNC_WINDOW (seconds a batch waits for more writes before
+    it is committed, 0 by default) and STATE_FSYNC (0 skips the fsyncs: files
+    stay whole for readers but the last writes may be lost on a power failure).
+    """
+
+    def __init__(self, window=None, fsync=None):
+        self.window = float(os.getenv("STATE_FSYNC_WINDOW", 0)) if window is None else window
+        self.fsync = os.getenv("STATE_FSYNC", "1") != "0" if fsync is None else fsync
+        self.writes = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self._pending = {}
+        self._committing = False
+        self._lock = threading.Lock()
+
+    def write(self, path, data, **dump_args):
+        """
+        Replace a file with `data` dumped as JSON, `dump_args` are passed to json.dump().
+
+        Raises:
+            OSError: The file could not be written, it is left as it was.
+        """
+        with self._lock:
+            self.writes += 1
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = _Pending()
+            pending.data = data
+            pending.dump_args = dump_args
+            lead = not self._committing
+            self._committing = True
+        if lead:
+            self._lead()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+
+    def _lead(self):
+        # Commit batches until no write is pending; the next writer leads again
+        try:
+            while True:
+                if self.window:
+                    time.sleep(self.window)
+                with self._lock:
+                    batch, self._pending = self._pending, {}
+                    if not batch:
+                        # In the same lock as the check, a write added after it finds no leader
+                        self._committing = False
+                        return
+                self._commit(batch)
+        except BaseException:
+            with self._lock:
+                self._committing = False
+            raise
+
+    def _commit(self, batch):
+        fsyncs = 0
+        try:
+            for path, pending in batch.items():
+                temp_path = "{}.{}.tmp".format(path, os.getpid())
+                try:
+                    with open(temp_path, 'w') as temp_file:
+                        json.dump(pending.data, temp_file, **pending.dump_args)
+                        temp_file.flush()
+                        if self.fsync:
+                            os.fsync(temp_file.fileno())
+                            fsyncs += 1
+                    os.replace(temp_path, path)
+                except (OSError, TypeError, ValueError) as err:
+                    pending.error = err
+                    try:
+                        os.unlink(temp_path)
+                    except OSError:
+                        pass
+            if self.fsync:
+                # The renames are durable once their directory is
+                for directory in {os.path.dirname(os.path.abspath(path)) for path in batch}:
+                    directory_fd = os.open(directory, os.O_RDONLY)
+                    try:
+                        os.fsync(directory_fd)
+                        fsyncs += 1
+                    finally:
+                        os.close(directory_fd)
+        except OSError as err:
+            for pending in batch.values():
+                pending.error = pending.error or err
+        finally:
+            with self._lock:
+                self.batches += 1
+                self.fsyncs += fsyncs
+            for pending in batch.values():
+                pending.done.set()
+
+    def metrics(self):
+        with self._lock:
+            return {'writes': self.writes, 'batches': self.batches, 'fsyncs': self.fsyncs}
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def writer():
+    """
+    The StateWriter of the process, created on first use so the .env file is loaded by then.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = StateWriter()
+        return _writer
+
+def write_json(path, data, **dump_args):
+    """
+    Atomically replace a state file, see StateWriter.write().
+    """
+    writer().write(path, data, **dump_args)
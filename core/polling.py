@@ -0,0 +1,131 @@
+import os
+import queue
+import time
+import hashlib
+import threading
+
+class RequestBudget:
+    """
+    Token bucket shared by the pollers of a process, `rate` requests per second
+    with bursts of up to one second worth of requests.
+    """
+
+    def __init__(self, rate):
+        self.rate = float(rate)
+        self.tokens = self.rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cost=1):
+        """
+        Block until `cost` requests fit in the budget.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                wait = (cost - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def charge(self, cost=1):
+        """
+        Take `cost` requests already made from the budget, into debt if they do not fit;
+        the next acquire() or try_acquire() waits for the debt to be paid back.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= cost
+
+    def try_acquire(self, cost=1):
+        """
+        Take `cost` requests from the budget if they fit now, without waiting.
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return True
+            return False
+
+class HedgedPoller:
+    """
+    Several pollers querying the market list concurrently, staggered over the poll
+    interval and spread over the alternate API hosts of the venue, so a listing is
+    seen after a fraction of the interval instead of up to a whole one.
+
+    Only snapshots that differ from the last one accepted are handed to the
+    scanner, and a response is dropped when a poll started after it was already
+    accepted, so a slow host never rolls the market list back.
+
+    POLL_WORKERS sets the number of pollers, POLL_API_HOSTS (comma separated)
+    overrides the hosts of the adapter, and POLL_REQUEST_BUDGET caps the requests
+    per second of all pollers together.
+    """
+
+    def __init__(self, adapter, logger, interval, workers=None, hosts=None, budget=None):
+        self.adapter = adapter
+        self.logger = logger
+        self.interval = interval
+        self.workers = workers or int(os.getenv("POLL_WORKERS", 1))
+        if hosts is None:
+            hosts = [host for host in os.getenv("POLL_API_HOSTS", "").split(",") if host] or list(adapter.api_hosts)
+        self.hosts = hosts
+        self.budget = RequestBudget(budget or float(os.getenv("POLL_REQUEST_BUDGET", 5)))
+        self.snapshots = queue.Queue()
+        self._lock = threading.Lock()
+        self._accepted_started = 0.0
+        self._accepted_hash = None
+
+    def start(self):
+        for index in range(self.workers):
+            # One client per poller, requests of different pollers never wait on the same session
+            client = self.adapter.new_client()
+            host = self.hosts[index % len(self.hosts)] if self.hosts else None
+            if host:
+                self.adapter.set_api_host(client, host)
+            threading.Thread(
+                target=self._run,
+                args=(client, host or "default host", index * self.interval / self.workers),
+                name="{}-poller-{}".format(self.adapter.name, index),
+                daemon=True
+            ).start()
+        self.logger.info("Polling the market list with {} pollers over {}".format(self.workers, self.hosts or "the default host"))
+
+    def _run(self, client, host, offset):
+        time.sleep(offset)
+        while True:
+            self.budget.acquire(self.adapter.list_markets_cost)
+            started = time.monotonic()
+            try:
+                self._offer(started, self.adapter.list_markets(client), host)
+            except Exception as err:
+                self.logger.info("Failed to get Market List from {} - {}".format(host, err))
+            # Adapters with a push source for listings wake one poller up early
+            self.adapter.wait_for_listing(max(self.interval - (time.monotonic() - started), 0))
+
+    def _offer(self, started, markets, host):
+        digest = hashlib.sha1("\n".join(sorted(markets['Pairs'])).encode()).hexdigest()
+        with self._lock:
+            if started < self._accepted_started or digest == self._accepted_hash:
+                return
+            self._accepted_started = started
+            self._accepted_hash = digest
+        self.logger.debug("Market list changed, first seen on {}".format(host))
+        self.snapshots.put(markets)
+
+    def next(self, timeout):
+        """
+        Returns:
+            dict or None: The next changed market list, None if nothing changed within `timeout` seconds.
+        """
+        try:
+            return self.snapshots.get(timeout=timeout)
+        except queue.Empty:
+            return None
@@ -0,0 +1,117 @@
+import math
+import decimal
+import threading
+
+import ccxt
+
+def _decimals(step):
+    # Number of decimals of a step written as a string, e.g. "0.001" -> 3, "5" -> 0
+    exponent = decimal.Decimal(str(step)).normalize().as_tuple().exponent
+    return max(-exponent, 0)
+
+class Quantizer:
+    """
+    Order sizing rules of one symbol, compiled once from its metadata: lot step
+    and price tick, and the size limits in the base and the quote currency.
+
+    Sizes are rounded down to a multiple of the lot step, not only to its number
+    of decimals, so steps such as "5" or "0.5" are respected as well.
+    """
+
+    __slots__ = ('symbol', 'base', 'quote', 'step', 'tick', 'min_base', 'max_base', 'min_quote', 'max_quote',
+                 '_step_decimals', '_tick_decimals')
+
+    # Absorbs float error on exact multiples, e.g. 0.3 / 0.1 = 2.9999999999999996
+    epsilon = 1e-9
+
+    def __init__(self, symbol, step, tick=None, min_base=0.0, max_base=math.inf, min_quote=0.0, max_quote=math.inf,
+                 base=None, quote=None):
+        """
+        Args:
+            symbol (str): The exchange symbol.
+            step (str or float): Lot step in the base currency; 0 or None when the exchange does not report it.
+            tick (str or float): Price tick, None if unknown.
+        """
+        self.symbol = symbol
+        self.base = base
+        self.quote = quote
+        self.step = float(step) if step and float(step) > 0 else None
+        self.tick = float(tick) if tick and float(tick) > 0 else None
+        self.min_base = float(min_base)
+        self.max_base = float(max_base)
+        self.min_quote = float(min_quote)
+        self.max_quote = float(max_quote)
+        self._step_decimals = _decimals(step) if self.step else None
+        self._tick_decimals = _decimals(tick) if self.tick else None
+
+    def size(self, amount, price=None):
+        """
+        Order size in the base currency, rounded down to the lot step.
+
+        Args:
+            amount (float): Funds in the quote currency when `price` is given (buy),
+                otherwise a quantity in the base currency (sell).
+            price (float): Price the funds are converted at.
+
+        Returns:
+            float: The order size.
+        """
+        quantity = amount / price if price else float(amount)
+        if self.step is None:
+            # mexc sometimes put 0 as the base increment, fall back to the decimals of the price
+            decimals = len(str(price).split(".")[-1]) if price else 8
+            factor = 10 ** decimals
+            return math.floor(quantity * factor + self.epsilon) / factor
+        return round(math.floor(quantity / self.step + self.epsilon) * self.step, self._step_decimals)
+
+    def price(self, price):
+        """
+        Price rounded down to the price tick.
+        """
+        if self.tick is None:
+            return price
+        return round(math.floor(price / self.tick + self.epsilon) * self.tick, self._tick_decimals)
+
+class PrecisionRegistry:
+    """
+    Quantizers of the symbols an adapter has loaded the metadata of. They are
+    compiled by ExchangeAdapter.get_symbol_detail(), so sizing an order never
+    parses the metadata again.
+    """
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self._quantizers = {}
+        self._lock = threading.Lock()
+
+    def compile(self, symbol_detail):
+        quantizer = Quantizer(**self.adapter.quantizer_spec(symbol_detail))
+        with self._lock:
+            self._quantizers[symbol_detail['symbol']] = quantizer
+        return quantizer
+
+    def get(self, symbol, base_increment=None):
+        """
+        The quantizer of a symbol.
+
+        Args:
+            symbol (str): The exchange symbol.
+            base_increment (str): Lot step known from a trade record. Used, without any
+                request, when the symbol has not been compiled yet; the metadata is
+                fetched otherwise.
+
+        Raises:
+            ccxt.BadSymbol: The exchange has no metadata for the symbol.
+        """
+        quantizer = self._quantizers.get(symbol)
+        # A quantizer compiled from a trade record only knows the lot step
+        if quantizer is not None and (base_increment is not None or quantizer.base is not None):
+            return quantizer
+        if quantizer is None and base_increment is not None and float(base_increment) > 0:
+            quantizer = Quantizer(symbol, base_increment)
+            with self._lock:
+                return self._quantizers.setdefault(symbol, quantizer)
+        symbol_detail = self.adapter.get_symbol_detail(symbol)
+        if symbol_detail is None:
+            raise ccxt.BadSymbol("No market metadata for {}".format(symbol))
+        return self._quantizers[symbol]
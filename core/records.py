@@ -0,0 +1,140 @@
+import math
+
+import numpy as np
+
+class Candidate:
+    """
+    A pair picked by the scanner for the action process, one entry of the potential trades file.
+
+    The numeric fields are parsed once, when the record is read. `record` is the
+    entry as stored in the file, the key of TradeStore.remove() and of the client
+    order ids (core.orders.client_order_id()).
+    """
+
+    __slots__ = ('symbol', 'base', 'quote', 'min_size', 'max_size', 'base_increment', 'fund_allocated',
+                 'expected_slippage', 'record')
+
+    def __init__(self, symbol, base, quote, min_size, max_size, base_increment, fund_allocated, expected_slippage=None,
+                 record=None):
+        self.symbol = symbol
+        self.base = base
+        self.quote = quote
+        self.min_size = float(min_size)
+        self.max_size = float(max_size)
+        self.base_increment = base_increment
+        self.fund_allocated = float(fund_allocated)
+        self.expected_slippage = expected_slippage
+        self.record = record if record is not None else self.to_dict()
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(record['trade_signal'], record.get('baseCurr'), record.get('quoteCurr'), record['minSize'],
+                   record['maxSize'], record['base_increment'], record['fund_allocated'],
+                   record.get('expected_slippage'), record)
+
+    def to_dict(self):
+        # The file format read by the action process of every venue
+        return {
+            "trade_signal": self.symbol,
+            "baseCurr": self.base,
+            "quoteCurr": self.quote,
+            "minSize": self.min_size,
+            "maxSize": self.max_size,
+            "base_increment": self.base_increment,
+            "fund_allocated": self.fund_allocated,
+            "expected_slippage": self.expected_slippage
+        }
+
+class Position:
+    """
+    A position opened by the action process for the monitor, one entry of the trade list file.
+    """
+
+    __slots__ = ('symbol', 'open_price', 'record')
+
+    def __init__(self, symbol, open_price, record=None):
+        self.symbol = symbol
+        self.open_price = float(open_price)
+        self.record = record if record is not None else self.to_dict()
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(record['symbol'], record['openPrice'], record)
+
+    def to_dict(self):
+        return {
+            'symbol': self.symbol,
+            'openPrice': self.open_price
+        }
+
+class PositionTable:
+    """
+    The positions of the trade list file, in columns: the opening prices are
+    kept in a numpy array aligned with `symbols`, so the take profit and stop
+    loss of every position are checked in one vectorized pass.
+
+    The table is only rebuilt when the file changes, the records of the
+    positions still open are kept as they were parsed.
+    """
+
+    def __init__(self):
+        self.symbols = []
+        self.positions = []
+        self.open_prices = np.empty(0)
+        self._index = {}
+        self._records = []
+
+    def __len__(self):
+        return len(self.positions)
+
+    def sync(self, records):
+        """
+        Follow the trade list file.
+
+        Args:
+            records (list): The entries of the file, None if it could not be read.
+
+        Returns:
+            bool: Whether the positions changed.
+        """
+        records = records or []
+        if records == self._records:
+            return False
+        positions = []
+        for record in records:
+            position = self.get(record.get('symbol'))
+            # Same symbol but a new entry, e.g. bought again after being sold
+            if position is None or position.record != record:
+                try:
+                    position = Position.from_dict(record)
+                except (KeyError, TypeError, ValueError):
+                    continue
+            positions.append(position)
+
+        self._records = records
+        self.positions = positions
+        self.symbols = [position.symbol for position in positions]
+        self._index = {position.symbol: position for position in positions}
+        self.open_prices = np.fromiter((position.open_price for position in positions), dtype=float, count=len(positions))
+        return True
+
+    def get(self, symbol):
+        return self._index.get(symbol)
+
+    def crossed(self, prices, take_profit, stop_loss):
+        """
+        Positions whose price reached their take profit or stop loss.
+
+        Args:
+            prices (list): Price of every position, in the order of `symbols`; None when unknown.
+            take_profit (float), stop_loss (float): Multipliers of the opening price.
+
+        Returns:
+            list: The positions at a trigger, positions without a price are left out.
+        """
+        if not self.positions:
+            return []
+        prices = np.array([math.nan if price is None else price for price in prices], dtype=float)
+        # NaN compares False both ways
+        hit = (prices >= self.open_prices * take_profit) | (prices <= self.open_prices * stop_loss)
+        return [self.positions[i] for i in np.flatnonzero(hit)]
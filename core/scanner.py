@@ -0,0 +1,217 @@
+import os
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core import config, filters
+from core.accounts import Dispatcher
+from core.allocation import allocate_by_liquidity
+from core.polling import HedgedPoller
+from core.records import Candidate
+from core.shutdown import Shutdown
+from core.startup import checkpoint_market_cache
+
+class Scanner:
+    """
+    Polls the exchange for newly listed pairs and writes the ones worth trading
+    to the potential trades file, with the funds allocated to each of them.
+    With several accounts, the pairs are spread over their potential trades files
+    (see core.accounts.Dispatcher).
+    """
+
+    # Trading parameters (supported assets, trade slots, blacklists, allocation, poll interval)
+    # come from core.config and are reloaded between two passes
+
+    def __init__(self, adapter, logger):
+        self.adapter = adapter
+        self.logger = logger
+        #concurrent market pollers, staggered over the poll interval (see core.polling); read here, after load_dotenv()
+        self.poll_workers = int(os.getenv("POLL_WORKERS", 1))
+        self.settings = config.current()
+        self.dispatcher = Dispatcher(adapter, logger, self.settings.quote_currency)
+        # Files of the default account
+        self.potential_trades = self.dispatcher.accounts[0].potential_trades
+        self.balances = self.dispatcher.accounts[0].balances
+        self.poller = None
+        self.shutdown = Shutdown(logger)
+
+    def query_markets(self):
+        """
+        Query the exchange until the market list is retrieved.
+
+        Returns:
+            dict: A dictionary containing the list of tokens and trading pairs, None on shutdown.
+        """
+        while not self.shutdown.requested:
+            try:
+                return self.adapter.list_markets()
+            except Exception as err:
+                self.logger.info("Failed to get Market List")
+                self.logger.info("ERROR - {}".format(err))
+                self.shutdown.wait(2)
+        return None
+
+    def candidate_filters(self, slots):
+        """
+        Filter stages new pairs go through (see core.filters), cheapest first:
+        symbol-only checks, then one metadata request per pair still in, then
+        checks on the metadata. Nothing here asks for a price or a balance.
+
+        Args:
+            slots (int): Pairs that can still be traded; no metadata is fetched past them.
+        """
+        stages = [filters.exclude_symbols(self.settings.symbol_blacklist)]
+        if not self.settings.use_all_assets:
+            stages.append(filters.quote_suffix(self.settings.supported_asset))
+        stages.append(filters.metadata(self.adapter))
+        if not self.settings.use_all_assets:
+            stages.append(filters.quote_whitelist(self.settings.supported_asset))
+        stages += [
+            filters.exclude_bases(self.settings.base_blacklist),
+            filters.leveraged_tokens(self.adapter),
+            filters.dedupe_base(),
+            filters.min_notional(self.adapter, self.dispatcher.available),
+            filters.limit(slots)
+        ]
+        return stages
+
+    def main(self):
+        config.watch(self.logger)
+        self.shutdown.install()
+        self.dispatcher.start()
+        if self.poll_workers > 1:
+            self.poller = HedgedPoller(self.adapter, self.logger, self.settings.poll_interval, self.poll_workers)
+            self.poller.start()
+
+        known = None
+        pairs_to_trade = []
+
+        # A pass is never cut short: candidates are written with their funds reserved, or not at all
+        while not self.shutdown.requested:
+            self.apply_settings(config.current())
+            if self.poller is None:
+                new_symbol_dict = self.query_markets()
+            else:
+                # None when the market list did not change within the interval
+                new_symbol_dict = self.poller.next(self.settings.poll_interval)
+
+            if new_symbol_dict is not None and known is None:
+                known = {'Symbols': set(new_symbol_dict['Symbols']), 'Pairs': set(new_symbol_dict['Pairs'])}
+                continue
+
+            if new_symbol_dict is not None:
+                # Check for new symbols and pairs
+                new_symbols = set(new_symbol_dict['Symbols']) - known['Symbols']
+                new_pairs = set(new_symbol_dict['Pairs']) - known['Pairs']
+
+                #update the known markets with the latest info and proceed with other computation
+                known['Symbols'].update(new_symbols)
+                known['Pairs'].update(new_pairs)
+                pairs_to_trade.extend(pair for pair in new_pairs if pair not in pairs_to_trade)
+
+            if pairs_to_trade:
+                pairs_to_trade = self.process_new_pairs(pairs_to_trade)
+            else:
+                self.logger.debug("No new pair(s) found")
+
+            self.adapter.breakers.report()
+            if self.poller is None:
+                self.adapter.wait_for_listing(self.settings.poll_interval)
+        # The markets listed since the start are in the catalogue of the next one
+        checkpoint_market_cache(self.adapter.client, self.logger)
+        self.logger.info("Stopped")
+
+    def apply_settings(self, settings):
+        # The ledger and the pollers are kept, only their parameters change
+        self.settings = settings
+        self.dispatcher.set_currency(settings.quote_currency)
+        if self.poller is not None:
+            self.poller.interval = settings.poll_interval
+
+    def process_new_pairs(self, pairs_to_trade):
+        """
+        Turn new pairs into potential trades and dump them into the potential trades file.
+
+        Returns:
+            list: Pairs to look at again on the next pass, i.e. pairs that are listed but not trading yet.
+        """
+        #if every account has >= max allowed trade in its file, ignore any new potential trades.
+        slots = self.dispatcher.slots(self.settings.max_trade_per_account)
+        if not sum(slots.values()):
+            self.logger.info("Reached maximum trade count. Ignoring new pairs.")
+            return []
+
+        self.logger.info('{} new pair(s) to filter'.format(len(pairs_to_trade)))
+        candidates = filters.run(pairs_to_trade, self.candidate_filters(sum(slots.values())), self.logger)
+        self.logger.info('{} pair(s) available to trade!'.format(len(candidates)))
+
+        tradeable = []
+        not_trading = []
+        for symbol_detail in candidates:
+            # keep retrying on the next pass till the pair is trading.
+            # the thing is, there are cases where the pair might be visible through the api before it starts trading
+            if not self.adapter.has_started_trading(symbol_detail):
+                self.logger.debug("Time at which there is no price: {}".format(time.gmtime()))
+                not_trading.append(symbol_detail['symbol'])
+                continue
+
+            tradeable.append(symbol_detail)
+
+        slippage = {}
+        pairs = [symbol_detail['symbol'] for symbol_detail in tradeable]
+        allocator = None
+        if self.settings.allocation == 'liquidity' and pairs:
+            try:
+                # Depth fetched once, each account splits its own funds between its pairs with it
+                allocator = self.liquidity_allocator(pairs, slippage)
+            except Exception as err:
+                self.logger.info("Can't fetch the depth of tradeable pairs, splitting evenly - {}".format(err))
+
+        details = {symbol_detail['symbol']: symbol_detail for symbol_detail in tradeable}
+        for account, account_pairs in self.dispatcher.assign(pairs, slots):
+            try:
+                # Reserve funds for the pairs out of the unreserved quote balance (e.g., "USDT") of the account
+                funds = account.balances.reserve(account_pairs, allocator)
+                self.logger.info("Allocated funds on account {}: {} expected slippage: {}".format(account.name, funds, slippage))
+            except Exception as err:
+                self.logger.info("Can't allocate funds to tradeable pairs on account {} - {}".format(account.name, err))
+                continue
+
+            potential_trades = [Candidate(
+                pair, details[pair]['base'], details[pair]['quote'], details[pair]['min_size'], details[pair]['max_size'],
+                details[pair]['base_increment'], funds[pair], slippage.get(pair)
+            ).record for pair in account_pairs if funds.get(pair)]
+
+            self.logger.info("Potential trade(s) to dump into file : {}".format(potential_trades))
+            account.potential_trades.extend_unique(potential_trades)
+        return not_trading
+
+    def liquidity_allocator(self, pairs, slippage):
+        """
+        Allocator for BalanceLedger.reserve() splitting the funds by the depth of
+        each pair within the slippage cap, and by its notional limits.
+
+        The depth is fetched here, concurrently, before the balances file is locked.
+
+        Args:
+            pairs (list): The pairs funds are reserved for.
+            slippage (dict): Filled with the expected slippage of every allocation.
+        """
+        with ThreadPoolExecutor(max_workers=len(pairs)) as executor:
+            asks = dict(zip(pairs, executor.map(self.adapter.early_asks, pairs)))
+
+        # Limits in the quote currency, base currency limits converted at the best ask
+        limits = {}
+        for pair in pairs:
+            quantizer = self.adapter.precision.get(pair)
+            best_ask = float(asks[pair][0][0]) if asks[pair] else None
+            limits[pair] = (
+                max(quantizer.min_quote, quantizer.min_base * best_ask if best_ask else 0.0),
+                min(quantizer.max_quote, quantizer.max_base * best_ask if best_ask else math.inf)
+            )
+
+        def allocator(pairs, available):
+            funds, expected = allocate_by_liquidity(pairs, available, limits, asks, self.adapter.max_slippage)
+            slippage.update(expected)
+            return funds
+        return allocator
@@ -0,0 +1,183 @@
+import os
+import math
+import time
+import heapq
+import threading
+
+from core.polling import RequestBudget
+
+class CheckScheduler:
+    """
+    When the monitor checks each position next, from how close its price is to
+    take profit or stop loss and how fast it has been moving.
+
+    After a check at price p, the position is due again once a move of
+    `z` times its volatility could have reached the nearest trigger:
+
+        delay = (distance / (z * volatility)) ** 2
+
+    clamped to [`min_interval`, `max_interval`]. The distance is relative to p,
+    the volatility is a per-square-root-second EWMA of the log returns seen
+    between checks. A position 1% from its stop is checked about every second
+    or faster, one 19% away every `max_interval` seconds.
+
+    Due positions are kept in a heap and handed out earliest first, only as long
+    as the request budget (MONITOR_REQUEST_BUDGET REST requests per second)
+    allows, so positions near a trigger are never starved by the others. A check
+    priced from a synced local book is expected to cost no request; whatever a
+    check really spent, e.g. the balance once a trigger is hit, is charged to the
+    budget afterwards (see checked()).
+    """
+
+    # Move, in volatilities, the schedule guards against
+    z = 3.0
+    # EWMA weight of the latest return
+    alpha = 0.2
+
+    def __init__(self, adapter, logger, budget=None):
+        self.adapter = adapter
+        self.logger = logger
+        self.min_interval = float(os.getenv("MONITOR_MIN_INTERVAL", 0.2))
+        self.max_interval = float(os.getenv("MONITOR_MAX_INTERVAL", 15))
+        # Volatility of a position before two prices are seen, per square root second
+        self.default_volatility = float(os.getenv("MONITOR_DEFAULT_VOLATILITY", 0.003))
+        self.budget = RequestBudget(budget or float(os.getenv("MONITOR_REQUEST_BUDGET", 5)))
+        self.positions = {}
+        # symbol: (last price, time it was seen, variance per second)
+        self.history = {}
+        self._heap = []
+        self._due = {}
+        # symbol: requests taken from the budget when the position was handed out
+        self._charged = {}
+        self._lock = threading.Lock()
+
+    def _push(self, symbol, due):
+        # Only the latest entry of a symbol counts, older ones are skipped when popped
+        self._due[symbol] = due
+        heapq.heappush(self._heap, (due, symbol))
+
+    def sync(self, positions):
+        """
+        Follow the positions of the trade list (core.records.Position): new ones
+        are due at once, closed ones dropped.
+        """
+        with self._lock:
+            current = {position.symbol: position for position in positions}
+            for symbol in set(self.positions) - set(current):
+                del self.positions[symbol]
+                self._due.pop(symbol, None)
+                self._charged.pop(symbol, None)
+                self.history.pop(symbol, None)
+            for symbol, position in current.items():
+                if symbol not in self.positions:
+                    self._push(symbol, time.monotonic())
+                self.positions[symbol] = position
+
+    def expedite(self, positions):
+        """
+        Make positions due now, e.g. those whose local book price already reached a trigger.
+        Positions handed out and not checked yet are left alone.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for position in positions:
+                due = self._due.get(position.symbol)
+                if due is not None and due != math.inf and due > now:
+                    self._push(position.symbol, now)
+
+    def due(self):
+        """
+        Pop the positions due now, earliest first, within the request budget.
+
+        Returns:
+            list: The positions to check.
+        """
+        now = time.monotonic()
+        positions = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due, symbol = self._heap[0]
+                if self._due.get(symbol) != due:
+                    heapq.heappop(self._heap)
+                    continue
+                cost = self._cost(symbol)
+                if cost and not self.budget.try_acquire(cost):
+                    break
+                self._charged[symbol] = cost
+                heapq.heappop(self._heap)
+                # Rescheduled by checked(); until then it is not handed out again
+                self._due[symbol] = math.inf
+                positions.append(self.positions[symbol])
+        return positions
+
+    def _cost(self, symbol):
+        # Requests a check is expected to make: none when priced from the local book, one for the price otherwise
+        synced = self.adapter.depth_stream is not None and self.adapter.depth_stream.book(symbol) is not None
+        return 0 if synced else 1
+
+    def wait(self, limit=1.0):
+        """
+        Seconds until the next position is due, at most `limit`.
+        """
+        with self._lock:
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return limit
+            return min(max(self._heap[0][0] - time.monotonic(), 0.0), limit)
+
+    def retry(self, position):
+        """
+        Check a position again soon, e.g. after a failed check or when its worker was busy.
+        """
+        with self._lock:
+            if position.symbol in self.positions:
+                self._push(position.symbol, time.monotonic() + self.min_interval)
+
+    def checked(self, position, price, take_profit, stop_loss, requests=None):
+        """
+        Schedule the next check of a position after one at `price`.
+
+        Args:
+            position (Position): The position.
+            price (float): Price seen by the check, None if it failed.
+            take_profit (float), stop_loss (float): Trigger prices of the position.
+            requests (int): REST requests the check made; those not taken from the
+                budget when it was handed out are charged now.
+
+        Returns:
+            float: Seconds until the next check.
+        """
+        symbol = position.symbol
+        with self._lock:
+            charged = self._charged.pop(symbol, 0)
+        if requests is not None and requests > charged:
+            self.budget.charge(requests - charged)
+        if not price:
+            self.retry(position)
+            return self.min_interval
+        now = time.monotonic()
+        with self._lock:
+            if symbol not in self.positions:
+                return None
+            variance = self.default_volatility ** 2
+            if symbol in self.history:
+                last_price, seen_at, variance = self.history[symbol]
+                elapsed = now - seen_at
+                if elapsed > 0 and last_price > 0:
+                    variance = (1 - self.alpha) * variance + self.alpha * math.log(price / last_price) ** 2 / elapsed
+            self.history[symbol] = (price, now, variance)
+
+            distance = max(min(take_profit / price - 1, 1 - stop_loss / price), 0.0)
+            delay = (distance / (self.z * math.sqrt(variance))) ** 2 if variance > 0 else self.max_interval
+            delay = min(max(delay, self.min_interval), self.max_interval)
+            self._push(symbol, now + delay)
+            return delay
+
+    def metrics(self):
+        """
+        Positions followed and seconds until each one is checked again.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {symbol: round(due - now, 2) for symbol, due in self._due.items() if due != math.inf}
@@ -0,0 +1,48 @@
+import os
+import signal
+import threading
+
+class Shutdown:
+    """
+    Clean stop of a bot process on SIGTERM (systemctl stop or restart) or SIGINT.
+
+    The signal only sets a flag. The loop of the process stops taking new work
+    on its next pass, gives the trades its workers are processing up to
+    `deadline` seconds (SHUTDOWN_DEADLINE) to finish, then returns. An order
+    still in flight after the deadline is found again by the reconciliation of
+    the next start, from its client order id.
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.deadline = float(os.getenv("SHUTDOWN_DEADLINE", 20))
+        self._event = threading.Event()
+
+    def install(self):
+        """
+        Handle SIGTERM and SIGINT; only possible from the main thread, elsewhere request() stops the loop.
+        """
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, self._handle)
+        return self
+
+    def _handle(self, signum, frame):
+        # Nothing else here: the handler runs between two bytecodes of the main thread, maybe holding a lock
+        self._event.set()
+
+    def request(self):
+        self._event.set()
+
+    @property
+    def requested(self):
+        return self._event.is_set()
+
+    def wait(self, timeout):
+        """
+        Sleep between two passes of a loop, cut short by the shutdown.
+
+        Returns:
+            bool: Whether the shutdown was requested.
+        """
+        return self._event.wait(timeout)
@@ -0,0 +1,26 @@
+import decimal
+
+def allocate_funds(pairs, account_balance):
+    """
+    Allocate equal funds to each tradable pair.
+
+    Args:
+        pairs (list): A list of tradeable pairs.
+        account_balance (float): The total account balance.
+
+    Returns:
+        dict: A dictionary with the allocated funds for each pair.
+    """
+    # Set the rounding mode to round down
+    decimal.getcontext().rounding = decimal.ROUND_DOWN
+    funds = {}
+    number_of_pairs = len(pairs)
+    # If there are no pairs, return the empty funds dictionary
+    if number_of_pairs == 0:
+        return funds
+    # Calculate the fund allocation for each pair
+    fund_per_pair = decimal.Decimal(account_balance) / decimal.Decimal(number_of_pairs)
+    for pair in pairs:
+        # Round the allocated funds to 3 decimal places
+        funds[pair] = round(float(fund_per_pair), 3)
+    return funds
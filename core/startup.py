@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import threading
+from time import perf_counter
+
+from core import config, persistence
+
+# Fallback reference point when the process start time cannot be read from /proc
+_imported_at = perf_counter()
+
+# How long load_markets() waits for the background loader before fetching by itself
+MARKETS_READY_TIMEOUT = 30
+
+def market_cache_path(exchange_id):
+    """
+    Path of the persisted market catalogue for an exchange.
+    """
+    cache_dir = os.getenv("MARKET_CACHE_DIR") or os.path.join(config.current().state_dir, "cache")
+    return os.path.join(cache_dir, "{}_markets.json".format(exchange_id))
+
+def read_market_cache(path):
+    """
+    Read a persisted market catalogue.
+
+    Returns:
+        dict or None: {'saved_at', 'markets', 'currencies'} or None if there is no usable cache.
+    """
+    try:
+        with open(path, 'r') as cache_file:
+            data = json.load(cache_file)
+        if not data.get('markets'):
+            return None
+        return data
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, ValueError, AttributeError):
+        return None
+
+def write_market_cache(path, markets, currencies):
+    """
+    Persist a market catalogue. The file is replaced atomically so a process
+    booting at the same time never reads a partial cache.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    persistence.write_json(path, {
+        'saved_at': time.time(),
+        'markets': list(markets.values()),
+        'currencies': currencies
+    }, default=str)
+
+def checkpoint_market_cache(handle, logger):
+    """
+    Persist the catalogue a client holds, e.g. on shutdown, so the next start
+    boots from the markets listed meanwhile instead of fetching them again.
+    The cache is left alone, with its age, when it has the same markets.
+    """
+    if not handle.markets:
+        return
+    path = market_cache_path(handle.id)
+    try:
+        cached = read_market_cache(path)
+        if cached is not None and {market['symbol'] for market in cached['markets']} == set(handle.markets):
+            return
+        write_market_cache(path, handle.markets, handle.currencies)
+        logger.info("Market cache saved with {} markets".format(len(handle.markets)))
+    except Exception as err:
+        logger.error("Could not save the market cache: {}".format(err))
+
+def _fetch_markets(handle):
+    """
+    Load the market catalogue on a separate client, so the background refresh
+    never shares an HTTP session with the trading thread.
+    """
+    fresh = type(handle)({
+        'apiKey': handle.apiKey,
+        'secret': handle.secret,
+        'password': handle.password,
+        'enableRateLimit': True
+    })
+    fresh.urls = handle.urls
+    fresh.options = handle.options
+    fresh.load_markets()
+    return fresh.markets, fresh.currencies
+
+def _load_in_background(handle, path, max_age, ready, logger):
+    try:
+        cached = read_market_cache(path)
+        if cached is not None:
+            started = perf_counter()
+            handle.set_markets(cached['markets'], cached['currencies'])
+            ready.set()
+            age = time.time() - cached['saved_at']
+            logger.info("Loaded {} markets from cache in {:.1f}ms (age {:.0f}s)".format(
+                len(handle.markets), (perf_counter() - started) * 1000, age
+            ))
+            if age <= max_age:
+                return
+
+        markets, currencies = _fetch_markets(handle)
+        # Only swap the live catalogue when it changed, e.g. a pair listed since the cache was saved
+        if not ready.is_set() or set(markets) != set(handle.markets or {}):
+            handle.set_markets(list(markets.values()), currencies)
+        ready.set()
+        write_market_cache(path, markets, currencies)
+        logger.info("Market cache refreshed with {} markets".format(len(markets)))
+    except Exception as err:
+        logger.error("Could not load markets in the background: {}".format(err))
+    finally:
+        # Never leave load_markets() waiting, it will fetch the markets itself
+        ready.set()
+
+def load_markets_cached(handle, logger, max_age=None):
+    """
+    Load the market catalogue without blocking the caller.
+
+    The catalogue is applied from the local cache (or fetched, when there is no
+    cache) on a background thread, and refreshed from the exchange when the cache
+    is older than `max_age` seconds (MARKET_CACHE_MAX_AGE, default one hour).
+    Raw endpoint calls such as spotPrivatePostOrder can be made immediately;
+    unified methods that need the markets wait in load_markets() until the
+    background load is done.
+
+    Args:
+        handle: The ccxt client.
+        logger (logging.Logger): Logger of the calling module.
+        max_age (float): Maximum cache age in seconds before a refresh.
+
+    Returns:
+        threading.Event: Set once the markets are available on the client.
+    """
+    if max_age is None:
+        max_age = float(os.getenv("MARKET_CACHE_MAX_AGE", 3600))
+
+    ready = threading.Event()
+    load_markets = handle.load_markets
+
+    def load_markets_when_ready(reload=False, params={}):
+        if not reload:
+            ready.wait(MARKETS_READY_TIMEOUT)
+        return load_markets(reload, params)
+
+    # ccxt calls self.load_markets() internally, so the instance attribute takes over for those calls too
+    handle.load_markets = load_markets_when_ready
+
+    threading.Thread(
+        target=_load_in_background,
+        args=(handle, market_cache_path(handle.id), max_age, ready, logger),
+        name="{}-markets".format(handle.id),
+        daemon=True
+    ).start()
+    return ready
+
+def process_uptime():
+    """
+    Seconds since the process was started, including interpreter start and imports.
+    """
+    try:
+        with open("/proc/self/stat", 'r') as stat_file:
+            # Fields after the command name, starttime is field 22 of the full line
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", 'r') as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return perf_counter() - _imported_at
+
+_first_order_reported = threading.Event()
+
+def report_first_order(logger, symbol):
+    """
+    Log the time from process start to the first order placed, once per process.
+    """
+    if _first_order_reported.is_set():
+        return
+    _first_order_reported.set()
+    logger.info("Time to first order ({}) after restart: {:.1f}ms since process start, {:.1f}ms since imports".format(
+        symbol, process_uptime() * 1000, (perf_counter() - _imported_at) * 1000
+    ))
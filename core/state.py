@@ -0,0 +1,95 @@
+import json
+import threading
+
+from core import persistence
+
+class TradeStore:
+    """
+    A JSON trade file shared between the bot processes: the potential trades file
+    (scanner -> action) and the trade list file (action -> monitor).
+
+    The file is replaced atomically (core.persistence), so a reader never sees it
+    half written, and every update is made under its file lock, so the updates
+    of two processes are never lost.
+    """
+
+    def __init__(self, file_path, logger):
+        self.file_path = file_path
+        self.logger = logger
+        # The workers of a process update the file one at a time
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with open(self.file_path, 'r') as trade_list:
+            return json.load(trade_list)
+
+    def _save(self, data):
+        persistence.write_json(self.file_path, data)
+
+    def _locked(self):
+        return persistence.locked(self.file_path)
+
+    def read(self):
+        """
+        Reads and returns the data from the trade file, None if it can not be read.
+        """
+        try:
+            return self._load()
+        except FileNotFoundError:
+            self.logger.error("Trade list file not found.")
+            return None
+        except json.JSONDecodeError:
+            self.logger.error("Error decoding JSON data from the trade list file.")
+            return None
+
+    def count(self):
+        """
+        Returns the number of trades in the trade file.
+        """
+        data = self.read()
+        return len(data) if data else 0
+
+    def remove(self, trade):
+        """
+        Rewrites the trade file after removing the specified trade.
+        """
+        with self._lock, self._locked():
+            try:
+                data = self._load()
+                data.remove(trade)
+                self._save(data)
+            except FileNotFoundError:
+                self.logger.error("Trade list file not found.")
+            except (json.JSONDecodeError, ValueError):
+                self.logger.error("Error decoding JSON data from the trade list file.")
+
+    def append(self, trades):
+        """
+        Appends trades to the trade file, creating it if needed.
+        """
+        with self._lock, self._locked():
+            try:
+                try:
+                    data = self._load()
+                except FileNotFoundError:
+                    data = []
+                data.extend(trades)
+                self._save(data)
+            except (json.JSONDecodeError, ValueError):
+                self.logger.error("Error encoding JSON data to the trade list file.")
+
+    def extend_unique(self, trades, key='trade_signal'):
+        """
+        Appends the trades whose `key` is not in the trade file yet.
+        """
+        with self._lock, self._locked():
+            try:
+                try:
+                    data = self._load()
+                except FileNotFoundError:
+                    data = []
+                known = {trade[key] for trade in data}
+                data.extend(trade for trade in trades if trade[key] not in known)
+                self._save(data)
+            except (json.JSONDecodeError, ValueError):
+                self.logger.error("Error encoding JSON data to the trade list file.")
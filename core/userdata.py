@@ -0,0 +1,192 @@
+import json
+import time
+import asyncio
+import threading
+import aiohttp
+
+class UserDataStream(threading.Thread):
+    """
+    Private account stream of an exchange, kept in memory: available balances
+    and the fills of every order of the account.
+
+    Balances are seeded from a REST snapshot once the stream is subscribed and
+    then updated from the pushed events, so `balance()` answers without a request.
+    While the stream is down `balance()` returns None and callers fall back to REST.
+
+    Venues implement `connect_url`, `subscribe`, `keepalive`, `snapshot` and
+    `handle`; everything else is shared.
+    """
+
+    reconnect_delay = 1
+    # Seconds between two keepalive() calls
+    keepalive_interval = 1800
+    heartbeat = 30
+    # Seconds the fills of an order are kept after their last event when nobody takes them
+    fill_ttl = 600
+
+    def __init__(self, adapter, logger):
+        super().__init__(name="{}-userdata".format(adapter.name), daemon=True)
+        self.logger = logger
+        # Own client, so the stream never shares an HTTP session with the trading thread
+        self.client = adapter.new_client()
+        self.synced = threading.Event()
+        self._condition = threading.Condition()
+        self._balances = {}
+        self._fills = {}
+
+    def connect_url(self):
+        """
+        Returns:
+            str: The websocket URL, after creating the listen key or token it needs.
+        """
+        raise NotImplementedError
+
+    async def subscribe(self, websocket):
+        pass
+
+    async def keepalive(self, websocket):
+        pass
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Available balance per currency, from REST.
+        """
+        raise NotImplementedError
+
+    def handle(self, message):
+        """
+        Apply one decoded stream message.
+        """
+        raise NotImplementedError
+
+    def run(self):
+        asyncio.run(self._listen())
+
+    async def _listen(self):
+        while True:
+            try:
+                url = self.connect_url()
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(url, heartbeat=self.heartbeat) as websocket:
+                        await self.subscribe(websocket)
+                        # Snapshot after subscribing, so no update falls between the two
+                        with self._condition:
+                            self._balances.update(self.snapshot())
+                        self.synced.set()
+                        self.logger.info("User data stream connected")
+
+                        keepalive = asyncio.get_running_loop().create_task(self._keepalive(websocket))
+                        try:
+                            async for message in websocket:
+                                if message.type == aiohttp.WSMsgType.TEXT:
+                                    self.handle(json.loads(message.data))
+                                elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                        finally:
+                            keepalive.cancel()
+            except Exception as err:
+                self.logger.info("User data stream disconnected - {}".format(err))
+            self.synced.clear()
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _keepalive(self, websocket):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self.keepalive(websocket)
+            except Exception as err:
+                self.logger.info("User data keepalive failed - {}".format(err))
+
+    def balance(self, currency):
+        """
+        Returns:
+            float or None: The available balance of the currency, None while the stream is not synced.
+        """
+        if not self.synced.is_set():
+            return None
+        with self._condition:
+            return self._balances.get(currency, 0.0)
+
+    def update_balance(self, currency, available):
+        with self._condition:
+            self._balances[currency] = float(available)
+
+    def record_fill(self, order_id, symbol, quantity, quote_quantity, trade_id=None):
+        """
+        Record one execution of an order; an execution seen again under the same
+        `trade_id` is only counted once.
+        """
+        with self._condition:
+            fill = self._fill(order_id, symbol)
+            key = str(trade_id) if trade_id is not None else len(fill['trades'])
+            fill['trades'][key] = (float(quantity), float(quote_quantity))
+            self._condition.notify_all()
+        self.logger.info("Fill on {} order {}: {} at {}".format(
+            symbol, order_id, quantity, float(quote_quantity) / float(quantity) if float(quantity) else 0
+        ))
+
+    def update_order(self, order_id, symbol, filled=None, quote_filled=None, done=False):
+        """
+        Record the exchange totals of an order and mark it done when it will not fill any further.
+        """
+        with self._condition:
+            fill = self._fill(order_id, symbol)
+            if filled is not None:
+                fill['filled'] = float(filled)
+            if quote_filled is not None:
+                fill['quote_filled'] = float(quote_filled)
+            fill['done'] = fill['done'] or done
+            self._condition.notify_all()
+
+    def _fill(self, order_id, symbol):
+        # Events of an order can arrive before the order response, entries are created on first sight.
+        # Executions and totals are kept apart, the totals are None until an order update reports them
+        now = time.monotonic()
+        fill = self._fills.get(str(order_id))
+        if fill is None:
+            self._expire(now)
+            fill = self._fills[str(order_id)] = {
+                'symbol': symbol, 'trades': {}, 'filled': None, 'quote_filled': None, 'done': False
+            }
+        fill['updated'] = now
+        return fill
+
+    def _expire(self, now):
+        # Fills of orders nobody waited on, e.g. placed by hand or by another process on the account
+        expired = [order_id for order_id, fill in self._fills.items() if now - fill['updated'] > self.fill_ttl]
+        for order_id in expired:
+            del self._fills[order_id]
+
+    def _totals(self, fill):
+        # Executions and order updates arrive in any order and overlap: the more complete of the two counts
+        filled = sum(quantity for quantity, _ in fill['trades'].values())
+        quote_filled = sum(quote_quantity for _, quote_quantity in fill['trades'].values())
+        if fill['filled'] is not None and fill['quote_filled'] is not None and fill['filled'] > filled:
+            return fill['filled'], fill['quote_filled']
+        return filled, quote_filled
+
+    def wait_for_fill(self, order_id, timeout):
+        """
+        Wait until an order is done and return its fills. The fills of a done
+        order are handed out once, later events of the order start over.
+
+        Returns:
+            dict or None: {'symbol', 'filled', 'quote_filled', 'done', 'average_price'},
+            None if nothing was filled within `timeout` seconds.
+        """
+        order_id = str(order_id)
+        with self._condition:
+            self._condition.wait_for(lambda: self._fills.get(order_id, {}).get('done'), timeout)
+            fill = self._fills.get(order_id)
+            if not fill:
+                return None
+            if fill['done']:
+                del self._fills[order_id]
+            filled, quote_filled = self._totals(fill)
+            if not filled:
+                return None
+            return {
+                'symbol': fill['symbol'], 'filled': filled, 'quote_filled': quote_filled, 'done': fill['done'],
+                'average_price': quote_filled / filled
+            }
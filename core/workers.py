@@ -0,0 +1,107 @@
+import os
+import queue
+import threading
+
+class SymbolWorkerPool:
+    """
+    Bounded pool of threads processing trades in parallel, never more than one
+    job at a time per symbol.
+
+    A job is refused while another one on the same symbol is queued or running,
+    so the loops can hand over the whole trade file on every pass: a trade that
+    is still being processed, e.g. retrying its order, is skipped until it is
+    done instead of racing with itself.
+
+    Once closed, the pool takes no job and drops the queued ones; drain() waits
+    for the running ones.
+
+    TRADE_WORKERS sets the number of threads.
+    """
+
+    def __init__(self, logger, workers=None, name="trade"):
+        self.logger = logger
+        self.workers = workers or int(os.getenv("TRADE_WORKERS", 4))
+        self.jobs = queue.Queue()
+        self.in_flight = 0
+        self.closed = False
+        # Symbols with a job queued or running, and running
+        self._busy = set()
+        self._running = set()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        for n in range(self.workers):
+            threading.Thread(target=self._run, name="{}-worker-{}".format(name, n), daemon=True).start()
+
+    def submit(self, symbol, job, *args):
+        """
+        Queue `job(*args)` unless a job on `symbol` is already queued or running.
+
+        Returns:
+            bool: Whether the job was queued.
+        """
+        return self.submit_group([symbol], job, *args)
+
+    def submit_group(self, symbols, job, *args):
+        """
+        Queue one job over several symbols, e.g. a batch of buys, holding all of
+        them until it is done; refused if any of them is queued or running.
+
+        Returns:
+            bool: Whether the job was queued.
+        """
+        symbols = tuple(symbols)
+        with self._lock:
+            if self.closed or self._busy.intersection(symbols):
+                return False
+            self._busy.update(symbols)
+        self.jobs.put((symbols, job, args))
+        return True
+
+    def busy(self, symbol):
+        with self._lock:
+            return symbol in self._busy
+
+    def metrics(self):
+        """
+        Jobs waiting for a thread and jobs being processed.
+        """
+        with self._lock:
+            return {'queue_depth': self.jobs.qsize(), 'in_flight': self.in_flight, 'workers': self.workers}
+
+    def close(self):
+        """
+        Stop taking jobs, e.g. on shutdown; the queued ones are dropped, the running ones go on.
+        """
+        with self._lock:
+            self.closed = True
+
+    def drain(self, timeout):
+        """
+        Wait up to `timeout` seconds for the running jobs.
+
+        Returns:
+            list: Symbols whose job is still running.
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._running, timeout)
+            return sorted(self._running)
+
+    def _run(self):
+        while True:
+            symbols, job, args = self.jobs.get()
+            with self._lock:
+                if self.closed:
+                    self._busy.difference_update(symbols)
+                    continue
+                self.in_flight += 1
+                self._running.update(symbols)
+            try:
+                job(*args)
+            except Exception as err:
+                self.logger.error("Error processing {}: {}".format(", ".join(symbols), err))
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self._busy.difference_update(symbols)
+                    self._running.difference_update(symbols)
+                    self._idle.notify_all()
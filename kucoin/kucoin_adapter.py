@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import time
+import ccxt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.errors import BAD_SYMBOL, DUPLICATE_ORDER, INSUFFICIENT_FUNDS, ORDER_NOT_FOUND, RATE_LIMIT
+from core.exchange import ExchangeAdapter
+from core.orderbook import DepthStream
+from core.userdata import UserDataStream
+
+class KucoinUserDataStream(UserDataStream):
+    """
+    Kucoin private channels: balance changes and order changes (matches) of the
+    trade account.
+    """
+
+    topics = ["/account/balance", "/spotMarket/tradeOrders"]
+
+    def connect_url(self):
+        bullet = self.client.privatePostBulletPrivate()['data']
+        server = bullet['instanceServers'][0]
+        # The server drops the connection when it is not pinged within pingTimeout
+        self.keepalive_interval = int(server['pingInterval']) / 1000
+        return "{}?token={}&connectId={}".format(server['endpoint'], bullet['token'], int(time.time() * 1000))
+
+    async def subscribe(self, websocket):
+        for topic in self.topics:
+            await websocket.send_str(json.dumps({
+                "id": str(int(time.time() * 1000)),
+                "type": "subscribe",
+                "topic": topic,
+                "privateChannel": True,
+                "response": True
+            }))
+
+    async def keepalive(self, websocket):
+        await websocket.send_str(json.dumps({"id": str(int(time.time() * 1000)), "type": "ping"}))
+
+    def snapshot(self):
+        accounts = self.client.privateGetAccounts({"type": "trade"})['data']
+        # Balance events carry the account id, only the trade accounts feed the balances
+        self.trade_accounts = {account['id'] for account in accounts}
+        return {account['currency']: float(account['available']) for account in accounts}
+
+    def handle(self, message):
+        if message.get('type') != 'message':
+            return
+        data = message['data']
+        if message['topic'] == "/account/balance":
+            if data.get('accountId') in self.trade_accounts:
+                self.update_balance(data['currency'], data['available'])
+        elif message['topic'] == "/spotMarket/tradeOrders":
+            if data['type'] == 'match':
+                self.record_fill(data['orderId'], data['symbol'], data['matchSize'], float(data['matchSize']) * float(data['matchPrice']),
+                                 data.get('tradeId'))
+            elif data['type'] in ('filled', 'canceled'):
+                self.update_order(data['orderId'], data['symbol'], filled=data.get('filledSize'), done=True)
+
+class KucoinDepthStream(DepthStream):
+    """
+    Kucoin level 2 channel (/market/level2), synced from the top 100 levels
+    snapshot. Every change carries its own sequence.
+    """
+
+    def connect_url(self):
+        bullet = self.client.publicPostBulletPublic()['data']
+        server = bullet['instanceServers'][0]
+        # The server drops the connection when it is not pinged within pingTimeout
+        self.keepalive_interval = int(server['pingInterval']) / 1000
+        return "{}?token={}&connectId={}".format(server['endpoint'], bullet['token'], int(time.time() * 1000))
+
+    async def subscribe(self, websocket, symbols):
+        await websocket.send_str(json.dumps({
+            "id": str(int(time.time() * 1000)),
+            "type": "subscribe",
+            "topic": "/market/level2:{}".format(",".join(symbols)),
+            "response": True
+        }))
+
+    async def unsubscribe(self, websocket, symbols):
+        await websocket.send_str(json.dumps({
+            "id": str(int(time.time() * 1000)),
+            "type": "unsubscribe",
+            "topic": "/market/level2:{}".format(",".join(symbols)),
+            "response": True
+        }))
+
+    async def keepalive(self, websocket):
+        await websocket.send_str(json.dumps({"id": str(int(time.time() * 1000)), "type": "ping"}))
+
+    def handle(self, message):
+        if message.get('type') != 'message' or message.get('subject') != 'trade.l2update':
+            return
+        data = message['data']
+        #changes are [price, size, sequence], size 0 removes the level
+        self.apply_diff(data['symbol'], data['sequenceStart'], data['sequenceEnd'], data['changes']['bids'], data['changes']['asks'])
+
+class KucoinAdapter(ExchangeAdapter):
+    """
+    Kucoin spot. Orders go through the unified ccxt create_order and are sized in
+    the base currency; symbols are written with a dash (e.g. BTC-USDT).
+    """
+
+    name = "kucoin"
+    market_buy_in_quote = False
+    # clientOid is unique per account, a repeated one is rejected
+    dedupes_client_order_ids = True
+    client_order_id_param = 'clientOid'
+    user_stream_class = KucoinUserDataStream
+    depth_stream_class = KucoinDepthStream
+    error_codes = {
+        '429000': RATE_LIMIT,
+        '200004': INSUFFICIENT_FUNDS
+    }
+    error_messages = (
+        ('does not have market symbol', BAD_SYMBOL),
+        ('Balance insufficient', INSUFFICIENT_FUNDS),
+        (('clientOid', 'exist'), DUPLICATE_ORDER),
+        ('order not exist', ORDER_NOT_FOUND),
+        ('order_not_exist', ORDER_NOT_FOUND)
+    )
+
+    def create_client(self):
+        return ccxt.kucoin({
+            'apiKey': self.credential('KUCOIN_API_KEY'),
+            'secret': self.credential('KUCOIN_API_SECRET_KEY'),
+            'password': self.credential('KUCOIN_PASSPHRASE'),
+            'enableRateLimit': True
+        })
+
+    def set_api_host(self, client, host):
+        client.urls['api']['public'] = host.rstrip('/')
+        client.urls['api']['private'] = host.rstrip('/')
+
+    @property
+    def list_markets_cost(self):
+        # fetch_markets also downloads all the tickers
+        return 2 if self.full_listing else 1
+
+    def list_markets_full(self, client):
+        trading_pairs = []
+        tokens = set()
+        # Check if the symbol is on the spot market and already trading
+        for symbol_object in client.fetch_markets():
+            if symbol_object.get('spot', False) and symbol_object['info'].get('enableTrading', False):
+                trading_pairs.append(symbol_object['info']['symbol'])
+                tokens.add(symbol_object['info']['baseCurrency'])
+        return {'Symbols': list(tokens), 'Pairs': trading_pairs}
+
+    def list_markets_light(self, client):
+        # Same endpoint as fetch_markets, without building the ccxt market structures
+        symbol_list = self.fetch_public(client, client.urls['api']['public'] + "/api/v1/symbols")['data']
+        trading = [symbol_info for symbol_info in symbol_list if symbol_info.get('enableTrading', False)]
+        return {
+            'Symbols': list(set(symbol_info['baseCurrency'] for symbol_info in trading)),
+            'Pairs': [symbol_info['symbol'] for symbol_info in trading]
+        }
+
+    def fetch_symbol_detail(self, symbol):
+        symbol_list = self.client.publicGetSymbols()['data']
+        for symbol_info in symbol_list:
+            if symbol_info['symbol'] == symbol:
+                return {
+                    'symbol': symbol_info['symbol'],
+                    'base': symbol_info['baseCurrency'],
+                    'quote': symbol_info['quoteCurrency'],
+                    'min_size': float(symbol_info['baseMinSize']),
+                    'max_size': float(symbol_info['baseMaxSize']),
+                    'base_increment': symbol_info['baseIncrement'],
+                    'info': symbol_info
+                }
+        return None
+
+    def quantizer_spec(self, symbol_detail):
+        info = symbol_detail['info']
+        return dict(
+            super().quantizer_spec(symbol_detail),
+            tick=info.get('priceIncrement'),
+            min_quote=float(info.get('quoteMinSize') or 0),
+            max_quote=float(info.get('quoteMaxSize') or 'inf')
+        )
+
+    def is_leveraged(self, symbol_detail):
+        # Leveraged tokens are listed on the ETF market
+        return symbol_detail['info'].get('market') == 'ETF'
+
+    def request_balance(self, currency):
+        self.logger.info("Retrieving account details")
+
+        # Retrieve account information for the specified currency
+        account_info = self.client.privateGetAccounts({"currency": currency})['data']
+        self.logger.debug("Account information: %s", account_info)
+
+        # Find the trade account with available balance
+        for info in account_info:
+            if info['type'] == 'trade':
+                return float(info['available'])
+
+        self.logger.info("No trade account with available balance for {}".format(currency))
+        return 0.0
+
+    def _market_stats_last(self, symbol):
+        return self.client.publicGetMarketStats({"symbol": symbol})['data']['last']
+
+    def fetch_depth(self, symbol, client=None):
+        # Top 100 levels, the full book needs a private request
+        depth = (client or self.client).publicGetMarketOrderbookLevel2100({'symbol': symbol})['data']
+        return depth['bids'], depth['asks'], depth['sequence']
+
+    def get_last_price(self, symbol):
+        last_price = self._market_stats_last(symbol)
+        return float(last_price) if last_price is not None else None
+
+    def has_started_trading(self, symbol_detail):
+        current_price = self._market_stats_last(symbol_detail['symbol'])
+        self.logger.info("Current price: {}".format(current_price))
+        return current_price is not None
+
+    def create_market_buy(self, symbol, amount, client_order_id=None):
+        return self.client.create_order(symbol, 'market', 'buy', amount, None, self._with_client_id({}, client_order_id))
+
+    def create_market_sell(self, symbol, size, client_order_id=None):
+        return self.client.create_order(symbol, 'market', 'sell', size, None, self._with_client_id({}, client_order_id))
+
+    def create_limit_buy(self, symbol, size, price, client_order_id=None):
+        return self.client.create_order(symbol, 'limit', 'buy', size, price, self._with_client_id({}, client_order_id))
+
+    def create_limit_sell(self, symbol, size, price, client_order_id=None):
+        return self.client.create_order(symbol, 'limit', 'sell', size, price, self._with_client_id({}, client_order_id))
+
+    def find_order(self, symbol, client_order_id):
+        try:
+            order = self.client.privateGetOrderClientOrderClientOid({'clientOid': client_order_id})['data']
+        except Exception as err:
+            if self.classify_error(err) == ORDER_NOT_FOUND:
+                return None
+            raise
+        if not order:
+            return None
+        # Same shape as the create_order response
+        return {'id': order['id'], 'clientOrderId': client_order_id, 'info': {'orderId': order['id']}}
+
+    def order_id(self, result):
+        if isinstance(result, dict) and 'info' in result:
+            return result['info'].get('orderId')
+        return None
+
+    def open_price(self, result, symbol):
+        order = self.client.privateGetOrdersOrderId({'orderId': self.order_id(result)})['data']
+        deal_size = float(order.get('dealSize') or 0)
+        if deal_size:
+            return float(order['dealFunds']) / deal_size
+        return self.get_last_price(symbol)
+
+    def alternative_symbol(self, symbol):
+        #symbol_for_order = BTC/USDT
+        #symbol_for_retrieving_info = BTC-USDT
+        if '-' in symbol:
+            return symbol.replace('-', '/')
+        return None
+
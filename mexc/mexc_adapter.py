@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import ccxt
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.errors import MARKET_ORDER_DISABLED, ORDER_NOT_FOUND
+from core.exchange import ExchangeAdapter
+from core.filters import LEVERAGED_BASE
+from core.orderbook import DepthStream
+from core.userdata import UserDataStream
+
+# Order statuses of the private orders channel after which an order does not fill any further
+MEXC_DONE_STATUSES = (2, 4, 5)
+
+class MEXCUserDataStream(UserDataStream):
+    """
+    MEXC listen key stream: account balances, deals (fills) and order updates.
+    """
+
+    ws_url = "wss://wbs.mexc.com/ws"
+    channels = [
+        "spot@private.account.v3.api",
+        "spot@private.deals.v3.api",
+        "spot@private.orders.v3.api"
+    ]
+    # The listen key expires after 60 minutes without keepalive
+    keepalive_interval = 1800
+
+    def connect_url(self):
+        self.listen_key = self.client.request('userDataStream', ['spot', 'private'], 'POST')['listenKey']
+        return "{}?listenKey={}".format(self.ws_url, self.listen_key)
+
+    async def subscribe(self, websocket):
+        await websocket.send_str(json.dumps({"method": "SUBSCRIPTION", "params": self.channels}))
+
+    async def keepalive(self, websocket):
+        self.client.request('userDataStream', ['spot', 'private'], 'PUT', {'listenKey': self.listen_key})
+        await websocket.send_str(json.dumps({"method": "PING"}))
+
+    def snapshot(self):
+        return {asset['asset']: float(asset['free']) for asset in self.client.spotPrivateGetAccount()['balances']}
+
+    def handle(self, message):
+        channel = message.get('c', '')
+        data = message.get('d')
+        if data is None:
+            return
+        if channel.startswith("spot@private.account"):
+            #a = asset, f = free
+            self.update_balance(data['a'], data['f'])
+        elif channel.startswith("spot@private.deals"):
+            #i = order id, t = trade id, v = quantity, a = quote amount of the deal
+            self.record_fill(data['i'], message.get('s'), data['v'], data['a'], data.get('t'))
+        elif channel.startswith("spot@private.orders"):
+            #cv/ca = cumulative quantity/quote amount, s = status
+            self.update_order(
+                data['i'], message.get('s'),
+                filled=data.get('cv'), quote_filled=data.get('ca'),
+                done=data.get('s') in MEXC_DONE_STATUSES
+            )
+
+class MEXCDepthStream(DepthStream):
+    """
+    MEXC incremental depth channel, synced from /api/v3/depth. Every push is one
+    update, numbered by its version r.
+    """
+
+    ws_url = "wss://wbs.mexc.com/ws"
+    channel = "spot@public.increase.depth.v3.api@{}"
+    def connect_url(self):
+        return self.ws_url
+
+    async def subscribe(self, websocket, symbols):
+        await websocket.send_str(json.dumps({
+            "method": "SUBSCRIPTION",
+            "params": [self.channel.format(symbol) for symbol in symbols]
+        }))
+
+    async def unsubscribe(self, websocket, symbols):
+        await websocket.send_str(json.dumps({
+            "method": "UNSUBSCRIPTION",
+            "params": [self.channel.format(symbol) for symbol in symbols]
+        }))
+
+    async def keepalive(self, websocket):
+        await websocket.send_str(json.dumps({"method": "PING"}))
+
+    def handle(self, message):
+        data = message.get('d')
+        if data is None or not message.get('c', '').startswith("spot@public.increase.depth"):
+            return
+        #p = price, v = quantity, 0 removes the level
+        bids = [(level['p'], level['v']) for level in data.get('bids', [])]
+        asks = [(level['p'], level['v']) for level in data.get('asks', [])]
+        self.apply_diff(message['s'], data['r'], data['r'], bids, asks)
+
+class MEXCAdapter(ExchangeAdapter):
+    """
+    MEXC spot (v3 API). Market buys are sized in the quote currency through
+    quoteOrderQty, symbols are written without separator (e.g. BTCUSDT).
+    """
+
+    name = "mexc"
+    market_buy_in_quote = True
+    client_order_id_param = 'newClientOrderId'
+    user_stream_class = MEXCUserDataStream
+    depth_stream_class = MEXCDepthStream
+    error_codes = {
+        '-2013': ORDER_NOT_FOUND
+    }
+    error_messages = (
+        ('api market order is disabled', MARKET_ORDER_DISABLED),
+        ('Order does not exist', ORDER_NOT_FOUND)
+    )
+
+    def __init__(self, logger, account=None):
+        super().__init__(logger, account)
+        # Symbols of the leveraged tokens, from the ETF info endpoint
+        self.etf_symbols = None
+
+    def create_client(self):
+        return ccxt.mexc3({
+            'apiKey': self.credential('MEXC_API_KEY'),
+            'secret': self.credential('MEXC_API_SECRET_KEY'),
+            'enableRateLimit': True
+        })
+
+    def set_api_host(self, client, host):
+        client.urls['api']['spot']['public'] = host.rstrip('/')
+        client.urls['api']['spot']['private'] = host.rstrip('/')
+
+    @property
+    def list_markets_cost(self):
+        # exchangeInfo and defaultSymbols for the full catalogue
+        return 2 if self.full_listing else 1
+
+    def _supported_symbols(self, client):
+        # Symbols available for trade via API on mexc
+        return self.fetch_public(client, client.urls['api']['spot']['public'] + "/api/v3/defaultSymbols")["data"]
+
+    def list_markets_full(self, client):
+        # Fetch the spot market list from Mexc
+        symbol_list = client.fetch_spot_markets()
+        supported_symbols = set(self._supported_symbols(client))
+
+        # Filter only markets with
+        # - spot == True
+        # - status == ENABLED
+        # - and among the whitelisted symbols available for trade via API on mexc
+        filtered_symbol_list = [
+            symbol
+            for symbol in symbol_list
+            if symbol['spot'] and symbol['info']['status'] == 'ENABLED' and symbol['info']['symbol'] in supported_symbols
+        ]
+        return {
+            #e.g USDT, BTC
+            'Symbols': list(set(symbol['info']['baseAsset'] for symbol in filtered_symbol_list)),
+            #spot pairs e.g BTCUSDT
+            'Pairs': [symbol['info']['symbol'] for symbol in filtered_symbol_list]
+        }
+
+    def list_markets_light(self, client):
+        # defaultSymbols is a plain list of names, a fraction of exchangeInfo;
+        # the status of new pairs is checked in has_started_trading()
+        return {'Symbols': [], 'Pairs': self._supported_symbols(client)}
+
+    def fetch_symbol_detail(self, symbol):
+        try:
+            symbol_list = self.client.spotPublicGetExchangeInfo({'symbol': symbol})['symbols']
+        except ccxt.ExchangeError:
+            return None
+        for symbol_info in symbol_list:
+            if symbol_info['symbol'] == symbol:
+                return {
+                    'symbol': symbol_info['symbol'],
+                    'base': symbol_info['baseAsset'],
+                    'quote': symbol_info['quoteAsset'],
+                    'min_size': float(symbol_info['quoteAmountPrecisionMarket']),
+                    'max_size': float(symbol_info['maxQuoteAmountMarket']),
+                    'base_increment': symbol_info['baseSizePrecision'],
+                    'info': symbol_info
+                }
+        return None
+
+    def quantizer_spec(self, symbol_detail):
+        info = symbol_detail['info']
+        step = info.get('baseSizePrecision')
+        if not step or float(step) == 0:
+            # mexc sometimes put 0 as the base increment, the asset precision gives the decimals
+            step = "1e-{}".format(info['baseAssetPrecision']) if info.get('baseAssetPrecision') is not None else None
+        return dict(
+            super().quantizer_spec(symbol_detail),
+            step=step,
+            tick="1e-{}".format(info['quotePrecision']) if info.get('quotePrecision') is not None else None
+        )
+
+    def is_leveraged(self, symbol_detail):
+        # exchangeInfo does not mark leveraged tokens, the ETF info endpoint lists them.
+        # Only bases named like one (e.g. BTC3L) are looked up, the list tells whether it is one
+        if not LEVERAGED_BASE.match(symbol_detail['base']):
+            return False
+        if self.etf_symbols is None or symbol_detail['symbol'] not in self.etf_symbols:
+            try:
+                self.etf_symbols = {etf['symbol'] for etf in self.client.spotPublicGetEtfInfo()}
+            except ccxt.BaseError as err:
+                self.logger.info("Could not fetch the leveraged tokens, taking {} for one - {}".format(symbol_detail['symbol'], err))
+                return True
+        return symbol_detail['symbol'] in self.etf_symbols
+
+    def has_started_trading(self, symbol_detail):
+        # fetch_symbol_detail() always asks exchangeInfo, the status is fresh
+        return symbol_detail['info']['status'] == 'ENABLED'
+
+    def request_balance(self, currency):
+        self.logger.info("Retrieving account details")
+        account_info = self.client.spotPrivateGetAccount()
+        self.logger.debug("Account information: %s", account_info)
+
+        for asset in account_info["balances"]:
+            if asset['asset'] == currency:
+                self.logger.info('Available balance: {}'.format(asset['free']))
+                return float(asset['free'])
+        return 0.0
+
+    def fetch_depth(self, symbol, client=None):
+        depth = (client or self.client).spotPublicGetDepth({'symbol': symbol, 'limit': self.depth_limit})
+        return depth['bids'], depth['asks'], depth['lastUpdateId']
+
+    def get_last_price(self, symbol):
+        response = self.client.fetchTicker(symbol)
+        return float(response['info']['lastPrice'])
+
+    def get_exit_price(self, symbol):
+        response = self.client.fetchTicker(symbol)
+        return float(response['info']['bidPrice'])
+
+    def create_market_buy(self, symbol, amount, client_order_id=None):
+        return self.client.spotPrivatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "BUY",
+            "type": "MARKET",
+            "quoteOrderQty": amount
+        }, client_order_id))
+
+    def create_market_sell(self, symbol, size, client_order_id=None):
+        return self.client.spotPrivatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "SELL",
+            "type": "MARKET",
+            "quantity": size
+        }, client_order_id))
+
+    def create_limit_buy(self, symbol, size, price, client_order_id=None):
+        return self.client.spotPrivatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "BUY",
+            "type": "LIMIT",
+            "quantity": size,
+            "price": price
+        }, client_order_id))
+
+    def create_limit_sell(self, symbol, size, price, client_order_id=None):
+        return self.client.spotPrivatePostOrder(self._with_client_id({
+            "symbol": symbol,
+            "side": "SELL",
+            "type": "LIMIT",
+            "quantity": size,
+            "price": price
+        }, client_order_id))
+
+    def find_order(self, symbol, client_order_id):
+        try:
+            return self.client.spotPrivateGetOrder({'symbol': symbol, 'origClientOrderId': client_order_id})
+        except Exception as err:
+            if self.classify_error(err) == ORDER_NOT_FOUND:
+                return None
+            raise
+
+    def order_id(self, result):
+        if isinstance(result, dict):
+            return result.get('orderId')
+        return None
+
+    def open_price(self, result, symbol):
+        # The price of a market order response is not the fill price, ask for the executed amounts
+        order = self.client.spotPrivateGetOrder({'symbol': symbol, 'orderId': result['orderId']})
+        executed = float(order.get('executedQty') or 0)
+        if executed:
+            return float(order['cummulativeQuoteQty']) / executed
+        return self.get_last_price(symbol)
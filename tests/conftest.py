@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+import logging
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The venue scripts import their adapter from their own directory
+for path in (ROOT, os.path.join(ROOT, "binance"), os.path.join(ROOT, "mexc"), os.path.join(ROOT, "kucoin")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from core import config, orders
+from binance_mock import MockBinance
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("tests")
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """
+    A config file and state directory of its own for every test; the settings store
+    of the process is built again from it.
+    """
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"state_dir": str(tmp_path)}))
+    monkeypatch.setenv("BOT_CONFIG", str(config_path))
+    monkeypatch.setattr(config, "_store", None)
+    monkeypatch.setattr(orders.OrderManager, "request_delay", 0)
+    return tmp_path
+
+def write_config(settings):
+    """
+    Move a new config file into place, the way an editor saves it.
+    """
+    temp_path = os.environ["BOT_CONFIG"] + ".tmp"
+    with open(temp_path, 'w') as config_file:
+        json.dump(settings, config_file)
+    os.replace(temp_path, os.environ["BOT_CONFIG"])
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+@pytest.fixture
+def mock(monkeypatch):
+    """
+    A MockBinance listing BTCUSDT and ETHUSDT, with the Binance adapter pointed at it.
+    """
+    mock = MockBinance()
+    mock.list_symbol("BTCUSDT", "BTC", "USDT", 30000)
+    mock.list_symbol("ETHUSDT", "ETH", "USDT", 2000)
+    base_url = mock.serve_in_background()
+    monkeypatch.setenv("BINANCE_API_URL", base_url)
+    monkeypatch.setenv("BINANCE_WS_URL", base_url.replace("http", "ws") + "/ws/!miniTicker@arr")
+    monkeypatch.setenv("BINANCE_API_KEY", "mock")
+    monkeypatch.setenv("BINANCE_API_SECRET_KEY", "mock")
+    return mock
+
+@pytest.fixture
+def adapter(mock, logger):
+    from binance_adapter import BinanceAdapter
+    adapter = BinanceAdapter(logger)
+    adapter.connect()
+    return adapter
+
+@pytest.fixture
+def mexc(logger):
+    from mexc_adapter import MEXCAdapter
+    return MEXCAdapter(logger)
+
+@pytest.fixture
+def kucoin(logger):
+    from kucoin_adapter import KucoinAdapter
+    return KucoinAdapter(logger)
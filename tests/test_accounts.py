@@ -0,0 +1,15 @@
+from binance_adapter import BinanceAdapter
+from core.paper import create_adapter
+from core.scanner import Scanner
+
+def test_new_pairs_spread_over_accounts(mock, logger, monkeypatch):
+    # Each account with its own paper balance and potential trades file
+    monkeypatch.setenv("BINANCE_ACCOUNTS", "alt1")
+    scanner = Scanner(create_adapter(BinanceAdapter, logger, paper=True), logger)
+    scanner.adapter.connect()
+    scanner.balances.refresh()
+    for pair in ("AUSDT", "BUSDT", "CUSDT", "DUSDT"):
+        mock.list_symbol(pair, pair[:-4], "USDT", 1)
+    scanner.process_new_pairs(["AUSDT", "BUSDT", "CUSDT", "DUSDT"])
+    split = [sorted(trade["trade_signal"] for trade in account.potential_trades.read() or []) for account in scanner.dispatcher.accounts]
+    assert len(split) == 2 and len(split[0]) == 2 and len(split[1]) == 2 and not set(split[0]) & set(split[1])
@@ -0,0 +1,50 @@
+import numpy as np
+
+from core.allocation import allocate, allocate_by_liquidity, depth_within, expected_slippage, ladders
+
+def test_split_in_proportion_to_depth():
+    allocations = allocate(1000, np.array([1.0, 1.0]), np.array([1e6, 1e6]), np.array([3000.0, 1000.0]))
+    assert allocations.tolist() == [750.0, 250.0]
+
+def test_no_depth_is_the_equal_split():
+    allocations = allocate(1000, np.array([1.0] * 3), np.array([1e6] * 3), np.array([np.nan, 0.0, np.nan]))
+    assert allocations.tolist() == [333.333] * 3
+
+def test_capped_share_goes_to_the_others():
+    depth = np.array([1000.0, 4000.0, 5000.0])
+    # The max notional caps the second pair, its share is split between the others
+    allocations = allocate(1000, np.array([1.0] * 3), np.array([1e6, 200.0, 1e6]), depth)
+    assert allocations.tolist() == [133.333, 200.0, 666.666]
+    # No pair is bought past its depth, even with funds left over
+    allocations = allocate(20000, np.array([1.0] * 3), np.array([1e6] * 3), depth)
+    assert allocations.tolist() == [1000.0, 4000.0, 5000.0]
+
+def test_pair_below_its_minimum_dropped():
+    allocations = allocate(100, np.array([40.0, 40.0, 40.0]), np.array([1e6] * 3), np.array([1000.0, 1000.0, 100.0]))
+    # Three pairs cannot all reach 40; the least liquid one goes and the rest is split again
+    assert allocations.tolist() == [50.0, 50.0, 0.0]
+
+def test_rounded_down_to_three_decimals():
+    allocations = allocate(100, np.array([1.0] * 3), np.array([1e6] * 3), np.array([1.0, 1.0, 1.0]) * 1000)
+    assert allocations.tolist() == [33.333] * 3 and allocations.sum() <= 100
+
+def test_depth_and_slippage_of_the_ladders():
+    prices, sizes = ladders([[(1.0, 100), (1.02, 100), (1.1, 100)], None], levels=4)
+    assert np.isnan(prices[1]).all() and prices[0, 3] == 1.1 and sizes[0, 3] == 0
+    depth = depth_within(prices, sizes, 0.05)
+    assert np.isclose(depth[0], 100 + 102) and np.isnan(depth[1])
+    # 100 quote fills on the first level, 202 walks into the second
+    slippage = expected_slippage(np.array([100.0, 0.0]), prices, sizes)
+    assert slippage[0] == 0 and slippage[1] == 0
+    slippage = expected_slippage(np.array([202.0, 10.0]), prices, sizes)
+    assert np.isclose(slippage[0], 202 / 200 - 1) and np.isnan(slippage[1])
+
+def test_allocated_by_liquidity():
+    funds, slippage = allocate_by_liquidity(
+        ["AUSDT", "BUSDT"], 100, {"AUSDT": (5, 1e6), "BUSDT": (5, 1e6)},
+        {"AUSDT": [(1.0, 1000)]}, max_slippage=0.05
+    )
+    # The pair without a book is weighted like an average pair
+    assert funds == {"AUSDT": 50.0, "BUSDT": 50.0}
+    assert slippage == {"AUSDT": 0.0, "BUSDT": None}
+    assert allocate_by_liquidity([], 100, {}, {}, 0.05) == ({}, {})
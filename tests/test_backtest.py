@@ -0,0 +1,61 @@
+import json
+import numpy as np
+
+from backtest.exit_backtest import (
+    NO_TRAILING_STOP, _first_crossing, build_grid, load_listing, run_backtest, simulate_block, synthetic_listings
+)
+
+def exit_tick(prices, take_profit, stop_loss, trailing_stop):
+    # The exit rule, one tick at a time
+    peak = prices[0]
+    for tick, price in enumerate(prices):
+        peak = max(peak, price)
+        ratio = price / prices[0]
+        if ratio >= 1 + take_profit or ratio <= 1 - stop_loss or 1 - price / peak >= trailing_stop:
+            return tick
+    return len(prices) - 1
+
+def test_first_crossing_of_every_row():
+    running = np.array([[1.0, 1.1, 1.3, 1.3], [1.0, 1.0, 1.0, 1.2]])
+    hits = _first_crossing(running, np.array([1.1, 1.2, 2.0]))
+    # Reached on the tick equal to the level, `ticks` when never reached
+    assert hits.tolist() == [[1, 2, 4], [3, 3, 4]]
+
+def test_exits_match_the_tick_by_tick_rule():
+    names, series = synthetic_listings(12, 300, seed=3)
+    # Listings of different lengths share the block, the shorter ones padded
+    series = [prices[:100 + 15 * n] for n, prices in enumerate(series)]
+    grid = build_grid([0.05, 0.2], [0.05, 0.2], [0, 0.1])
+    results = simulate_block(series, grid)
+    for row, prices in enumerate(series):
+        for column in range(len(grid["take_profit"])):
+            tick = exit_tick(prices, grid["take_profit"][column], grid["stop_loss"][column], grid["trailing_stop"][column])
+            assert results["hold_ticks"][row, column] == tick
+            assert np.isclose(results["pnl"][row, column], prices[tick] / prices[0] - 1)
+            assert np.isclose(results["adverse_excursion"][row, column], 1 - prices[:tick + 1].min() / prices[0])
+
+def test_fee_and_entry_delay():
+    grid = build_grid([0.2], [0.2], [None])
+    assert grid["trailing_stop"][0] == NO_TRAILING_STOP
+    prices = np.array([1.0, 2.0, 2.2, 2.3, 2.5])
+    # Entered on the second tick, the take profit is hit at 2.5; the fee is charged on both sides
+    results = simulate_block([prices], grid, fee=0.01, entry_delay=1)
+    assert results["hold_ticks"][0, 0] == 3
+    assert np.isclose(results["pnl"][0, 0], 1.25 * 0.99 * 0.99 - 1)
+
+def test_blocks_and_workers_give_the_same_results():
+    names, series = synthetic_listings(10, 200)
+    grid = build_grid([0.1, 0.3], [0.1], [0, 0.05])
+    single = run_backtest(series, grid, block_size=64)
+    for results in (run_backtest(series, grid, block_size=3), run_backtest(series, grid, block_size=3, workers=2)):
+        assert all(np.array_equal(results[key], single[key]) for key in single)
+
+def test_recorded_series_ordered_by_timestamp(tmp_path):
+    path = tmp_path / "NEWUSDT.json"
+    path.write_text(json.dumps([[3, 1.2], [1, 1.0], [2, 1.1]]))
+    first_timestamp, prices = load_listing(str(path))
+    assert first_timestamp == 1 and prices.tolist() == [1.0, 1.1, 1.2]
+    path = tmp_path / "OLDUSDT.csv"
+    path.write_text("price\n1.0\n0.9\n")
+    first_timestamp, prices = load_listing(str(path))
+    assert first_timestamp is None and prices.tolist() == [1.0, 0.9]
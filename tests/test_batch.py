@@ -0,0 +1,14 @@
+import time
+
+from mexc_adapter import MEXCUserDataStream
+
+def test_fills_of_a_batch_waited_for_together(mexc, logger):
+    mexc.user_stream = MEXCUserDataStream(mexc, logger)
+    mexc.user_stream.synced.set()
+    mexc.fill_timeout = 0.5
+    mexc.user_stream.handle({"c": "spot@private.orders.v3.api", "s": "NEWUSDT", "d": {"i": "2", "cv": "10", "ca": "5", "s": 2}})
+    started = time.monotonic()
+    # The fills of the other orders never arrive, they share one timeout
+    prices = mexc.fill_prices(["1", "2", "3"])
+    assert time.monotonic() - started < 0.9
+    assert prices == {"1": None, "2": 0.5, "3": None}
@@ -0,0 +1,48 @@
+import time
+
+from core.action import Action
+from core.monitor import Monitor
+from core.records import Candidate, Position
+from core.scanner import Scanner
+
+def test_listing_bought_and_sold_at_take_profit(adapter, mock, logger):
+    # On the ticker list already, opens later
+    mock.list_symbol("PREUSDT", "PRE", "USDT", 1, status="BREAK")
+    adapter.start_listing_stream()
+    scanner = Scanner(adapter, logger)
+    known = set(scanner.query_markets()['Pairs'])
+    assert known == {"BTCUSDT", "ETHUSDT"}
+
+    # Give the stream time to connect before the listing goes live
+    time.sleep(1.5)
+    mock.list_symbol("NEWUSDT", "NEW", "USDT", 0.5)
+    assert adapter.listing_stream.new_listing.wait(5)
+
+    new_pairs = [pair for pair in scanner.query_markets()['Pairs'] if pair not in known]
+    assert sorted(new_pairs) == ["NEWUSDT", "PREUSDT"]
+    # Not trading yet, kept for the next pass
+    assert scanner.process_new_pairs(new_pairs) == ["PREUSDT"]
+    candidates = scanner.potential_trades.read()
+    assert len(candidates) == 1 and candidates[0]["fund_allocated"] == 1000.0
+    assert scanner.balances.available() == 0.0
+    assert 0 < candidates[0]["expected_slippage"] < 0.01
+
+    action = Action(adapter, logger)
+    action.process_trade(Candidate.from_dict(candidates[0]))
+    positions = action.trade_list.read()
+    assert len(positions) == 1 and abs(float(positions[0]["openPrice"]) - 0.5) < 1e-9
+    assert action.potential_trades.read() == []
+    # Spent funds are not handed out again before the next refresh
+    assert scanner.balances.reserve(["OTHERUSDT"]) == {"OTHERUSDT": 0.0}
+
+    mock.set_price("NEWUSDT", 0.65)
+    monitor = Monitor(adapter, logger)
+    monitor.process_trade(Position.from_dict(positions[0]))
+    assert monitor.trade_list.read() == []
+    assert abs(mock.balances["USDT"] - 1300.0) < 1e-6
+
+def test_symbol_detail(adapter, mock):
+    mock.list_symbol("STEPUSDT", "STEP", "USDT", 1, step_size="0.00100000", min_notional="10.00000000")
+    detail = adapter.get_symbol_detail("STEPUSDT")
+    assert detail['base_increment'] == "0.001" and detail['min_size'] == 10.0
+    assert adapter.get_symbol_detail("MISSINGUSDT") is None
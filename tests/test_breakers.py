@@ -0,0 +1,29 @@
+import time
+
+from core.errors import CIRCUIT_OPEN
+
+def test_ticker_circuit(adapter, mock):
+    # Endpoint down: the breaker opens, calls then fail fast without a request, until a trial call succeeds
+    breaker = adapter.breakers.breaker("public GET ticker/price")
+    breaker.cooldown = 0.5
+    mock.ticker_unavailable = True
+    for _ in range(40):
+        try:
+            adapter.get_last_price("BTCUSDT")
+        except Exception:
+            pass
+        if breaker.state == "open":
+            break
+    assert breaker.state == "open"
+
+    requests_before = mock.ticker_requests
+    try:
+        adapter.get_last_price("BTCUSDT")
+        category = None
+    except Exception as err:
+        category = adapter.classify_error(err)
+    assert category == CIRCUIT_OPEN and mock.ticker_requests == requests_before
+
+    mock.ticker_unavailable = False
+    time.sleep(0.5)
+    assert adapter.get_last_price("BTCUSDT") == 30000 and breaker.state == "closed"
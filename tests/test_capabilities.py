@@ -0,0 +1,17 @@
+from core.action import Action
+from conftest import wait_until
+
+def test_market_disabled_limit_fallback(adapter, mock, logger):
+    mock.list_symbol("LIMUSDT", "LIM", "USDT", 2, market_orders=False)
+    adapter.watch_book("LIMUSDT")
+    assert wait_until(lambda: adapter.depth_stream.book("LIMUSDT") is not None)
+    assert adapter.book_price("LIMUSDT", 'buy', funds=10) == 2.004
+
+    # Learned from the first rejection, the next buy goes straight to the limit order, in another process too
+    requests_before = mock.order_requests
+    order = Action(adapter, logger).orders.market_buy("LIMUSDT", 10, "0.01")
+    assert adapter.order_id(order) is not None and mock.order_requests - requests_before == 2
+    requests_before = mock.order_requests
+    order = Action(adapter, logger).orders.market_buy("LIMUSDT", 10, "0.01")
+    assert adapter.order_id(order) is not None and mock.order_requests - requests_before == 1
+    assert float(order["price"]) == 2.004
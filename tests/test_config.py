@@ -0,0 +1,44 @@
+import json
+import pytest
+
+from core import config
+from core.config import ConfigStore, Settings
+from conftest import write_config
+
+def test_defaults_and_validation():
+    settings = Settings()
+    assert settings.take_profit == 1.2 and settings.stop_loss == 0.8
+    with pytest.raises(ValueError):
+        Settings(take_profit=0.5)
+    with pytest.raises(ValueError):
+        Settings(unknown=1)
+    with pytest.raises(ValueError):
+        Settings(max_trade_per_account=True)
+    with pytest.raises(AttributeError):
+        settings.take_profit = 2
+
+def test_environment_defaults_read_when_built(monkeypatch):
+    # The .env file is loaded after core.config is imported
+    monkeypatch.setenv("ALLOCATION", "equal")
+    monkeypatch.setenv("ORDER_BOOK_MAX_SLIPPAGE", "0.02")
+    settings = Settings()
+    assert settings.allocation == "equal" and settings.max_slippage == 0.02
+
+def test_settings_reloaded_from_the_config_file():
+    write_config({"take_profit": 1.5, "max_trade_per_account": 3})
+    assert config.current().take_profit == 1.5 and config.current().max_trade_per_account == 3
+
+def test_invalid_settings_ignored(logger):
+    write_config({"take_profit": 1.5})
+    assert config.current().take_profit == 1.5
+    write_config({"take_profit": 0.5})
+    assert config.current().take_profit == 1.5
+
+def test_state_dir_kept_until_restart(tmp_path, logger):
+    path = tmp_path / "store.json"
+    path.write_text(json.dumps({"state_dir": "/first"}))
+    store = ConfigStore(str(path), logger)
+    path.write_text(json.dumps({"state_dir": "/second", "poll_interval": 5}))
+    store.request_reload()
+    settings = store.current()
+    assert settings.state_dir == "/first" and settings.poll_interval == 5.0
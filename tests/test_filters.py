@@ -0,0 +1,91 @@
+import logging
+
+from core import filters
+
+class Adapter:
+    """
+    Symbol details for every symbol in `details`, counting the lookups.
+    """
+
+    def __init__(self, details):
+        self.details = details
+        self.lookups = []
+
+    def get_symbol_detail(self, symbol):
+        self.lookups.append(symbol)
+        return self.details.get(symbol)
+
+    def is_leveraged(self, symbol_detail):
+        return bool(filters.LEVERAGED_BASE.match(symbol_detail['base']))
+
+def detail(base, quote="USDT"):
+    return {'symbol': base + quote, 'base': base, 'quote': quote}
+
+def test_stages_run_in_order(caplog):
+    adapter = Adapter({symbol: detail(symbol[:-4]) for symbol in ("AUSDT", "BTC3LUSDT", "CUSDT")})
+    adapter.details["CUSDT"] = detail("A")
+    stages = [
+        filters.exclude_symbols(["BADUSDT"]),
+        filters.quote_suffix(["USDT"]),
+        filters.metadata(adapter),
+        filters.leveraged_tokens(adapter),
+        filters.dedupe_base()
+    ]
+    with caplog.at_level(logging.INFO):
+        kept = filters.run(["BADUSDT", "AUSDT", "ABTC", "BTC3LUSDT", "GONEUSDT", "CUSDT"], stages, logging.getLogger("tests"))
+    assert [pair['symbol'] for pair in kept] == ["AUSDT"]
+    # Pairs rejected from the symbol alone are never looked up
+    assert adapter.lookups == ["AUSDT", "BTC3LUSDT", "GONEUSDT", "CUSDT"]
+    assert [record.getMessage() for record in caplog.records] == [
+        "BADUSDT filtered out: blacklisted symbol",
+        "ABTC filtered out: quote currency not in ['USDT']",
+        "BTC3LUSDT filtered out: leveraged token",
+        "GONEUSDT filtered out: no symbol details",
+        "CUSDT filtered out: another A pair is already kept"
+    ]
+
+def test_limit_stops_pulling_pairs():
+    adapter = Adapter({symbol: detail(symbol[:-4]) for symbol in ("AUSDT", "BUSDT", "CUSDT", "DUSDT")})
+    kept = filters.run(["AUSDT", "BUSDT", "CUSDT", "DUSDT"], [filters.metadata(adapter), filters.limit(2)], logging.getLogger("tests"))
+    assert [pair['symbol'] for pair in kept] == ["AUSDT", "BUSDT"]
+    # No metadata asked for the pairs past the limit
+    assert adapter.lookups == ["AUSDT", "BUSDT"]
+    assert filters.run(["AUSDT"], [filters.metadata(adapter), filters.limit(0)], logging.getLogger("tests")) == []
+
+def test_leveraged_base():
+    for base in ("BTC3L", "ETH5S", "1INCH3L", "DOGE2S"):
+        assert filters.LEVERAGED_BASE.match(base), base
+    for base in ("BTC", "3L", "BTC3", "BTC6L", "BTC3X", "btc3l"):
+        assert not filters.LEVERAGED_BASE.match(base), base
+
+class EtfClient:
+    """
+    Answers the MEXC ETF info endpoint with `symbols`, counting the requests.
+    """
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.requests = 0
+
+    def spotPublicGetEtfInfo(self, params={}):
+        self.requests += 1
+        return [{'symbol': symbol, 'netValue': '1.2', 'feeRate': '0.002'} for symbol in self.symbols]
+
+def test_mexc_leveraged_tokens_from_the_etf_list(mexc):
+    mexc.client = EtfClient(["BTC3LUSDT"])
+    assert mexc.is_leveraged(detail("BTC3L"))
+    # Named like a leveraged token, but not one
+    assert not mexc.is_leveraged(detail("ABC2S"))
+    # Other names are never looked up
+    assert not mexc.is_leveraged(detail("BTC"))
+    assert mexc.client.requests == 2
+    # Listed since the list was fetched
+    mexc.client.symbols.append("ETH5SUSDT")
+    assert mexc.is_leveraged(detail("ETH5S")) and mexc.is_leveraged(detail("BTC3L"))
+    assert mexc.client.requests == 3
+
+def test_venue_metadata_decides(adapter, kucoin):
+    assert kucoin.is_leveraged({'base': 'BTC3L', 'info': {'market': 'ETF'}})
+    assert not kucoin.is_leveraged({'base': 'ABC3L', 'info': {'market': 'USDS'}})
+    assert adapter.is_leveraged({'base': 'BTCUP', 'info': {'permissions': ['SPOT', 'LEVERAGED']}})
+    assert not adapter.is_leveraged({'base': 'ABC3L', 'info': {'permissions': ['SPOT']}})
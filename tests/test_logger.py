@@ -0,0 +1,51 @@
+import queue
+import logging
+
+from core.logger import CappedFormatter, DedupQueueListener, RateLimitFilter
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(CappedFormatter("%(message)s"))
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+def record(message, created, level=logging.INFO, lineno=1):
+    entry = logging.LogRecord("tests", level, "bot.py", lineno, message, None, None)
+    entry.created = created
+    return entry
+
+def test_rate_limited_per_call_site():
+    limit = RateLimitFilter(rate=2, per=10)
+    assert [limit.filter(record("tick", 0)) for _ in range(4)] == [True, True, False, False]
+    # Another call site, and errors, are not held back
+    assert limit.filter(record("tick", 1, lineno=2))
+    assert limit.filter(record("failed", 1, level=logging.ERROR))
+    # The next window reports what was dropped
+    entry = record("tick", 10)
+    assert limit.filter(entry) and entry.suppressed == 2
+    assert Collector().format(entry) == "tick [2 similar message(s) suppressed]"
+
+def test_repeated_messages_collapsed():
+    log_queue = queue.SimpleQueue()
+    collector = Collector()
+    listener = DedupQueueListener(log_queue, collector, window=60)
+    for message, created in (("same", 0), ("same", 1), ("same", 2), ("other", 3), ("other", 100)):
+        listener.handle(record(message, created))
+    assert collector.messages == ["same", "Last message repeated 2 times", "other", "other"]
+
+def test_repeats_written_when_stopped():
+    log_queue = queue.SimpleQueue()
+    collector = Collector()
+    listener = DedupQueueListener(log_queue, collector, window=60)
+    listener.start()
+    for created in range(3):
+        log_queue.put(record("same", created))
+    listener.stop()
+    assert collector.messages == ["same", "Last message repeated 2 times"]
+
+def test_long_messages_truncated():
+    formatter = CappedFormatter("%(message)s", max_length=5)
+    assert formatter.format(record("abcdefgh", 0)) == "abcde... [3 chars truncated]"
@@ -0,0 +1,42 @@
+from mexc_adapter import MEXCDepthStream
+from kucoin_adapter import KucoinDepthStream
+from conftest import wait_until
+
+def test_binance_book_follows_the_diff_stream(adapter, mock):
+    adapter.watch_book("ETHUSDT")
+    assert wait_until(lambda: adapter.depth_stream.book("ETHUSDT") is not None)
+    mock.set_price("ETHUSDT", 3000)
+    assert wait_until(lambda: adapter.book_price("ETHUSDT", 'buy') == 3006)
+
+    adapter.unwatch_book("ETHUSDT")
+    assert wait_until(lambda: not any("ETHUSDT" in symbols for symbols in mock.depth_subscribers.values()))
+    assert adapter.book_price("ETHUSDT", 'buy') is None
+
+def test_mexc_depth_diffs(mexc, logger):
+    stream = MEXCDepthStream(mexc, logger)
+    book = stream.watch("NEWUSDT")
+    # Received before the snapshot, replayed on top of it
+    stream.handle({"c": "spot@public.increase.depth.v3.api@NEWUSDT", "s": "NEWUSDT", "d": {
+        "bids": [{"p": "0.505", "v": "40"}], "asks": [{"p": "0.51", "v": "0"}, {"p": "0.52", "v": "10"}], "r": 11
+    }})
+    assert stream.book("NEWUSDT") is None
+    book.load_snapshot([["0.5", "100"]], [["0.51", "100"]], 10)
+    assert book.best_bid() == 0.505 and book.best_ask() == 0.52
+    stream.handle({"c": "spot@public.increase.depth.v3.api@NEWUSDT", "s": "NEWUSDT", "d": {"bids": [{"p": "0.505", "v": "0"}], "r": 12}})
+    assert book.best_bid() == 0.5 and book.sequence == 12
+    # Other channels are ignored
+    stream.handle({"c": "spot@public.deals.v3.api@NEWUSDT", "s": "NEWUSDT", "d": {"r": 13}})
+    assert book.sequence == 12
+
+def test_kucoin_depth_diffs(kucoin, logger):
+    stream = KucoinDepthStream(kucoin, logger)
+    book = stream.watch("NEW-USDT")
+    book.load_snapshot([["0.5", "100"]], [["0.51", "100"]], 10)
+    # Every change carries its sequence
+    stream.handle({"type": "message", "subject": "trade.l2update", "data": {
+        "symbol": "NEW-USDT", "sequenceStart": 11, "sequenceEnd": 12,
+        "changes": {"bids": [["0.505", "40", "11"]], "asks": [["0.51", "0", "12"]]}
+    }})
+    assert book.best_bid() == 0.505 and book.best_ask() is None and book.sequence == 12
+    stream.handle({"type": "ack", "id": "1"})
+    assert stream.book("NEW-USDT") is book
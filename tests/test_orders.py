@@ -0,0 +1,84 @@
+import ccxt
+import pytest
+
+from core.action import Action
+from core.monitor import Monitor
+from core.orders import OrderManager, client_order_id
+from core.records import Candidate
+
+class OrderClient:
+    """
+    Answers the order queries of find_order() with `response`, raised if it is an exception.
+    """
+
+    def __init__(self, response):
+        self.response = response
+
+    def answer(self, params):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+    spotPrivateGetOrder = privateGetOrderClientOrderClientOid = answer
+
+def test_timed_out_buy_looked_up(adapter, mock, logger):
+    # Filled but answered after the client gave up; the retry must find it instead of buying again
+    mock.delay_next_response = 3
+    adapter.client.timeout = 1000
+    order = OrderManager(adapter, logger).market_buy("BTCUSDT", 30, record={"trade_signal": "BTCUSDT", "fund_allocated": 30})
+    assert adapter.order_id(order) is not None and len(mock.orders) == 1
+
+def test_hedged_orders_go_through_once(adapter, mock, logger, monkeypatch):
+    # Against an exchange that rejects repeated client order ids
+    adapter.dedupes_client_order_ids = True
+    monkeypatch.setenv("ORDER_HEDGE", "2")
+    monkeypatch.setenv("TRADE_WORKERS", "2")
+    hedged = OrderManager(adapter, logger)
+    assert hedged._executor._max_workers == 3 * 2 * hedged.batch_workers
+    order = hedged.market_buy("BTCUSDT", 30, record={"trade_signal": "BTCUSDT", "fund_allocated": 30})
+    assert adapter.order_id(order) is not None and len(mock.orders) == 1
+    order = hedged.market_sell("BTCUSDT", float(order["executedQty"]), record={"symbol": "BTCUSDT", "openPrice": 30000})
+    assert adapter.order_id(order) is not None and len(mock.orders) == 2
+
+def test_orders_of_a_previous_run_reconciled(adapter, mock, logger):
+    # A buy and a sell sent by a run that stopped before updating the trade files
+    action = Action(adapter, logger)
+    candidate = Candidate("ETHUSDT", "ETH", "USDT", 5, 9000000, "0.0001", 100.0)
+    action.potential_trades.append([candidate.record])
+    adapter.create_market_buy("ETHUSDT", 100.0, client_order_id(candidate.record, "buy", "market"))
+    sent = len(mock.orders)
+    Action(adapter, logger).reconcile()
+    recorded = action.trade_list.read()
+    assert len(recorded) == 1 and action.potential_trades.read() == [] and len(mock.orders) == sent
+
+    adapter.create_market_sell("ETHUSDT", mock.balances["ETH"], client_order_id(recorded[0], "sell", "market"))
+    Monitor(adapter, logger).reconcile()
+    assert action.trade_list.read() == []
+
+def test_binance_find_order(adapter, mock):
+    order = adapter.create_market_buy("BTCUSDT", 30, "snipe-btc")
+    assert adapter.find_order("BTCUSDT", "snipe-btc")["orderId"] == order["orderId"]
+    assert adapter.find_order("BTCUSDT", "unknown") is None
+
+def test_mexc_find_order(mexc):
+    mexc.client = OrderClient({"orderId": "7", "clientOrderId": "snipe"})
+    assert mexc.order_id(mexc.find_order("NEWUSDT", "snipe")) == "7"
+    mexc.client = OrderClient(ccxt.OrderNotFound('mexc {"code":-2013,"msg":"Order does not exist."}'))
+    assert mexc.find_order("NEWUSDT", "snipe") is None
+    mexc.client = OrderClient(ccxt.NetworkError("mexc GET https://api.mexc.com/api/v3/order"))
+    with pytest.raises(ccxt.NetworkError):
+        mexc.find_order("NEWUSDT", "snipe")
+
+def test_kucoin_find_order(kucoin):
+    kucoin.client = OrderClient({"code": "200000", "data": {"id": "o1", "clientOid": "snipe"}})
+    assert kucoin.order_id(kucoin.find_order("NEW-USDT", "snipe")) == "o1"
+    kucoin.client = OrderClient({"code": "200000", "data": None})
+    assert kucoin.find_order("NEW-USDT", "snipe") is None
+    kucoin.client = OrderClient(ccxt.OrderNotFound('kucoin {"code":"400100","msg":"order_not_exist_or_not_allow_to_cancel"}'))
+    assert kucoin.find_order("NEW-USDT", "snipe") is None
+
+def test_client_order_id_parameter(adapter, mexc, kucoin):
+    assert adapter._with_client_id({"symbol": "BTCUSDT"}, "snipe") == {"symbol": "BTCUSDT", "newClientOrderId": "snipe"}
+    assert mexc._with_client_id({}, "snipe") == {"newClientOrderId": "snipe"}
+    assert kucoin._with_client_id({}, "snipe") == {"clientOid": "snipe"}
+    assert kucoin._with_client_id({}, None) == {}
@@ -0,0 +1,54 @@
+import threading
+
+import ccxt
+import pytest
+
+from binance_adapter import BinanceAdapter
+from core.orders import OrderManager
+from core.paper import create_adapter
+
+def test_paper_orders_filled_against_the_book(mock, logger):
+    # The same order functions, filled against the mock book without any order reaching it
+    paper = create_adapter(BinanceAdapter, logger, paper=True)
+    paper.connect()
+    paper.latency = 0
+    orders = OrderManager(paper, logger)
+
+    order = orders.market_buy("ETHUSDT", 100, record={"trade_signal": "ETHUSDT", "fund_allocated": 100})
+    assert paper.order_id(order) is not None and mock.order_requests == 0
+    assert abs(paper.get_balance("USDT") - 900) < 1e-6
+    assert abs(paper.get_balance("ETH") - 100 / 2004 * 0.999) < 1e-9
+
+    # A thin book fills partially
+    paper.fill_share = 0.00001
+    order = orders.market_buy("ETHUSDT", 500)
+    assert order["status"] == "PARTIALLY_FILLED" and order["cummulativeQuoteQty"] < 500
+
+    paper.fill_share = 1
+    order = orders.market_sell("ETHUSDT", paper.precision.get("ETHUSDT").size(paper.get_balance("ETH")))
+    assert order["status"] == "FILLED" and mock.order_requests == 0
+
+def test_concurrent_copies_of_an_order_filled_once(mock, logger):
+    paper = create_adapter(BinanceAdapter, logger, paper=True)
+    paper.connect()
+    paper.latency = 0.2
+    results = []
+
+    def send():
+        try:
+            results.append(paper.create_market_buy("ETHUSDT", 100, "snipe-eth"))
+        except ccxt.DuplicateOrderId as err:
+            results.append(err)
+
+    copies = [threading.Thread(target=send) for _ in range(2)]
+    for copy in copies:
+        copy.start()
+    for copy in copies:
+        copy.join()
+    assert sum(isinstance(result, dict) for result in results) == 1
+    assert abs(paper.get_balance("USDT") - 900) < 1e-6
+
+    # An order that failed leaves its id free for the retry
+    with pytest.raises(ccxt.InsufficientFunds):
+        paper.create_market_buy("ETHUSDT", 5000, "snipe-eth-2")
+    assert paper.order_id(paper.create_market_buy("ETHUSDT", 100, "snipe-eth-2")) is not None
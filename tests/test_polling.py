@@ -0,0 +1,12 @@
+import os
+
+from core.polling import HedgedPoller
+
+def test_poller_clients_guarded(adapter, logger):
+    breaker = adapter.breakers.breaker("public GET exchangeInfo")
+    calls = breaker.metrics()['calls']
+    poller = HedgedPoller(adapter, logger, 0.2, workers=1, hosts=[os.environ["BINANCE_API_URL"]])
+    poller.start()
+    # The first snapshot comes from the whole catalogue, through the breaker of the endpoint
+    assert poller.next(5) is not None
+    assert breaker.metrics()['calls'] > calls
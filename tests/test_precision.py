@@ -0,0 +1,39 @@
+import ccxt
+import pytest
+
+from core.errors import BAD_SYMBOL
+
+def test_binance_quantizer_spec(adapter, mock):
+    mock.list_symbol("STEPUSDT", "STEP", "USDT", 1, step_size="0.00100000", min_notional="10.00000000")
+    spec = adapter.quantizer_spec(adapter.get_symbol_detail("STEPUSDT"))
+    assert spec['step'] == "0.001" and spec['tick'] == "0.00010000" and spec['min_quote'] == 10.0
+    assert adapter.precision.get("STEPUSDT").size(1.23456) == 1.234
+
+def test_no_quantizer_without_metadata(adapter):
+    with pytest.raises(ccxt.BadSymbol):
+        adapter.precision.get("MISSINGUSDT")
+    assert adapter.classify_error(ccxt.BadSymbol("No market metadata for MISSINGUSDT")) == BAD_SYMBOL
+    # Sized from the lot step of a trade record without any request
+    assert adapter.precision.get("MISSINGUSDT", "0.01").size(1.239) == 1.23
+
+def test_mexc_quantizer_spec(mexc):
+    detail = {
+        'symbol': 'NEWUSDT', 'base': 'NEW', 'quote': 'USDT', 'min_size': 5.0, 'max_size': 2000000.0, 'base_increment': '0',
+        'info': {'baseSizePrecision': '0', 'baseAssetPrecision': 2, 'quotePrecision': 4}
+    }
+    spec = mexc.quantizer_spec(detail)
+    # Base increment of 0: the asset precision gives the step; the funds limits are in the quote currency
+    assert spec['step'] == "1e-2" and spec['tick'] == "1e-4"
+    assert spec['min_quote'] == 5.0 and spec['max_quote'] == 2000000.0
+    assert mexc.precision.compile(detail).size(1.239) == 1.23
+
+def test_kucoin_quantizer_spec(kucoin):
+    detail = {
+        'symbol': 'NEW-USDT', 'base': 'NEW', 'quote': 'USDT', 'min_size': 0.1, 'max_size': 10000.0, 'base_increment': '0.1',
+        'info': {'priceIncrement': '0.0001', 'quoteMinSize': '0.1', 'quoteMaxSize': '99999999'}
+    }
+    spec = kucoin.quantizer_spec(detail)
+    # Buys are sized in the base currency, the quote limits come from the payload
+    assert spec['min_base'] == 0.1 and spec['max_base'] == 10000.0
+    assert spec['tick'] == '0.0001' and spec['min_quote'] == 0.1 and spec['max_quote'] == 99999999.0
+    assert kucoin.precision.compile(detail).size(5, 0.3) == 16.6
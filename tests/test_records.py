@@ -0,0 +1,10 @@
+from core.records import PositionTable
+
+def test_triggers_checked_in_one_pass():
+    table = PositionTable()
+    records = [{"symbol": "NEARUSDT", "openPrice": "1"}, {"symbol": "FARUSDT", "openPrice": "1"}, {"symbol": "TPUSDT", "openPrice": "2"}]
+    assert table.sync(records)
+    crossed = table.crossed([0.79, None, 2.5], 1.2, 0.8)
+    assert [position.symbol for position in crossed] == ["NEARUSDT", "TPUSDT"]
+    # Unchanged records are not parsed again
+    assert not table.sync(records) and table.get("TPUSDT").open_price == 2.0
@@ -0,0 +1,21 @@
+from binance_adapter import BinanceAdapter
+from core.records import Position
+from core.scheduling import CheckScheduler
+
+def test_near_positions_checked_sooner_within_budget(logger):
+    scheduler = CheckScheduler(BinanceAdapter(logger), logger, budget=1)
+    near, far = Position("NEARUSDT", 1), Position("FARUSDT", 1)
+    scheduler.sync([near, far])
+    assert len(scheduler.due()) == 1 and scheduler.due() == []
+    near_delay = scheduler.checked(near, 0.805, 1.2, 0.8)
+    far_delay = scheduler.checked(far, 1.0, 1.2, 0.8)
+    assert near_delay < 1 and far_delay == scheduler.max_interval
+
+def test_rest_requests_of_a_check_charged(logger):
+    scheduler = CheckScheduler(BinanceAdapter(logger), logger, budget=2)
+    position = Position("AUSDT", 1)
+    scheduler.sync([position])
+    assert scheduler.due() == [position]
+    # The price and the balance were both asked over REST, one more than taken when handed out
+    scheduler.checked(position, 1.0, 1.2, 0.8, requests=2)
+    assert not scheduler.budget.try_acquire(1)
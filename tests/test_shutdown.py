@@ -0,0 +1,26 @@
+import time
+import threading
+
+from core.action import Action
+from core.workers import SymbolWorkerPool
+
+def test_action_loop_stops_on_shutdown(adapter, logger):
+    action = Action(adapter, logger)
+    runner = threading.Thread(target=action.main)
+    runner.start()
+    time.sleep(0.2)
+    action.shutdown.request()
+    runner.join(5)
+    assert not runner.is_alive()
+
+def test_closed_pool_drained(logger):
+    # Queued jobs dropped, the running one finishes
+    pool = SymbolWorkerPool(logger, workers=1)
+    ran = []
+    pool.submit("AUSDT", time.sleep, 0.3)
+    pool.submit("BUSDT", ran.append, "BUSDT")
+    time.sleep(0.05)
+    pool.close()
+    assert pool.drain(2) == []
+    assert not ran
+    assert not pool.submit("CUSDT", ran.append, "CUSDT")
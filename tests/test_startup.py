@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import logging
+
+from core.startup import checkpoint_market_cache, load_markets_cached, market_cache_path, read_market_cache, write_market_cache
+from conftest import wait_until
+
+class Exchange:
+    """
+    The part of a ccxt client the market cache uses; every load fetches `listed`.
+    """
+    id = "fake"
+    listed = ["AAA/USDT"]
+    fetches = 0
+
+    def __init__(self, config=None):
+        self.apiKey = self.secret = self.password = None
+        self.urls, self.options = {}, {}
+        self.markets, self.currencies = None, None
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = {market['symbol']: market for market in markets}
+        self.currencies = currencies
+
+    def load_markets(self, reload=False, params={}):
+        if reload or not self.markets:
+            Exchange.fetches += 1
+            self.set_markets([{'symbol': symbol} for symbol in Exchange.listed], {})
+        return self.markets
+
+def cache_saved(symbols, saved_at):
+    path = market_cache_path(Exchange.id)
+    write_market_cache(path, {symbol: {'symbol': symbol} for symbol in symbols}, {})
+    with open(path) as cache_file:
+        data = json.load(cache_file)
+    data['saved_at'] = saved_at
+    with open(path, 'w') as cache_file:
+        json.dump(data, cache_file)
+    return path
+
+def loaded(handle, max_age):
+    Exchange.fetches = 0
+    load_markets_cached(handle, logging.getLogger("tests"), max_age=max_age)
+    return handle.load_markets()
+
+def test_cache_written_and_read(state_dir):
+    path = market_cache_path("fake")
+    assert path == os.path.join(str(state_dir), "cache", "fake_markets.json")
+    assert read_market_cache(path) is None
+    write_market_cache(path, {"AAA/USDT": {'symbol': "AAA/USDT"}}, {"AAA": {}})
+    cached = read_market_cache(path)
+    assert cached['markets'] == [{'symbol': "AAA/USDT"}] and cached['currencies'] == {"AAA": {}}
+    # A partial or empty file is no cache
+    with open(path, 'w') as cache_file:
+        cache_file.write('{"markets": [')
+    assert read_market_cache(path) is None
+
+def test_fresh_cache_used_without_fetching():
+    cache_saved(["AAA/USDT", "OLD/USDT"], time.time())
+    handle = Exchange()
+    assert set(loaded(handle, max_age=3600)) == {"AAA/USDT", "OLD/USDT"}
+    assert Exchange.fetches == 0
+
+def test_old_cache_refreshed(monkeypatch):
+    path = cache_saved(["OLD/USDT"], 0)
+    monkeypatch.setattr(Exchange, "listed", ["AAA/USDT", "NEW/USDT"])
+    handle = Exchange()
+    loaded(handle, max_age=3600)
+    # Served from the cache first, then swapped for the catalogue fetched on a client of its own
+    assert wait_until(lambda: set(handle.markets) == {"AAA/USDT", "NEW/USDT"})
+    assert wait_until(lambda: {market['symbol'] for market in (read_market_cache(path) or {}).get('markets', [])} == {"AAA/USDT", "NEW/USDT"})
+    assert Exchange.fetches == 1
+
+def test_checkpoint_only_when_the_markets_changed():
+    path = cache_saved(["AAA/USDT"], 0)
+    handle = Exchange()
+    handle.set_markets([{'symbol': "AAA/USDT"}])
+    checkpoint_market_cache(handle, logging.getLogger("tests"))
+    assert read_market_cache(path)['saved_at'] == 0
+    handle.set_markets([{'symbol': "AAA/USDT"}, {'symbol': "NEW/USDT"}])
+    checkpoint_market_cache(handle, logging.getLogger("tests"))
+    assert read_market_cache(path)['saved_at'] > 0
@@ -0,0 +1,51 @@
+import os
+import json
+import threading
+import pytest
+
+from core.persistence import StateWriter
+from core.state import TradeStore
+
+def test_append_remove_and_extend_unique(state_dir, logger):
+    store = TradeStore(str(state_dir / "trades.json"), logger)
+    assert store.read() is None
+    store.append([{"trade_signal": "AUSDT"}, {"trade_signal": "BUSDT"}])
+    store.extend_unique([{"trade_signal": "AUSDT"}, {"trade_signal": "CUSDT"}])
+    assert [trade["trade_signal"] for trade in store.read()] == ["AUSDT", "BUSDT", "CUSDT"]
+    store.remove({"trade_signal": "BUSDT"})
+    assert store.count() == 2
+
+def test_concurrent_writers_and_reader(state_dir, logger):
+    # One store per writer, as in separate processes, and a reader polling meanwhile
+    shared_file = str(state_dir / "shared_trades.json")
+    TradeStore(shared_file, logger).append([])
+    unreadable, writing = [], True
+
+    def poll_reader():
+        while writing:
+            if TradeStore(shared_file, logger).read() is None:
+                unreadable.append(1)
+
+    reader = threading.Thread(target=poll_reader)
+    reader.start()
+    writers = [threading.Thread(target=lambda n=n: [
+        TradeStore(shared_file, logger).append([{"symbol": "W{}T{}".format(n, i), "openPrice": i}]) for i in range(25)
+    ]) for n in range(4)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writing = False
+    reader.join()
+    assert TradeStore(shared_file, logger).count() == 100
+    assert not unreadable
+
+def test_failed_write_leaves_the_file_as_it_was(state_dir):
+    path = str(state_dir / "trades.json")
+    writer = StateWriter(fsync=False)
+    writer.write(path, [{"trade_signal": "AUSDT"}])
+    with pytest.raises(TypeError):
+        writer.write(path, [{"trade_signal": object()}])
+    with open(path) as trades_file:
+        assert json.load(trades_file) == [{"trade_signal": "AUSDT"}]
+    assert not [name for name in os.listdir(str(state_dir)) if name.endswith(".tmp")]
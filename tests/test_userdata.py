@@ -0,0 +1,74 @@
+from mexc_adapter import MEXCUserDataStream
+from kucoin_adapter import KucoinUserDataStream
+
+def deal(order_id, trade_id, quantity, amount):
+    return {"c": "spot@private.deals.v3.api", "s": "NEWUSDT", "d": {"i": order_id, "t": trade_id, "v": quantity, "a": amount}}
+
+def order_update(order_id, quantity, amount, status):
+    return {"c": "spot@private.orders.v3.api", "s": "NEWUSDT", "d": {"i": order_id, "cv": quantity, "ca": amount, "s": status}}
+
+def trade_order(data):
+    return {"type": "message", "topic": "/spotMarket/tradeOrders", "data": dict(data, orderId="o1", symbol="NEW-USDT")}
+
+def test_mexc_balances(mexc, logger):
+    stream = MEXCUserDataStream(mexc, logger)
+    stream.handle({"c": "spot@private.account.v3.api", "d": {"a": "USDT", "f": "12.5"}})
+    # Not answered before the REST snapshot
+    assert stream.balance("USDT") is None
+    stream.synced.set()
+    assert stream.balance("USDT") == 12.5 and stream.balance("NEW") == 0.0
+
+def test_mexc_fills(mexc, logger):
+    stream = MEXCUserDataStream(mexc, logger)
+    stream.handle(deal("1", "t1", "10", "5"))
+    stream.handle(deal("1", "t2", "10", "6"))
+    # Partial until the order is done
+    assert not stream.wait_for_fill("1", 0)['done']
+    # Totals of the order, status 2 = filled
+    stream.handle(order_update("1", "20", "11", 2))
+    fill = stream.wait_for_fill("1", 0)
+    assert fill['done'] and fill['filled'] == 20 and fill['quote_filled'] == 11 and fill['average_price'] == 0.55
+
+def test_mexc_deal_after_the_order_update_counted_once(mexc, logger):
+    stream = MEXCUserDataStream(mexc, logger)
+    stream.handle(order_update("1", "10", "5", 1))
+    stream.handle(deal("1", "t1", "10", "5"))
+    stream.handle(order_update("1", "20", "11", 2))
+    stream.handle(deal("1", "t2", "10", "6"))
+    # Delivered twice
+    stream.handle(deal("1", "t2", "10", "6"))
+    fill = stream.wait_for_fill("1", 0)
+    assert fill['filled'] == 20 and fill['quote_filled'] == 11
+
+def test_kucoin_balances(kucoin, logger):
+    stream = KucoinUserDataStream(kucoin, logger)
+    stream.trade_accounts = {"trade1"}
+    stream.synced.set()
+    stream.handle({"type": "message", "topic": "/account/balance", "data": {"accountId": "trade1", "currency": "USDT", "available": "50"}})
+    # Only the trade accounts feed the balances
+    stream.handle({"type": "message", "topic": "/account/balance", "data": {"accountId": "main1", "currency": "USDT", "available": "900"}})
+    stream.handle({"type": "welcome", "id": "1"})
+    assert stream.balance("USDT") == 50.0
+
+def test_kucoin_fills(kucoin, logger):
+    stream = KucoinUserDataStream(kucoin, logger)
+    stream.handle(trade_order({"type": "match", "matchSize": "10", "matchPrice": "0.5"}))
+    stream.handle(trade_order({"type": "match", "matchSize": "10", "matchPrice": "0.6"}))
+    # Partial until the order is done
+    assert not stream.wait_for_fill("o1", 0)['done']
+    stream.handle(trade_order({"type": "filled", "filledSize": "20"}))
+    fill = stream.wait_for_fill("o1", 0)
+    assert fill['done'] and fill['filled'] == 20 and abs(fill['quote_filled'] - 11) < 1e-9 and abs(fill['average_price'] - 0.55) < 1e-9
+
+def test_fills_dropped_once_taken_or_expired(mexc, logger):
+    stream = MEXCUserDataStream(mexc, logger)
+    stream.handle(deal("1", "t1", "10", "5"))
+    stream.handle(order_update("1", "10", "5", 2))
+    assert stream.wait_for_fill("1", 0)['done']
+    assert stream.wait_for_fill("1", 0) is None
+
+    # An order nobody waits on, e.g. placed by hand
+    stream.handle(order_update("2", "10", "5", 2))
+    stream.fill_ttl = 0
+    stream.handle(deal("3", "t3", "10", "5"))
+    assert set(stream._fills) == {"3"}
@@ -0,0 +1,21 @@
+import time
+import threading
+
+from core.workers import SymbolWorkerPool
+
+def test_one_job_per_symbol(logger):
+    pool = SymbolWorkerPool(logger, workers=2)
+    started, release = threading.Event(), threading.Event()
+
+    def batch():
+        started.set()
+        release.wait(2)
+
+    assert pool.submit_group(["AUSDT", "BUSDT"], batch)
+    assert started.wait(2)
+    # Every symbol of the group is held until the job is done
+    assert not pool.submit("BUSDT", time.sleep, 0)
+    assert pool.submit("CUSDT", time.sleep, 0)
+    release.set()
+    assert pool.drain(2) == []
+    assert not pool.busy("BUSDT")